@@ -2,6 +2,13 @@ import pygame
 import random
 import sys
 
+from baseball_sim import Game
+from baseball_sim.expectancy import ExpectancyCache
+from baseball_sim.lineup import optimize_lineup
+from baseball_sim.query import PlayerQuery, StatIndex
+from baseball_sim.rosters import RosterDatabase
+from baseball_sim.boxscore import BATTING_HEADERS, PITCHING_HEADERS
+
 # Initialize pygame
 pygame.init()
 
@@ -87,282 +94,6 @@ class Button:
     def is_clicked(self, event):
         return event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos)
 
-class Coach:
-    def __init__(self, name, role, experience = None, hitting = None,
-                 pitching = None, fielding = None):
-        self.name = name
-        self.role = role
-        self.attributes = {
-            "experience": experience if experience is not None else random.randint(0, 20),
-            "hitting": hitting if hitting is not None else random.randint(20, 80),
-            "pitching": pitching if pitching is not None else random.randint(20, 80),
-            "fielding": fielding if fielding is not None else random.randint(20, 80)
-        }
-        self.stats = {
-            "wins": 0,
-            "losses": 0,
-            "championships": 0
-        }
-
-class Pitcher:
-    def __init__(self, name, position,
-                 velocity=None, stuff=None,
-                 movement=None, control=None,
-                 stamina=None):
-        self.name = name
-        self.position = position
-        self.attributes = {
-            "velocity": velocity if velocity is not None else random.randint(20, 80),
-            "stuff": stuff if stuff is not None else random.randint(20, 80),
-            "movement": movement if movement is not None else random.randint(20, 80),
-            "control": control if control is not None else random.randint(20, 80),
-            "stamina": stamina if stamina is not None else random.randint(20, 80)
-        }
-        self.stats = {
-            "ERA": 0.00,
-            "WHIP": 0.00,
-            "Runs Allowed": 0,
-            "Innings Pitched": 0.0,
-            "Hits Allowed": 0,
-            "Walks Allowed": 0,
-            "Home Runs Allowed": 0,
-            "Batters Faced": 0,
-            "Strikeouts": 0
-        }
-
-    def updateStats(self):
-        hits_allowed = self.stats["Hits Allowed"]
-        walks_allowed = self.stats["Walks Allowed"]
-        runs_allowed = self.stats["Runs Allowed"]
-        innings_pitched = self.stats["Innings Pitched"]
-        batters_faced = self.stats["Batters Faced"]
-
-        if batters_faced > 0:
-            self.stats["WHIP"] = (hits_allowed + walks_allowed) / innings_pitched
-            self.stats["ERA"] = runs_allowed / innings_pitched
-        else:
-            self.stats["WHIP"] = 0.000
-            self.stats["ERA"] = 0.00
-
-class Batter:
-    def __init__(self, name, position,
-                 speed = None, framing = None, blocking = None, arm = None,
-                 range = None, arm_strength = None, power = None, contact = None,
-                 eye = None, gap_power = None, triple = None, framing_pot = None,
-                 blocking_pot = None, arm_pot = None, range_pot = None,
-                 arm_stength_pot = None, power_pot = None, contact_pot = None,
-                 eye_pot = None, gap_power_pot = None, triple_pot = None):
-        self.name = name
-        self.position = position
-        self.attributes = {
-            "speed": speed if speed is not None else random.randint(20, 80),
-            "framing": framing if framing is not None else random.randint(20, 35),
-            "blocking": blocking if blocking is not None else random.randint(20, 35),
-            "arm": arm if arm is not None else random.randint(20, 35),
-            "range": range if range is not None else random.randint(20, 50),
-            "arm_strength": arm_strength if arm_strength is not None else random.randint(20, 50),
-            "power": power if power is not None else random.randint(20, 50),
-            "contact": contact if contact is not None else random.randint(20, 50),
-            "eye": eye if eye is not None else random.randint(20, 50),
-            "gap_power": gap_power if gap_power is not None else random.randint(20, 50),
-            "triple": triple if triple is not None else random.randint(20, 50),
-            "framing_pot": framing_pot if framing_pot is not None else random.randint(25, 40),
-            "blocking_pot": blocking_pot if blocking_pot is not None else random.randint(25, 40),
-            "arm_pot": arm_pot if arm_pot is not None else random.randint(25, 40),
-            "range_pot": range_pot if range_pot is not None else random.randint(25, 55),
-            "arm_strength_pot": arm_stength_pot if arm_stength_pot is not None else random.randint(25, 55),
-            "power_pot": power_pot if power_pot is not None else random.randint(25,55),
-            "contact_pot": contact_pot if contact_pot is not None else random.randint(25, 55),
-            "eye_pot": eye_pot if eye_pot is not None else random.randint(25, 55),
-            "gap_power_pot": gap_power_pot if gap_power_pot is not None else random.randint(25, 55),
-            "triple_pot": triple_pot if triple_pot is not None else random.randint(25, 55)
-        }
-        self.stats = {
-            "hits": 0,
-            "at_bats": 0,
-            "plate_appearances": 0,
-            "home_runs": 0,
-            "triples": 0,
-            "doubles": 0,
-            "walks": 0,
-            "total_bases": 0,
-            "batting_average": 0.000,
-            "on_base_percentage": 0.000,
-            "slugging_percentage": 0.000,
-            "on_base_plus_slugging": 0.000
-        }
-
-    def update_stats(self):
-        at_bats = self.stats["at_bats"]
-        hits = self.stats["hits"]
-        walks = self.stats["walks"]
-        doubles = self.stats["doubles"]
-        triples = self.stats["triples"]
-        home_runs = self.stats["home_runs"]
-        plate_appearances = self.stats["plate_appearances"]
-
-        if plate_appearances > 0:
-            self.stats["total_bases"] = (home_runs * 4) + (triples * 3) + (doubles * 2) + (hits - (home_runs + triples + doubles))
-        else:
-            self.stats["total_bases"] = 0
-
-        if at_bats > 0:
-            self.stats["batting_average"] = hits / at_bats
-        else:
-            self.stats["batting_average"] = 0.000
-
-        if plate_appearances > 0:
-            self.stats["on_base_percentage"] = (hits + walks) / plate_appearances
-        else:
-            self.stats["on_base_percentage"] = 0.000
-
-        if at_bats > 0:
-            self.stats["slugging_percentage"] = self.stats["total_bases"] / at_bats
-        else:
-            self.stats["slugging_percentage"] = 0.000
-
-        self.stats["on_base_plus_slugging"] = (self.stats["on_base_percentage"] +
-                                               self.stats["slugging_percentage"])
-
-    def atbat(self, pitcher):
-        self.stats["plate_appearances"] += 1
-        pitcher.stats["Batters Faced"] += 1
-
-        contact_probability = self.attributes["contact"] / 100.0
-        gap_power_probability = self.attributes["gap power"] / 100.0
-        power_probability = self.attributes["power"] / 100.0
-        walk_probability = self.attributes["eye"] / 100.0
-        triple_probability = self.attributes["triple"] / 100.0
-
-        if random.random() < contact_probability:
-            self.stats["at_bats"] += 1
-            self.stats["hits"] += 1
-            pitcher.stats["Hits Allowed"] += 1
-
-            if random.random() < triple_probability:
-                self.stats["triples"] += 1
-                return 3
-            elif random.random() < gap_power_probability:
-                self.stats["doubles"] += 1
-                return 2
-            elif random.random() < power_probability:
-                self.stats["home_runs"] += 1
-                pitcher.stats["Home Runs Allowed"] += 1
-                return 4
-            else:
-                return 1
-
-        if random.random() < walk_probability:
-            self.stats["walks"] += 1
-            pitcher.stats["Walks Allowed"] += 1
-            return 0.5
-
-        pitcher.stats["Strikeouts"] += 1
-        return 0
-
-class Team:
-    """
-    Represents a baseball team.
-    """
-    def __init__(self, name, batters, pitchers, staff):
-        self.name = name
-        self.batters = batters
-        self.pitchers = pitchers
-        self.staff = staff
-        self.score = 0
-        self.current_batter_index = 0
-        self.current_pitcher_index = 0
-
-    def get_next_batter(self):
-        batter = self.batters[self.current_batter_index]
-        self.current_batter_index = (self.current_batter_index + 1) % 9
-        return batter
-
-    def get_next_pitcher(self):
-        pitcher = self.pitchers[self.current_pitcher_index]
-        # FIX: Update the pitcher index correctly using self.current_pitcher_index
-        self.current_pitcher_index = (self.current_pitcher_index + 1) % len(self.pitchers)
-        return pitcher
-
-    def update_bases_and_score(self, hit_type, bases):
-        runs_scored = 0
-
-        if hit_type == 4:  # Home run: everyone scores
-            runs_scored += sum(1 for base in bases if base is not None) + 1
-            bases[:] = [None, None, None]
-        else:
-            if bases[2] is not None:
-                runs_scored += 1
-                bases[2] = None
-            if hit_type == 0.5:
-                bases.insert(0, True)
-                bases.pop()
-            if hit_type == 1:
-                bases.insert(0, True)
-                bases.pop()
-            elif hit_type == 2:
-                if bases[1] is not None:
-                    runs_scored += 1
-                    bases[1] = None
-                if bases[2] is not None:
-                    runs_scored += 1
-                    bases[2] = None
-                bases.insert(1, True)
-                bases.pop()
-            elif hit_type == 3:
-                if bases[0] is not None:
-                    runs_scored += 1
-                    bases[0] = None
-                if bases[1] is not None:
-                    runs_scored += 1
-                    bases[1] = None
-                if bases[2] is not None:
-                    runs_scored += 1
-                    bases[2] = None
-                bases.insert(2, True)
-                bases.pop()
-        return runs_scored
-
-    def play_half_inning(self):
-        outs = 0
-        total_runs = 0
-        bases = [None, None, None]
-        while outs < 3:
-            current_pitcher = self.get_next_pitcher()
-            current_batter = self.get_next_batter()
-            result = current_batter.atbat(current_pitcher)
-            if result == 0:
-                outs += 1
-            else:
-                runs_on_play = self.update_bases_and_score(result, bases)
-                total_runs += runs_on_play
-        return total_runs
-
-class Game:
-    """
-    Represents a baseball game simulation.
-    """
-    def __init__(self, home_team, away_team, innings=9):
-        self.home_team = home_team
-        self.away_team = away_team
-        self.innings = innings
-        self.current_inning = 1
-
-    def play_inning(self):
-        print(f"Inning {self.current_inning} begins.")
-        away_runs = self.away_team.play_half_inning()
-        home_runs = self.home_team.play_half_inning()
-        self.away_team.score += away_runs
-        self.home_team.score += home_runs
-        print(f"Inning {self.current_inning}: {self.away_team.name} scored {away_runs}, {self.home_team.name} scored {home_runs}.")
-        self.current_inning += 1
-
-    def is_game_over(self):
-        return self.current_inning > self.innings
-
-    def get_scoreboard(self):
-        return f"{self.away_team.name}: {self.away_team.score} | {self.home_team.name}: {self.home_team.score}"
-
 # -------------------------------
 # Utility Functions for Pygame
 # -------------------------------
@@ -548,120 +279,29 @@ def main_menu():
                     sys.exit()
         clock.tick(FPS)
 
-def national_league_west_menu():
-    back_button = Button(30, 525, 200  , 50, "Back", BLACK, GREEN)
-    rockies_button = Button(270, 100, 275, 75, "ROCKIES", BLACK, GREEN)
-    dodgers_button = Button(270, 200, 275, 75, "DODGERS", BLACK, GREEN)
-    diamondbacks_button = Button(270, 300, 275, 75, "DIAMONDBACKS", BLACK, GREEN)
-    padres_button = Button(270, 400, 275, 75, "PADRES", BLACK, GREEN)
-    giants_button = Button(270, 500, 275, 75, "GIANTS", BLACK, GREEN)
-    national_league_west_running = True
-    while national_league_west_running:
-        screen.fill(BASEBALL_GREEN)
-        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 290, 25)
-        back_button.draw(screen)
-        rockies_button.draw(screen)
-        dodgers_button.draw(screen)
-        diamondbacks_button.draw(screen)
-        padres_button.draw(screen)
-        giants_button.draw(screen)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if rockies_button.is_clicked(event):
-                return "rockies_menu"
-            if dodgers_button.is_clicked(event):
-                return "dodgers_menu"
-            if diamondbacks_button.is_clicked(event):
-                return "diamondbacks_menu"
-            if padres_button.is_clicked(event):
-                return "padres_menu"
-            if giants_button.is_clicked(event):
-                return "giants_menu"
-            if back_button.is_clicked(event):
-                return "division_menu_national"
-        clock.tick(FPS)
-
-def national_league_central_menu():
+def division_teams_menu(league_name, division_name, back_menu):
+    team_ids = roster_database.division_ids(league_name, division_name)
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    national_league_central_running = True
-    while national_league_central_running:
+    team_buttons = [(team_id, Button(270, 100 + 85 * i, 275, 75,
+                                     roster_database.record(team_id)["nickname"].upper(), BLACK, GREEN))
+                    for i, team_id in enumerate(team_ids)]
+    division_running = True
+    while division_running:
         screen.fill(BASEBALL_GREEN)
-        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 10, 10)
-        back_button.draw(screen)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if back_button.is_clicked(event):
-                return "division_menu_national"
-        clock.tick(FPS)
-
-def national_league_east_menu():
-    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    national_league_east_running = True
-    while national_league_east_running:
-        screen.fill(BASEBALL_GREEN)
-        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 10, 10)
-        back_button.draw(screen)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if back_button.is_clicked(event):
-                return "division_menu_national"
-        clock.tick(FPS)
-
-def american_league_west_menu():
-    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    american_league_west_running = True
-    while american_league_west_running:
-        screen.fill(BASEBALL_GREEN)
-        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 10, 10)
-        back_button.draw(screen)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if back_button.is_clicked(event):
-                return "division_menu_american"
-        clock.tick(FPS)
-
-def american_league_central_menu():
-    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    american_league_central_running = True
-    while american_league_central_running:
-        screen.fill(BASEBALL_GREEN)
-        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 10, 10)
-        back_button.draw(screen)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if back_button.is_clicked(event):
-                return "division_menu_american"
-        clock.tick(FPS)
-
-def american_league_east_menu():
-    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    american_league_east_running = True
-    while american_league_east_running:
-        screen.fill(BASEBALL_GREEN)
-        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 10, 10)
+        draw_text(screen, "Select a Team", pygame.font.SysFont(None, 48), BLACK, 290, 25)
         back_button.draw(screen)
+        for _, button in team_buttons:
+            button.draw(screen)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            for team_id, button in team_buttons:
+                if button.is_clicked(event):
+                    return team_menu_name(team_id)
             if back_button.is_clicked(event):
-                return "division_menu_american"
+                return back_menu
         clock.tick(FPS)
 
 def league_menu():
@@ -760,9 +400,14 @@ def play_baseball_game(game):
         draw_text(screen, f"Inning: {min(game.current_inning, game.innings)} / {game.innings}",
                   pygame.font.SysFont(None, 36), WHITE, 50, 100)
         draw_text(screen, game.get_scoreboard(), pygame.font.SysFont(None, 36), WHITE, 50, 150)
+        home_chance = expectancy_cache.game_win_probability(game)
+        draw_text(screen, f"{game.home_team.name} win probability: {home_chance:.0%}",
+                  pygame.font.SysFont(None, 28), WHITE, 50, 200)
 
         if simulate_inning and not game.is_game_over():
-            game.play_inning()
+            inning = game.current_inning
+            away_runs, home_runs = game.play_inning()
+            print(f"Inning {inning}: {game.away_team.name} scored {away_runs}, {game.home_team.name} scored {home_runs}.")
             simulate_inning = False
 
         if game.is_game_over():
@@ -802,19 +447,52 @@ def post_game_menu(game):
                 in_post_game_menu = False  # Exit the post-game menu to return to the team menu
 
 def box_score_view(game):
-    # This function displays the final box score.
-    # You can expand this to include detailed stats for each team or player.
+    # Rows come from the BoxScore the game filled in while it was played,
+    # formatted once when the game ended.
+    box_score = game.box_score
     back_button = Button(30, 525, 200, 50, "Back", GREEN, BLACK)
+    team_button = Button(260, 525, 250, 50, "Switch Team", GREEN, BLACK)
+    lines_button = Button(540, 525, 230, 50, "Pitching", GREEN, BLACK)
+    font = pygame.font.SysFont(None, 24)
+    team_index = 0
+    show_pitching = False
     in_box_score = True
     while in_box_score:
         screen.fill(BLACK)
         draw_text(screen, "Box Score", pygame.font.SysFont(None, 48), WHITE, 300, 20)
-        draw_text(screen, f"{game.away_team.name}: {game.away_team.score}", pygame.font.SysFont(None, 36), WHITE, 50,
-                  100)
-        draw_text(screen, f"{game.home_team.name}: {game.home_team.score}", pygame.font.SysFont(None, 36), WHITE, 50,
-                  150)
-        # (Optional) Add additional stats or inning-by-inning data here
+
+        # Line score: one column per inning plus runs and hits
+        line_rows = box_score.line_score_rows()
+        columns = len(line_rows[0]) - 3
+        for i in range(columns):
+            draw_text(screen, str(i + 1), font, WHITE, 250 + i * 35, 70)
+        draw_text(screen, "R", font, WHITE, 250 + columns * 35 + 10, 70)
+        draw_text(screen, "H", font, WHITE, 250 + columns * 35 + 50, 70)
+        for row_idx, row in enumerate(line_rows):
+            y = 95 + row_idx * 25
+            draw_text(screen, row[0], font, WHITE, 50, y)
+            for i, runs in enumerate(row[1:-2]):
+                draw_text(screen, str(runs), font, WHITE, 250 + i * 35, y)
+            draw_text(screen, str(row[-2]), font, WHITE, 250 + columns * 35 + 10, y)
+            draw_text(screen, str(row[-1]), font, WHITE, 250 + columns * 35 + 50, y)
+
+        # Player lines for the selected team
+        team_name = box_score.team_names[team_index]
+        if show_pitching:
+            headers, rows = PITCHING_HEADERS, box_score.pitching_rows(team_name)
+        else:
+            headers, rows = BATTING_HEADERS, box_score.batting_rows(team_name)
+        draw_text(screen, f"{team_name} {'Pitching' if show_pitching else 'Batting'}", font, WHITE, 50, 160)
+        for col_idx, header in enumerate(headers):
+            draw_text(screen, header, font, WHITE, 50 if col_idx == 0 else 230 + col_idx * 60, 185)
+        for row_idx, row in enumerate(rows[:13]):
+            y = 210 + row_idx * 23
+            for col_idx, value in enumerate(row):
+                draw_text(screen, str(value), font, WHITE, 50 if col_idx == 0 else 230 + col_idx * 60, y)
+
         back_button.draw(screen)
+        team_button.draw(screen)
+        lines_button.draw(screen)
         pygame.display.flip()
         clock.tick(FPS)
 
@@ -824,6 +502,11 @@ def box_score_view(game):
                 sys.exit()
             if back_button.is_clicked(event):
                 in_box_score = False  # Return to the post-game menu
+            if team_button.is_clicked(event):
+                team_index = 1 - team_index
+            if lines_button.is_clicked(event):
+                show_pitching = not show_pitching
+                lines_button.text = "Batting" if show_pitching else "Pitching"
 
 def rockies_menu():
     global selected_team
@@ -831,6 +514,7 @@ def rockies_menu():
     view_roster = Button(30, 75, 200, 50, "View Roster", BLACK, GREEN)
     play_game = Button(30, 195, 200, 50, "Play Game!", BLACK, GREEN)
     view_staff = Button(30, 135, 200, 50, "View Staff", BLACK, GREEN)
+    optimize_button = Button(30, 255, 200, 50, "Optimize Lineup", BLACK, GREEN)
     rockies_running = True
     while rockies_running:
         screen.fill(ROCKIES_PURPLE)
@@ -840,69 +524,34 @@ def rockies_menu():
         view_roster.draw(screen)
         play_game.draw(screen)
         view_staff.draw(screen)
+        optimize_button.draw(screen)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if view_roster.is_clicked(event):
-                selected_team = create_rockies_team()
+                selected_team = team_registry.get("rockies")
                 return "rockies_roster"
             if play_game.is_clicked(event):
-                selected_team = create_rockies_team()
+                selected_team = team_registry.get("rockies")
                 return "play_game"
+            if optimize_button.is_clicked(event):
+                selected_team = team_registry.get("rockies")
+                return "lineup:rockies"
             if view_staff.is_clicked(event):
                 return "rockies_staff"
             if back_button.is_clicked(event):
                 return "national_league_west"
         clock.tick(FPS)
 
-def create_rockies_team():
-    rockies_batters = [
-        Batter("Jacob Stallings", "C", speed = 25, framing = 35, framing_pot = 35, blocking = 70, blocking_pot = 70,
-               arm = 40, arm_pot = 40, triple = 25, triple_pot = 25, power = 35, power_pot = 35, contact = 40, contact_pot = 40,
-               eye = 45, eye_pot = 45),
-        Batter("Hunter Goodman", "C"),
-        Batter("Drew Romo", "C"),
-        Batter("Michael Toglia", "1B"),
-        Batter("Thairo Estrada", "2B"),
-        Batter("Kyle Farmer", "2B"),
-        Batter("Ryan McMahon", "3B"),
-        Batter("Ezequiel Tovar", "SS"),
-        Batter("Nolan Jones", "LF"),
-        Batter("Brenton Doyle", "CF"),
-        Batter("Jordan Beck", "RF"),
-        Batter("Sam Hillard", "RF"),
-        Batter("Kris Bryant", "DH")
-    ]
-    rockies_pitchers = [
-        Pitcher("Kyle Freeland", "SP"),
-        Pitcher("German Marquez", "SP"),
-        Pitcher("Austin Gomber", "SP"),
-        Pitcher("Ryan Feltner", "SP"),
-        Pitcher("Antonio Senzatela", "SP"),
-        Pitcher("Bradley Blalock", "SP"),
-        Pitcher("Tanner Gordon", "SP"),
-        Pitcher("Seth Halvorsen", "RP"),
-        Pitcher("Victor Vodnik", "RP"),
-        Pitcher("Tyler Kinley", "RP"),
-        Pitcher("Luis Peralta", "RP"),
-        Pitcher("Scott Alexander", "RP"),
-        Pitcher("Angel Chivilli", "RP"),
-        Pitcher("Jake Bird", "RP"),
-        Pitcher("Jimmy Herget", "RP"),
-        Pitcher("Lucase Gilbreath", "RP"),
-        Pitcher("Jeff Criswell", "RP"),
-        Pitcher("Jaden Hill", "RP")
-    ]
-    rockies_staff = [
-        Coach("Bud Black", "MA"),
-        Coach("Todd Helton", "1B"),
-        Coach("Alex English", "3B"),
-        Coach("Demariyus Thomas", "HC"),
-        Coach("Patrick Roy", "PC")
-    ]
-    return Team("Colorado Rockies", rockies_batters, rockies_pitchers, rockies_staff)
+# Stat index column behind each rockies_roster header
+ROSTER_COLUMNS = ["name", "position", "speed", "power", "contact", "eye", "gap_power", "triple",
+                  "framing", "blocking", "arm", "range", "arm_strength", "power_pot",
+                  "contact_pot", "eye_pot", "gap_power_pot", "triple_pot",
+                  "framing_pot", "blocking_pot", "arm_pot", "range_pot",
+                  "arm_strength_pot"]
+
 # Need to add more kinds of staff (doctors, scouts, trainers) and add specified player ratings based on performance (20-80 scale)
 def rockies_roster():
     global selected_team
@@ -911,8 +560,7 @@ def rockies_roster():
     sort_desc = True  # True means descending order
 
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    if selected_team is None or selected_team.name != "Colorado Rockies":
-        selected_team = create_rockies_team()
+    selected_team = team_registry.get("rockies")
     headers = ["Name", "Position", "Speed", "Power", "Contact", "Eye", "Gap Power", "Triple",
                "Framing", "Blocking", "Catcher Arm", "Range", "Arm Strength", "Power Pot.",
                "Contact Pot.", "Eye Pot.", "Gap Power Pot.", "Triple Pot.",
@@ -930,6 +578,7 @@ def rockies_roster():
                   player.attributes["arm_strength_pot"]])
         for player in selected_team.batters
     ]
+    roster_query = PlayerQuery(batter_index, [selected_team])
     scroll_offset_y = 0
     scroll_offset_x = 0
     max_visible_rows = 10
@@ -1007,11 +656,9 @@ def rockies_roster():
                             else:
                                 sort_col = clicked_col
                                 sort_desc = True
-                            # When sorting, work on the tuple's second element.
-                            if clicked_col < 2:
-                                data.sort(key=lambda item: item[1][clicked_col], reverse=sort_desc)
-                            else:
-                                data.sort(key=lambda item: float(item[1][clicked_col]), reverse=sort_desc)
+                            # Re-read the roster in the clicked column's order from the stat index
+                            ordered = roster_query.order_by(ROSTER_COLUMNS[clicked_col], sort_desc)
+                            data = list(zip(ordered.players(), ordered.table(ROSTER_COLUMNS)))
                     else:
                         # Click outside header area but within table bounds? Determine if a data row was clicked.
                         if header_y + row_height <= mouse_y < header_y + row_height * (
@@ -1029,8 +676,7 @@ def rockies_roster():
 def rockies_staff():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    if selected_team is None or selected_team.name != "Colorado Rockies":
-        selected_team = create_rockies_team()
+    selected_team = team_registry.get("rockies")
     headers = ["Name", "Role", "Experience", "Hitting", "Pitching", "Fielding"]
     data = [
         [staff.name, staff.role, staff.attributes["experience"], staff.attributes["hitting"],
@@ -1079,6 +725,7 @@ def dodgers_menu():
     view_roster = Button(30, 75, 200, 50, "View Roster", BLACK, GREEN)
     play_game = Button(30, 195, 200, 50, "Play Game!", BLACK, GREEN)
     view_staff = Button(30, 135, 200, 50, "View Staff", BLACK, GREEN)
+    optimize_button = Button(30, 255, 200, 50, "Optimize Lineup", BLACK, GREEN)
     dodgers_running = True
     while dodgers_running:
         screen.fill(DODGER_BLUE)
@@ -1087,76 +734,32 @@ def dodgers_menu():
         view_roster.draw(screen)
         play_game.draw(screen)
         view_staff.draw(screen)
+        optimize_button.draw(screen)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if view_roster.is_clicked(event):
-                selected_team = create_dodgers_team()
+                selected_team = team_registry.get("dodgers")
                 return "dodgers_roster"
             if play_game.is_clicked(event):
-                selected_team = create_dodgers_team()
+                selected_team = team_registry.get("dodgers")
                 return "play_game"
+            if optimize_button.is_clicked(event):
+                selected_team = team_registry.get("dodgers")
+                return "lineup:dodgers"
             if view_staff.is_clicked(event):
                 return "dodgers_staff"
             if back_button.is_clicked(event):
                 return "national_league_west"
         clock.tick(FPS)
 
-def create_dodgers_team():
-    dodgers_batters = [
-        Batter("Will Smith", "C"),
-        Batter("Austin Barnes", "C"),
-        Batter("Freddie Freeman", "1B"),
-        Batter("Hye-Song Kim", "2B"),
-        Batter("Enrique Hernandez", "2B"),
-        Batter("Max Muncy", "3B"),
-        Batter("Mookie Betts", "SS"),
-        Batter("Miguel Rojas", "SS"),
-        Batter("Michael Conforto", "LF"),
-        Batter("Tommy Edman", "CF"),
-        Batter("Chris Taylor", "CF"),
-        Batter("Andy Pages", "CF"),
-        Batter("Teoscar Hernandez", "RF"),
-        Batter("Shohei Ohtani", "DH")
-    ]
-    dodgers_pitchers = [
-        Pitcher("Blake Snell", "SP"),
-        Pitcher("Yoshinobu Yamamoto", "SP"),
-        Pitcher("Tyler Glasnow", "SP"),
-        Pitcher("Shohei Ohtani", "SP"),
-        Pitcher("Roki Sasaki", "SP"),
-        Pitcher("Tony Gonsolin", "SP"),
-        Pitcher("Clayton Kershaw", "SP"),
-        Pitcher("Dustin May", "SP"),
-        Pitcher("Landon Knack", "SP"),
-        Pitcher("Emmet Sheehan", "SP"),
-        Pitcher("Gavin Stone", "SP"),
-        Pitcher("River Ryan", "SP"),
-        Pitcher("Michael Kopech", "RP"),
-        Pitcher("Blake Treinen", "RP"),
-        Pitcher("Tanner Scott", "RP"),
-        Pitcher("Alex Vesia", "RP"),
-        Pitcher("Brusdar Graterol", "RP"),
-        Pitcher("Kirby Yates", "RP"),
-        Pitcher("Anthony Banda", "RP"),
-        Pitcher("Ben Casparius", "RP")
-    ]
-    dodgers_staff = [
-        Coach("Dave Roberts", "MA"),
-        Coach("Kobe Bryant", "1B"),
-        Coach("Jerry West", "3B"),
-        Coach("Wayne Gretzky", "HC"),
-        Coach("Sandy Koufax", "PC")
-    ]
-    return Team("Los Angeles Dodgers", dodgers_batters, dodgers_pitchers, dodgers_staff)
 # Need to add more kinds of staff (doctors, scouts, trainers) and add specified player ratings based on performance (20-80 scale)
 def dodgers_roster():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", GREEN, BLACK)
-    if selected_team is None or selected_team.name != "Los Angeles Dodgers":
-        selected_team = create_dodgers_team()
+    selected_team = team_registry.get("dodgers")
     headers = ["Name", "Position", "Speed", "Power", "Contact", "Fielding", "Eye"]
     data = [
         [player.name, player.position, player.attributes["speed"], player.attributes["power"],
@@ -1204,8 +807,7 @@ def dodgers_roster():
 def dodgers_staff():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    if selected_team is None or selected_team.name != "Los Angeles Dodgers":
-        selected_team = create_dodgers_team()
+    selected_team = team_registry.get("dodgers")
     headers = ["Name", "Role", "Experience", "Hitting", "Pitching", "Fielding"]
     data = [
         [staff.name, staff.role, staff.attributes["experience"], staff.attributes["hitting"],
@@ -1258,6 +860,7 @@ def diamondbacks_menu():
     view_roster = Button(30, 75, 200, 50, "View Roster", BLACK, GREEN)
     play_game = Button(30, 195, 200, 50, "Play Game!", BLACK, GREEN)
     view_staff = Button(30, 135, 200, 50, "View Staff", BLACK, GREEN)
+    optimize_button = Button(30, 255, 200, 50, "Optimize Lineup", BLACK, GREEN)
 
     diamondbacks_menu_running = True
     while diamondbacks_menu_running:
@@ -1267,75 +870,32 @@ def diamondbacks_menu():
         view_roster.draw(screen)
         play_game.draw(screen)
         view_staff.draw(screen)
+        optimize_button.draw(screen)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if view_roster.is_clicked(event):
-                selected_team = create_diamondbacks_team()
+                selected_team = team_registry.get("diamondbacks")
                 return "diamondbacks_roster"
             if play_game.is_clicked(event):
-                selected_team = create_diamondbacks_team()
+                selected_team = team_registry.get("diamondbacks")
                 return "play_game"
+            if optimize_button.is_clicked(event):
+                selected_team = team_registry.get("diamondbacks")
+                return "lineup:diamondbacks"
             if view_staff.is_clicked(event):
                 return "diamondbacks_staff"
             if back_button.is_clicked(event):
                 return "national_league_west"
         clock.tick(FPS)
 
-def create_diamondbacks_team():
-    diamondbacks_batters = [
-        Batter("Gabriel Moreno", "C"),
-        Batter("Jose Herrera", "C"),
-        Batter("Adrian Del Castillo", "C"),
-        Batter("Rene Pinto", "C"),
-        Batter("Josh Naylor", "1B"),
-        Batter("Trey Mancini", "1B"),
-        Batter("Ketel Marte", "2B"),
-        Batter("Garrett Hampson", "2B"),
-        Batter("Eugenio Suarez", "3B"),
-        Batter("Grae Kessinger", "3B"),
-        Batter("Geraldo Perdomo", "SS"),
-        Batter("Jordan Lawalr", "SS"),
-        Batter("Lourdes Gurriel Jr.", "LF"),
-        Batter("Randal Grichuk", "LF"),
-        Batter("Jake McCarthy", "CF"),
-        Batter("Alek Thomas", "CF"),
-        Batter("Corbin Carroll", "RF"),
-        Batter("Pavin Smith", "DH")
-    ]
-    diamondbacks_pitchers = [
-        Pitcher("Corbin Burnes", "SP"),
-        Pitcher("Zac Gallen", "SP"),
-        Pitcher("Merrill Kelly", "SP"),
-        Pitcher("Eduardo Rodriguez", "SP"),
-        Pitcher("Brandon Pfaadt", "SP"),
-        Pitcher("Jordan Montgomery", "SP"),
-        Pitcher("Ryne Nelson", "SP"),
-        Pitcher("Kevin Ginkel", "RP"),
-        Pitcher("Joe Mantiply,", "RP"),
-        Pitcher("A.J. Puk", "RP"),
-        Pitcher("Ryan Thomspon", "RP"),
-        Pitcher("Justin Martinez", "RP"),
-        Pitcher("Kendall Graveman", "RP"),
-        Pitcher("Kyle Nelson", "RP"),
-        Pitcher("Scott McGough", "RP")
-    ]
-    diamondbacks_staff = [
-        Coach("Salvatore Lovullo", "MA"),
-        Coach("Steve Nash", "1B"),
-        Coach("Luis Gonzalez", "3B"),
-        Coach("Charles Barkley", "HC"),
-        Coach("Sean Elliot", "PC")
-    ]
-    return Team("Arizona Diamondbacks", diamondbacks_batters, diamondbacks_pitchers, diamondbacks_staff)
 # Need to add more kinds of staff (doctors, scouts, trainers) and add specified player ratings based on performance (20-80 scale)
 def diamondbacks_roster():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", GREEN, BLACK)
-    if selected_team is None or selected_team.name != "Arizona Diamondbacks":
-        selected_team = create_diamondbacks_team()
+    selected_team = team_registry.get("diamondbacks")
     headers = ["Name", "Position", "Speed", "Power", "Contact", "Fielding", "Eye"]
     data = [
         [player.name, player.position, player.attributes["speed"], player.attributes["power"],
@@ -1383,8 +943,7 @@ def diamondbacks_roster():
 def diamondbacks_staff():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    if selected_team is None or selected_team.name != "Arizona Diamondbacks":
-        selected_team = create_diamondbacks_team()
+    selected_team = team_registry.get("diamondbacks")
     headers = ["Name", "Role", "Experience", "Hitting", "Pitching", "Fielding"]
     data = [
         [staff.name, staff.role, staff.attributes["experience"], staff.attributes["hitting"],
@@ -1435,6 +994,7 @@ def padres_menu():
     view_roster = Button(30, 75, 200, 50, "View Roster", BLACK, GREEN)
     play_game = Button(30, 195, 200, 50, "Play Game!", BLACK, GREEN)
     view_staff = Button(30, 135, 200, 50, "View Staff", BLACK, GREEN)
+    optimize_button = Button(30, 255, 200, 50, "Optimize Lineup", BLACK, GREEN)
 
     padres_menu_running = True
     while padres_menu_running:
@@ -1444,83 +1004,32 @@ def padres_menu():
         view_roster.draw(screen)
         play_game.draw(screen)
         view_staff.draw(screen)
+        optimize_button.draw(screen)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if view_roster.is_clicked(event):
-                selected_team = create_padres_team()
+                selected_team = team_registry.get("padres")
                 return "padres_roster"
             if play_game.is_clicked(event):
-                selected_team = create_padres_team()
+                selected_team = team_registry.get("padres")
                 return "play_game"
+            if optimize_button.is_clicked(event):
+                selected_team = team_registry.get("padres")
+                return "lineup:padres"
             if view_staff.is_clicked(event):
                 return "padres_staff"
             if back_button.is_clicked(event):
                 return "national_league_west"
         clock.tick(FPS)
 
-def create_padres_team():
-    padres_batters = [
-        Batter("Elias Diaz", "C"),
-        Batter("Luis Campusano", "C"),
-        Batter("Brett Sullivan", "C"),
-        Batter("Luis Arraez", "1B"),
-        Batter("Jake Cronenworth", "2B"),
-        Batter("Eguy Rosario", "2B"),
-        Batter("Manny Machado", "3B"),
-        Batter("Tyler Wade", "3B"),
-        Batter("Xander Bogarts", "SS"),
-        Batter("Mason McCoy", "SS"),
-        Batter("Jason Heyward", "LF"),
-        Batter("Tirso Ornelas", "LF"),
-        Batter("Jackson Merrill", "CF"),
-        Batter("Brandon Lockridge", "CF"),
-        Batter("Fernando Tatis Jr.", "RF"),
-        Batter("Connor Joe", "DH")
-    ]
-    padres_pitchers = [
-        Pitcher("Dylan Cease", "SP"),
-        Pitcher("Michael King", "SP"),
-        Pitcher("Yu Darvish", "SP"),
-        Pitcher("Nick Pivetta", "SP"),
-        Pitcher("Matt Waldron", "SP"),
-        Pitcher("Randy Vasquez", "SP"),
-        Pitcher("Kyle Hart", "SP"),
-        Pitcher("Jhony Brito", "SP"),
-        Pitcher("Stephen Kolek", "SP"),
-        Pitcher("Joe Musgrove", "SP"),
-        Pitcher("Robert Suarez", "RP"),
-        Pitcher("Jason Adam", "RP"),
-        Pitcher("Jeremiah Estrada", "RP"),
-        Pitcher("Adrian Morejon", "RP"),
-        Pitcher("Bryan Hoeing", "RP"),
-        Pitcher("Yuki Matsui", "RP"),
-        Pitcher("Sean Reynolds", "RP"),
-        Pitcher("Wandy Peralta", "RP"),
-        Pitcher("Alek Jacob", "RP"),
-        Pitcher("Jose Espada", "RP"),
-        Pitcher("Tom Cosgrove", "RP"),
-        Pitcher("Juan Nunez", "RP"),
-        Pitcher("Ron Marinaccio", "RP"),
-        Pitcher("Logan Gillaspie", "RP"),
-        Pitcher("Luis Patino", "RP")
-    ]
-    padres_staff = [
-        Coach("Mike Shildt", "MA"),
-        Coach("LaDainian Tomlinson", "1B"),
-        Coach("Marcus Allen", "3B"),
-        Coach("Tony Gwynn", "HC"),
-        Coach("Shaun White", "PC")
-    ]
-    return Team("San Diego Padres", padres_batters, padres_pitchers, padres_staff)
 # Need to add more kinds of staff (doctors, scouts, trainers) and add specified player ratings based on performance (20-80 scale)
 def padres_roster():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", GREEN, BLACK)
-    if selected_team is None or selected_team.name != "San Diego Padres":
-        selected_team = create_padres_team()
+    selected_team = team_registry.get("padres")
     headers = ["Name", "Position", "Speed", "Power", "Contact", "Fielding", "Eye"]
     data = [
         [player.name, player.position, player.attributes["speed"], player.attributes["power"],
@@ -1568,8 +1077,7 @@ def padres_roster():
 def padres_staff():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    if selected_team is None or selected_team.name != "San Diego Padres":
-        selected_team = create_padres_team()
+    selected_team = team_registry.get("padres")
     headers = ["Name", "Role", "Experience", "Hitting", "Pitching", "Fielding"]
     data = [
         [staff.name, staff.role, staff.attributes["experience"], staff.attributes["hitting"],
@@ -1620,6 +1128,7 @@ def giants_menu():
     view_roster = Button(30, 75, 200, 50, "View Roster", BLACK, GREEN)
     play_game = Button(30, 195, 200, 50, "Play Game!", BLACK, GREEN)
     view_staff = Button(30, 135, 200, 50, "View Staff", BLACK, GREEN)
+    optimize_button = Button(30, 255, 200, 50, "Optimize Lineup", BLACK, GREEN)
     giants_menu_running = True
     while giants_menu_running:
         screen.fill(GIANT_ORANGE)
@@ -1628,73 +1137,31 @@ def giants_menu():
         play_game.draw(screen)
         back_button.draw(screen)
         view_staff.draw(screen)
+        optimize_button.draw(screen)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if view_roster.is_clicked(event):
-                selected_team = create_giants_team()
+                selected_team = team_registry.get("giants")
                 return "giants_roster"
             if play_game.is_clicked(event):
-                selected_team = create_giants_team()
+                selected_team = team_registry.get("giants")
                 return "play_game"
+            if optimize_button.is_clicked(event):
+                selected_team = team_registry.get("giants")
+                return "lineup:giants"
             if view_staff.is_clicked(event):
                 return "giants_staff"
             if back_button.is_clicked(event):
                 return "national_league_west"
 
-def create_giants_team():
-    giants_batters = [
-        Batter("Patrick Bailey", "C"),
-        Batter("Tom Murphy", "C"),
-        Batter("Sam Huff", "C"),
-        Batter("LaMonte Wade Jr.", "1B"),
-        Batter("Wilmer Flores", "1B"),
-        Batter("Tyler Fitzgerald", "2B"),
-        Batter("Brett Wisely", "2B"),
-        Batter("Matt Chapman", "3B"),
-        Batter("Casey Schmitt", "3B"),
-        Batter("Willy Adames", "SS"),
-        Batter("Osleivis Basabe", "SS"),
-        Batter("Heliot Ramos", "LF"),
-        Batter("Jung Hoo Lee", "CF"),
-        Batter("Grant McCray", "CF"),
-        Batter("Mike Yastremski", "RF"),
-        Batter("Jerar Encarnacion", "DH")
-    ]
-    giants_pitchers = [
-        Pitcher("Logan Webb", "SP"),
-        Pitcher("Robbie Ray", "SP"),
-        Pitcher("Justin Verlander", "SP"),
-        Pitcher("Jordan Hicks", "SP"),
-        Pitcher("Kyle Harrison", "SP"),
-        Pitcher("Hayden Birdsong", "SP"),
-        Pitcher("Landen Roupp", "SP"),
-        Pitcher("Keaton Winn", "SP"),
-        Pitcher("Ryan Walker", "RP"),
-        Pitcher("Tyler Rogers", "RP"),
-        Pitcher("Sean Hjelle", "RP"),
-        Pitcher("Erik Miller", "RP"),
-        Pitcher("Camilo Doval", "RP"),
-        Pitcher("Tristan Beck", "RP"),
-        Pitcher("Spencer Bivens", "RP"),
-        Pitcher("Randy Rodriguez", "RP")
-    ]
-    giants_staff= [
-        Coach("Bob Melvin", "MA"),
-        Coach("Jerry Rice", "1B"),
-        Coach("Stephen Curry", "3B"),
-        Coach("Barry Bonds", "HC"),
-        Coach("Joe Montana", "PC")
-    ]
-    return Team("San Francisco Giants", giants_batters, giants_pitchers, giants_staff)
 # Need to add more kinds of staff (doctors, scouts, trainers) and add specified player ratings based on performance (20-80 scale)
 def giants_roster():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", GREEN, BLACK)
-    if selected_team is None or selected_team.name != "San Francisco Giants":
-        selected_team = create_giants_team()
+    selected_team = team_registry.get("giants")
     headers = ["Name", "Position", "Speed", "Power", "Contact", "Fielding", "Eye"]
     data = [
         [player.name, player.position, player.attributes["speed"], player.attributes["power"],
@@ -1742,8 +1209,7 @@ def giants_roster():
 def giants_staff():
     global selected_team
     back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
-    if selected_team is None or selected_team.name != "San Francisco Giants":
-        selected_team = create_giants_team()
+    selected_team = team_registry.get("giants")
     headers = ["Name", "Role", "Experience", "Hitting", "Pitching", "Fielding"]
     data = [
         [staff.name, staff.role, staff.attributes["experience"], staff.attributes["hitting"],
@@ -1786,9 +1252,168 @@ def giants_staff():
                 elif event.button == 5 and scroll_offset_y < len(data) - max_visible_rows:
                     scroll_offset_y += 1
 
+def team_menu(team_id):
+    global selected_team
+    record = roster_database.record(team_id)
+    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
+    view_roster = Button(30, 75, 200, 50, "View Roster", BLACK, GREEN)
+    play_game = Button(30, 195, 200, 50, "Play Game!", BLACK, GREEN)
+    view_staff = Button(30, 135, 200, 50, "View Staff", BLACK, GREEN)
+    optimize_button = Button(30, 255, 200, 50, "Optimize Lineup", BLACK, GREEN)
+    team_menu_running = True
+    while team_menu_running:
+        screen.fill(record["color"])
+        draw_text(screen, f"{record['nickname']} GM", pygame.font.SysFont(None, 48), BLACK, 10, 10)
+        view_roster.draw(screen)
+        play_game.draw(screen)
+        back_button.draw(screen)
+        view_staff.draw(screen)
+        optimize_button.draw(screen)
+        pygame.display.flip()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if view_roster.is_clicked(event):
+                selected_team = team_registry.get(team_id)
+                return f"team_roster:{team_id}"
+            if play_game.is_clicked(event):
+                selected_team = team_registry.get(team_id)
+                return "play_game"
+            if optimize_button.is_clicked(event):
+                selected_team = team_registry.get(team_id)
+                return f"lineup:{team_id}"
+            if view_staff.is_clicked(event):
+                return f"team_staff:{team_id}"
+            if back_button.is_clicked(event):
+                return division_menu_name(record["league"], record["division"])
+        clock.tick(FPS)
+
+def team_table(team_id, title, headers, data, max_visible_cols):
+    record = roster_database.record(team_id)
+    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
+    scroll_offset_y = 0
+    scroll_offset_x = 0
+    max_visible_rows = 10
+    name_col_width = 200
+    col_width = 100
+    team_table_running = True
+    while team_table_running:
+        screen.fill(record["color"])
+        draw_text(screen, f"{record['nickname']} {title}", pygame.font.SysFont(None, 48), BLACK, 10, 10)
+        draw_table(screen, headers, data, start_x=50, start_y=100,
+                   scroll_offset_y=scroll_offset_y, scroll_offset_x=scroll_offset_x,
+                   max_visible_rows=max_visible_rows, name_col_width=name_col_width, col_width=col_width)
+        back_button.draw(screen)
+        pygame.display.flip()
+        clock.tick(FPS)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif back_button.is_clicked(event):
+                return team_menu_name(team_id)
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_DOWN and scroll_offset_y < len(data) - max_visible_rows:
+                    scroll_offset_y += 1
+                elif event.key == pygame.K_UP and scroll_offset_y > 0:
+                    scroll_offset_y -= 1
+                elif event.key == pygame.K_RIGHT and scroll_offset_x < len(headers) - max_visible_cols:
+                    scroll_offset_x += 1
+                elif event.key == pygame.K_LEFT and scroll_offset_x > 0:
+                    scroll_offset_x -= 1
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 4 and scroll_offset_y > 0:
+                    scroll_offset_y -= 1
+                elif event.button == 5 and scroll_offset_y < len(data) - max_visible_rows:
+                    scroll_offset_y += 1
+
+def team_roster(team_id):
+    global selected_team
+    selected_team = team_registry.get(team_id)
+    headers = ["Name", "Position", "Speed", "Power", "Contact", "Eye", "Range"]
+    data = [
+        [player.name, player.position, player.attributes["speed"], player.attributes["power"],
+         player.attributes["contact"], player.attributes["eye"], player.attributes["range"]]
+        for player in selected_team.batters
+    ]
+    return team_table(team_id, "Roster", headers, data, max_visible_cols=4)
+
+def team_staff(team_id):
+    global selected_team
+    selected_team = team_registry.get(team_id)
+    headers = ["Name", "Role", "Experience", "Hitting", "Pitching", "Fielding"]
+    data = [
+        [staff.name, staff.role, staff.attributes["experience"], staff.attributes["hitting"],
+         staff.attributes["pitching"], staff.attributes["fielding"]] for staff in selected_team.staff
+    ]
+    return team_table(team_id, "Staff", headers, data, max_visible_cols=4)
+
+def lineup_screen(team_id):
+    team = team_registry.get(team_id)
+    # The search takes a few seconds, so say so before it starts
+    screen.fill(BASEBALL_GREEN)
+    draw_text(screen, "Optimizing lineup...", pygame.font.SysFont(None, 48), BLACK, 10, 10)
+    pygame.display.flip()
+    # In-process: spawned pool workers would re-import this module and open their own windows
+    lineup = optimize_lineup(team, workers=1)
+    headers = ["Name", "Slot", "Position", "Listed"]
+    data = [[batter.name, slot + 1, position, batter.position]
+            for slot, (batter, position) in enumerate(lineup)]
+    back_button = Button(30, 525, 200, 50, "Back", BLACK, GREEN)
+    apply_button = Button(270, 525, 200, 50, "Use Lineup", BLACK, GREEN)
+    lineup_running = True
+    while lineup_running:
+        screen.fill(BASEBALL_GREEN)
+        draw_text(screen, f"Best Lineup: {lineup.runs_per_game:.2f} runs/game", pygame.font.SysFont(None, 48),
+                  BLACK, 10, 10)
+        draw_table(screen, headers, data, start_x=50, start_y=100, max_visible_rows=9,
+                   name_col_width=200, col_width=100)
+        back_button.draw(screen)
+        apply_button.draw(screen)
+        pygame.display.flip()
+        clock.tick(FPS)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if apply_button.is_clicked(event):
+                lineup.apply(team)
+                return team_menu_name(team_id)
+            if back_button.is_clicked(event):
+                return team_menu_name(team_id)
+
+# Clubs with their own hand-made screens; every other club uses team_menu()
+BESPOKE_TEAMS = {"rockies", "dodgers", "diamondbacks", "padres", "giants"}
+DIVISION_MENUS = {
+    "american_league_east": ("American League", "East", "division_menu_american"),
+    "american_league_central": ("American League", "Central", "division_menu_american"),
+    "american_league_west": ("American League", "West", "division_menu_american"),
+    "national_league_east": ("National League", "East", "division_menu_national"),
+    "national_league_central": ("National League", "Central", "division_menu_national"),
+    "national_league_west": ("National League", "West", "division_menu_national"),
+}
+
+def team_menu_name(team_id):
+    return f"{team_id}_menu" if team_id in BESPOKE_TEAMS else f"team_menu:{team_id}"
+
+def division_menu_name(league_name, division_name):
+    for menu, (menu_league, menu_division, _) in DIVISION_MENUS.items():
+        if (menu_league, menu_division) == (league_name, division_name):
+            return menu
+    return "league_menu"
+
+# Rosters come from baseball_sim/data; each club is built on first use and then
+# kept, so ratings stay the same between screens
+roster_database = RosterDatabase()
+team_registry = roster_database.registry()
+# Win probability tables per matchup, built once and then looked up every frame
+expectancy_cache = ExpectancyCache()
+# Sorted columns over every batter loaded so far, kept current as ratings and stats change
+batter_index = StatIndex(roster_database.store)
+
 def main():
     global selected_team
-    available_teams = [create_rockies_team, create_dodgers_team, create_diamondbacks_team, create_padres_team, create_giants_team]
     current_menu = "main_menu"
     while True:
         if current_menu == "main_menu":
@@ -1799,18 +1424,8 @@ def main():
             current_menu = division_menu_national()
         elif current_menu == "division_menu_american":
             current_menu = division_menu_american()
-        elif current_menu == "national_league_west":
-            current_menu = national_league_west_menu()
-        elif current_menu == "national_league_central":
-            current_menu = national_league_central_menu()
-        elif current_menu == "national_league_east":
-            current_menu = national_league_east_menu()
-        elif current_menu == "american_league_west":
-            current_menu = american_league_west_menu()
-        elif current_menu == "american_league_central":
-            current_menu = american_league_central_menu()
-        elif current_menu == "american_league_east":
-            current_menu = american_league_east_menu()
+        elif current_menu in DIVISION_MENUS:
+            current_menu = division_teams_menu(*DIVISION_MENUS[current_menu])
         elif current_menu == "rockies_menu":
             current_menu = rockies_menu()
         elif current_menu == "dodgers_menu":
@@ -1841,21 +1456,29 @@ def main():
             current_menu = padres_staff()
         elif current_menu == "giants_staff":
             current_menu = giants_staff()
+        elif current_menu.startswith("team_menu:"):
+            current_menu = team_menu(current_menu.split(":", 1)[1])
+        elif current_menu.startswith("team_roster:"):
+            current_menu = team_roster(current_menu.split(":", 1)[1])
+        elif current_menu.startswith("team_staff:"):
+            current_menu = team_staff(current_menu.split(":", 1)[1])
+        elif current_menu.startswith("lineup:"):
+            current_menu = lineup_screen(current_menu.split(":", 1)[1])
         elif current_menu == "play_game":
             if selected_team is None:
                 print("Error: No team selected! Returning to menu.")
-                current_menu = "dynasty_menu"
+                current_menu = "main_menu"
             else:
-                # Instantiate all teams and filter out the selected one
-                all_teams = [team_func() for team_func in available_teams]
-                possible_opponents = [team for team in all_teams if team.name != selected_team]
+                # Pick the opponent by id so only the two clubs playing get built
+                selected_id = team_registry.id_of(selected_team)
+                possible_opponents = [team_id for team_id in team_registry.ids() if team_id != selected_id]
 
                 if not possible_opponents:
                     print("No valid opponent found!")
-                    current_menu = "dynasty_menu"
+                    current_menu = "main_menu"
                     continue
 
-                opponent_team = random.choice(possible_opponents)
+                opponent_team = team_registry.get(random.choice(possible_opponents))
 
                 # Randomly determine home and away teams
                 if random.choice([True, False]):
@@ -1869,12 +1492,8 @@ def main():
                 play_baseball_game(game)
 
             # After the game, return to the same team menu
-            if selected_team.name == "Colorado Rockies":
-                current_menu = "rockies_menu"
-            elif selected_team.name == "Los Angeles Dodgers":
-                current_menu = "dodgers_menu"
-            else:
-                current_menu = "dynasty_menu"  # Fallback if more teams are added
+            if selected_team is not None:
+                current_menu = team_menu_name(team_registry.id_of(selected_team))
 
 if __name__ == "__main__":
     # Start directly with main() as it calls main_menu internally.
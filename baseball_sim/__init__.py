@@ -0,0 +1,31 @@
+"""
+Headless baseball simulation engine.
+
+Nothing in this package imports pygame, so games and seasons can be
+simulated on a server. FirstBaseballGame.py builds its screens on top of it.
+"""
+from .engine import Coach, Pitcher, Batter, Team, Game
+from .simulation import create_random_team, simulate_game, simulate_games
+from .sampler import MatchupSampler, outcome_probabilities, sample_outcomes, sample_outcome_counts
+from .bases import INNING_OVER, NEXT_STATE, RUNS_SCORED, encode_state, decode_state, describe_state
+from .league import League, PlayoffBracket, play_series
+from .projections import project_seasons, simulate_seasons
+from .rng import SimRandom, make_rng
+from .roster_store import RosterStore
+from .eventlog import EventLog, EventLogWriter
+from .boxscore import BoxScore, merge_box_scores
+from .schedule import Schedule, generate_schedule
+from .league import HallOfFame
+from .draft import Draft, DraftBoard, draft_order, lottery_order
+from .standings import Standings, default_divisions
+from .leaderboards import CareerRecords, Leaderboard
+from .savegame import SaveGame, save_league, load_league
+from .registry import TeamRegistry
+from .rosters import RosterDatabase
+from .lineup import Lineup, LineupOptimizer, optimize_lineup
+from .expectancy import ExpectancyCache, InningModel, WinExpectancy
+from .matchups import MatchupCache, coach_context, matchup_cache
+from .development import develop_players
+from .freeagency import FreeAgencyMarket, market_values, run_free_agency
+from .minors import FarmSystem
+from .query import PlayerQuery, StatIndex
@@ -0,0 +1,84 @@
+"""
+Base-out states and the transition table the half-inning loop runs on.
+
+A state is a small integer: outs * 8 + a bitmask of occupied bases
+(1 = first, 2 = second, 4 = third), so the 24 live states are 0-23 and
+INNING_OVER (24) is the third out. NEXT_STATE and RUNS_SCORED are flat lists
+indexed by state * NUM_OUTCOMES + outcome.
+"""
+from .outcomes import OUT, WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN, NUM_OUTCOMES
+
+FIRST = 1
+SECOND = 2
+THIRD = 4
+NUM_STATES = 24
+INNING_OVER = NUM_STATES
+BASE_NAMES = ["1st", "2nd", "3rd"]
+
+
+def encode_state(outs, bases):
+    """
+    Packs outs and a bitmask of occupied bases into a state number.
+    """
+    return INNING_OVER if outs >= 3 else outs * 8 + bases
+
+
+def decode_state(state):
+    """
+    Returns (outs, first, second, third) for a state number.
+    """
+    if state == INNING_OVER:
+        return 3, False, False, False
+    outs, bases = divmod(state, 8)
+    return outs, bool(bases & FIRST), bool(bases & SECOND), bool(bases & THIRD)
+
+
+def describe_state(state):
+    outs, *occupied = decode_state(state)
+    runners = [name for name, on_base in zip(BASE_NAMES, occupied) if on_base]
+    return f"{outs} out, {', '.join(runners) if runners else 'bases empty'}"
+
+
+def _advance(bases, outcome):
+    """
+    Returns (new_bases, runs) for one batted-ball outcome. Walks only move
+    forced runners; hits move every runner the same number of bases as the
+    batter, except that a runner on first goes to third on a double.
+    """
+    runners = bin(bases).count("1")
+    if outcome == WALK:
+        if not bases & FIRST:
+            return bases | FIRST, 0
+        if not bases & SECOND:
+            return bases | SECOND, 0
+        if not bases & THIRD:
+            return bases | THIRD, 0
+        return bases, 1
+    if outcome == SINGLE:
+        return ((bases << 1) & 7) | FIRST, 1 if bases & THIRD else 0
+    if outcome == DOUBLE:
+        return SECOND | (THIRD if bases & FIRST else 0), (1 if bases & SECOND else 0) + (1 if bases & THIRD else 0)
+    if outcome == TRIPLE:
+        return THIRD, runners
+    if outcome == HOME_RUN:
+        return 0, runners + 1
+    raise ValueError(f"Unknown outcome {outcome}")
+
+
+def _build_tables():
+    next_state = [INNING_OVER] * ((NUM_STATES + 1) * NUM_OUTCOMES)
+    runs_scored = [0] * ((NUM_STATES + 1) * NUM_OUTCOMES)
+    for state in range(NUM_STATES):
+        outs, bases = divmod(state, 8)
+        for outcome in range(NUM_OUTCOMES):
+            index = state * NUM_OUTCOMES + outcome
+            if outcome == OUT:
+                next_state[index] = encode_state(outs + 1, bases)
+            else:
+                new_bases, runs = _advance(bases, outcome)
+                next_state[index] = encode_state(outs, new_bases)
+                runs_scored[index] = runs
+    return next_state, runs_scored
+
+
+NEXT_STATE, RUNS_SCORED = _build_tables()
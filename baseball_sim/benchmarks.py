@@ -0,0 +1,165 @@
+"""
+Throughput benchmarks for the simulation engine.
+
+Runs headless with fixed seeds and reports plate appearances, half innings,
+games and seasons per second, plus each benchmark's peak traced memory.
+Results can be saved as JSON and compared against an earlier run:
+
+    python -m baseball_sim.benchmarks --output results.json
+    python -m baseball_sim.benchmarks --baseline results.json --threshold 0.10
+
+The comparison exits with status 1 if any rate drops by more than the
+threshold, so it can gate a change.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .engine import Game
+from .league import League
+from .rng import SimRandom
+from .roster_store import RosterStore
+from .sampler import MatchupSampler
+from .simulation import create_random_team, simulate_game
+
+SEED = 20240401
+
+
+def _teams(rng):
+    store = RosterStore()
+    return create_random_team("Home", rng, store=store), create_random_team("Away", rng, store=store)
+
+
+def bench_atbat(scale):
+    rng = SimRandom(SEED)
+    home, away = _teams(rng)
+    sampler = MatchupSampler(away.batters[:9], home.pitchers, rng.generator)
+    plate_appearances = 200000 * scale
+    pitchers = home.pitchers
+    batters = away.batters[:9]
+    start = time.perf_counter()
+    for i in range(plate_appearances):
+        batter_slot = i % 9
+        pitcher_slot = i % len(pitchers)
+        batters[batter_slot].atbat(pitchers[pitcher_slot], sampler.draw(batter_slot, pitcher_slot))
+    return plate_appearances, time.perf_counter() - start
+
+
+def bench_half_inning(scale):
+    rng = SimRandom(SEED)
+    home, away = _teams(rng)
+    game = Game(home, away, rng=rng, keep_box_score=False)
+    half_innings = 20000 * scale
+    start = time.perf_counter()
+    for _ in range(half_innings):
+        away.play_half_inning(home, game.away_sampler)
+    return half_innings, time.perf_counter() - start
+
+
+def bench_game(scale):
+    rng = SimRandom(SEED)
+    home, away = _teams(rng)
+    games = 2000 * scale
+    start = time.perf_counter()
+    for i in range(games):
+        simulate_game(home, away, rng=rng.spawn("game", i))
+    return games, time.perf_counter() - start
+
+
+def bench_season(scale):
+    rng = SimRandom(SEED)
+    league = League(rng=rng.spawn("teams"))
+    league.generate_schedule(rng.spawn("schedule"))
+    seasons = scale
+    start = time.perf_counter()
+    for season in range(seasons):
+        league.play_season(rng.spawn("season", season))
+    return seasons, time.perf_counter() - start
+
+
+BENCHMARKS = {
+    "atbat": (bench_atbat, "plate_appearances/sec"),
+    "half_inning": (bench_half_inning, "half_innings/sec"),
+    "game": (bench_game, "games/sec"),
+    "season": (bench_season, "seasons/sec"),
+}
+
+
+def run_benchmarks(names=None, scale=1, repeat=3):
+    """
+    Runs the named benchmarks (all by default) and returns a results dict.
+    Each benchmark keeps its best of `repeat` untraced timings, then runs
+    once more under tracemalloc at the smallest scale to record peak memory.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        function, unit = BENCHMARKS[name]
+        count, seconds = min((function(scale) for _ in range(repeat)), key=lambda timing: timing[1])
+        tracemalloc.start()
+        function(1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {"rate": count / seconds, "unit": unit, "seconds": seconds, "peak_memory_kb": peak / 1024}
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Returns a list of (name, baseline_rate, current_rate, change) for every
+    benchmark whose rate fell by more than `threshold` (a fraction).
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        old_rate = baseline["results"][name]["rate"]
+        change = (result["rate"] - old_rate) / old_rate
+        if change < -threshold:
+            regressions.append((name, old_rate, result["rate"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the baseball simulation engine.")
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--scale", type=int, default=1, help="multiply every benchmark's workload")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is kept")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved earlier")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (fraction)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    current = run_benchmarks(args.benchmarks, args.scale, args.repeat)
+    for name, result in current["results"].items():
+        print(f"{name:12} {result['rate']:>14,.1f} {result['unit']:24} peak {result['peak_memory_kb']:>10,.0f} KB")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for name, old_rate, new_rate, change in regressions:
+            print(f"REGRESSION {name}: {old_rate:,.1f} -> {new_rate:,.1f} ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Box scores built up while a game is played.
+
+A BoxScore is a plate-appearance recorder like EventLogWriter: each call
+adds one outcome to the batter's and pitcher's line and any runs to the
+current inning, which is O(1) per plate appearance. When the game ends,
+finish() formats every row once and keeps them, so drawing the box score
+never recomputes anything. merge_box_scores() sums finished box scores
+into a series view.
+"""
+from .outcomes import OUT, WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN, NUM_OUTCOMES
+
+RUNS = NUM_OUTCOMES  # Index of the runs column after the outcome counts
+LINE_SIZE = NUM_OUTCOMES + 1
+HITS = (SINGLE, DOUBLE, TRIPLE, HOME_RUN)
+
+BATTING_HEADERS = ["Name", "AB", "H", "2B", "3B", "HR", "BB", "RBI"]
+# The outcome model has no strikeouts, so pitchers get no SO column; IP shows their outs
+PITCHING_HEADERS = ["Name", "IP", "H", "R", "BB", "HR"]
+
+
+class BoxScore:
+    def __init__(self, away_team, home_team):
+        self.team_names = [away_team.name, home_team.name]
+        # Runs per inning (or per game for a series), in team_names order
+        self.innings = []
+        self.column_label = "Inning"
+        self.batting = {name: {} for name in self.team_names}
+        self.pitching = {name: {} for name in self.team_names}
+        self.finished = False
+        self._half = 0
+        self._batting_side = None
+        self._pitching_side = None
+
+    def begin_half(self, game_id, inning, half):
+        if half == 0:
+            self.innings.append([0, 0])
+        self._half = half
+        self._batting_side = self.batting[self.team_names[half]]
+        self._pitching_side = self.pitching[self.team_names[1 - half]]
+
+    def record_plate_appearance(self, batter, pitcher, outcome, state, runs):
+        line = self._batting_side.get(batter)
+        if line is None:
+            line = self._batting_side[batter] = [0] * LINE_SIZE
+        line[outcome] += 1
+        line[RUNS] += runs
+
+        line = self._pitching_side.get(pitcher)
+        if line is None:
+            line = self._pitching_side[pitcher] = [0] * LINE_SIZE
+        line[outcome] += 1
+        line[RUNS] += runs
+
+        if runs:
+            self.innings[-1][self._half] += runs
+
+    def runs(self, team_name):
+        side = self.team_names.index(team_name)
+        return sum(inning[side] for inning in self.innings)
+
+    def hits(self, team_name):
+        return sum(line[outcome] for line in self.batting[team_name].values() for outcome in HITS)
+
+    def line_score_rows(self):
+        """
+        Returns [name, runs per column..., R, H] for each team.
+        """
+        if self.finished:
+            return self._line_score_rows
+        return [[name] + [inning[side] for inning in self.innings] + [self.runs(name), self.hits(name)]
+                for side, name in enumerate(self.team_names)]
+
+    def batting_rows(self, team_name):
+        if self.finished:
+            return self._batting_rows[team_name]
+        return [_batting_row(batter.name, line) for batter, line in self.batting[team_name].items()]
+
+    def pitching_rows(self, team_name):
+        if self.finished:
+            return self._pitching_rows[team_name]
+        return [_pitching_row(pitcher.name, line) for pitcher, line in self.pitching[team_name].items()]
+
+    def finish(self):
+        """
+        Formats and caches every row. Call once the game is over.
+        """
+        self.finished = False
+        self._line_score_rows = self.line_score_rows()
+        self._batting_rows = {name: self.batting_rows(name) for name in self.team_names}
+        self._pitching_rows = {name: self.pitching_rows(name) for name in self.team_names}
+        self.finished = True
+
+
+def _batting_row(name, line):
+    walks = line[WALK]
+    at_bats = sum(line[:NUM_OUTCOMES]) - walks
+    hits = sum(line[outcome] for outcome in HITS)
+    return [name, at_bats, hits, line[DOUBLE], line[TRIPLE], line[HOME_RUN], walks, line[RUNS]]
+
+
+def _pitching_row(name, line):
+    outs = line[OUT]
+    innings_pitched = f"{outs // 3}.{outs % 3}"
+    hits = sum(line[outcome] for outcome in HITS)
+    return [name, innings_pitched, hits, line[RUNS], line[WALK], line[HOME_RUN]]
+
+
+def merge_box_scores(box_scores):
+    """
+    Sums finished box scores into one series box score. Its line score has
+    one column per game instead of per inning.
+    """
+    merged = BoxScore.__new__(BoxScore)
+    merged.team_names = list(box_scores[0].team_names)
+    merged.innings = []
+    merged.column_label = "Game"
+    merged.batting = {name: {} for name in merged.team_names}
+    merged.pitching = {name: {} for name in merged.team_names}
+    merged.finished = False
+
+    for box_score in box_scores:
+        merged.innings.append([box_score.runs(name) for name in merged.team_names])
+        for name in merged.team_names:
+            _add_lines(merged.batting[name], box_score.batting[name])
+            _add_lines(merged.pitching[name], box_score.pitching[name])
+    merged.finish()
+    return merged
+
+
+def _add_lines(totals, lines):
+    for player, line in lines.items():
+        total = totals.get(player)
+        if total is None:
+            totals[player] = list(line)
+        else:
+            for i, value in enumerate(line):
+                total[i] += value
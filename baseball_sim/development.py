@@ -0,0 +1,113 @@
+"""
+Offseason player development for a whole league at once.
+
+Young batters grow toward their *_pot ratings: each offseason closes a
+share of the gap between a rating and its potential, a share that is
+largest at 18 and fades to nothing at PEAK_AGE, plus a little noise.
+Past DECLINE_AGE every rating loses a Poisson-distributed number of points
+that grows with each year over, and speed starts to go a few years sooner.
+Pitchers have no potential ratings, so they grow more slowly toward the
+top of the scale instead.
+
+Everything works on the RosterStore rating arrays for all the chosen ids
+in one pass, so developing every rostered player and a draft class is a
+handful of NumPy operations.
+"""
+import random
+
+import numpy as np
+
+from .roster_store import BATTER_RATINGS
+
+MIN_RATING, MAX_RATING = 20, 80
+# Growth stops at this age and decline starts after DECLINE_AGE
+PEAK_AGE = 27
+DECLINE_AGE = 30
+SPEED_DECLINE_AGE = 27
+# Share of the gap to potential closed by an 18-year-old in one offseason
+MAX_GROWTH = 0.5
+GROWTH_NOISE = 1.0
+# Expected points lost per rating per year past the decline age
+DECLINE_RATE = 0.5
+# Pitchers grow toward MAX_RATING at this fraction of the batter rate
+PITCHER_GROWTH = 0.2
+
+# Current rating columns and the potential column each one grows toward
+POTENTIAL_PAIRS = [(BATTER_RATINGS.index(key[:-len("_pot")]), BATTER_RATINGS.index(key))
+                   for key in BATTER_RATINGS if key.endswith("_pot")]
+GROWING_COLUMNS = [current for current, _ in POTENTIAL_PAIRS]
+TARGET_COLUMNS = [potential for _, potential in POTENTIAL_PAIRS]
+SPEED_COLUMN = BATTER_RATINGS.index("speed")
+
+
+def growth_share(ages):
+    """
+    The share of the gap to potential closed this offseason at each age.
+    """
+    return MAX_GROWTH * np.clip((PEAK_AGE - np.asarray(ages, dtype=np.float64)) / (PEAK_AGE - 18), 0.0, 1.0)
+
+
+def expected_decline(ages, decline_age=DECLINE_AGE):
+    return DECLINE_RATE * np.maximum(np.asarray(ages, dtype=np.float64) - decline_age, 0.0)
+
+
+def _grow(current, target, share, generator):
+    """
+    Moves `current` toward `target` by `share` of the gap, with noise, never
+    past the target.
+    """
+    gap = np.maximum(target - current, 0.0)
+    noise = generator.normal(0.0, GROWTH_NOISE, current.shape) * (share > 0)
+    return np.minimum(current + share * gap + noise, np.maximum(target, current))
+
+
+def develop_batters(store, batter_ids, generator):
+    ids = np.asarray(batter_ids, dtype=np.int64)
+    if not len(ids):
+        return
+    ratings = store.batter_ratings[ids].astype(np.float64)
+    ages = store.batter_ages[ids].astype(np.float64)
+
+    current = ratings[:, GROWING_COLUMNS]
+    current = _grow(current, ratings[:, TARGET_COLUMNS], growth_share(ages)[:, None], generator)
+    current -= generator.poisson(expected_decline(ages)[:, None], current.shape)
+    ratings[:, GROWING_COLUMNS] = current
+    ratings[:, SPEED_COLUMN] -= generator.poisson(expected_decline(ages, SPEED_DECLINE_AGE))
+
+    store.batter_ratings[ids] = np.clip(np.rint(ratings), MIN_RATING, MAX_RATING)
+    store.batter_ages[ids] += 1
+    store.mark_changed(batter_ids=ids.tolist())
+
+
+def develop_pitchers(store, pitcher_ids, generator):
+    ids = np.asarray(pitcher_ids, dtype=np.int64)
+    if not len(ids):
+        return
+    ratings = store.pitcher_ratings[ids].astype(np.float64)
+    ages = store.pitcher_ages[ids].astype(np.float64)
+
+    share = PITCHER_GROWTH * growth_share(ages)[:, None]
+    ratings = _grow(ratings, np.full_like(ratings, MAX_RATING), share, generator)
+    ratings -= generator.poisson(expected_decline(ages)[:, None], ratings.shape)
+
+    store.pitcher_ratings[ids] = np.clip(np.rint(ratings), MIN_RATING, MAX_RATING)
+    store.pitcher_ages[ids] += 1
+    store.mark_changed(pitcher_ids=ids.tolist())
+
+
+def develop_players(store, batter_ids=(), pitcher_ids=(), rng=None):
+    """
+    Runs one offseason of development for the given players: ratings grow
+    or decline by age and every one of them gets a year older. `rng` may be
+    a SimRandom, a random.Random or a NumPy Generator.
+    """
+    if isinstance(rng, np.random.Generator):
+        generator = rng
+    elif hasattr(rng, "generator"):
+        generator = rng.generator
+    else:
+        generator = np.random.default_rng((rng if rng is not None else random).getrandbits(64))
+    develop_batters(store, batter_ids, generator)
+    develop_pitchers(store, pitcher_ids, generator)
+    store.ratings_version += 1
+
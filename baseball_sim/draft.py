@@ -0,0 +1,241 @@
+"""
+The amateur draft.
+
+A DraftBoard gives every team its own view of the prospect pool. A team's
+value for a prospect is its scouts' read of the prospect's potential, which
+is noisier the weaker the staff's hitting or pitching rating, plus a bonus
+for positions the roster is short at (a penalty where it has a surplus).
+Each team keeps one heap per position ordered by scouted potential, so a
+pick looks at the top of a dozen heaps and drops prospects already taken
+lazily. A whole draft is roughly
+O(picks * positions + teams * prospects * log(prospects)).
+
+Picks can be made one at a time with make_pick() (or by iterating the
+board) so a screen can show the draft as it happens.
+"""
+import heapq
+import random
+from collections import Counter
+
+import numpy as np
+
+from .engine import Batter, Pitcher
+from .simulation import BATTER_POSITIONS, PITCHER_POSITIONS
+
+# Rating points added per player a team is missing (or taken per extra player) at a position
+NEED_WEIGHT = 5
+# Scouting noise standard deviation for the weakest (20) and best (80) staffs
+WORST_SCOUTING_NOISE = 12.0
+BEST_SCOUTING_NOISE = 1.0
+ROSTER_TARGETS = Counter(BATTER_POSITIONS) + Counter(PITCHER_POSITIONS)
+# Chance of each lottery team, worst record first, winning each lottery draw
+LOTTERY_ODDS = [14, 13.5, 13.5, 12.5, 10.5, 9, 7.5, 6, 4.5, 3, 2, 1.5, 1, 0.5, 0.5, 0.5, 0.5, 0.5]
+LOTTERY_PICKS = 4
+
+
+class Draft:
+    """
+    An amateur draft class of young prospects, half batters and half
+    pitchers, added to `store` so drafted players can play right away.
+    """
+    def __init__(self, rng=None, *, store, prospects=200, name_prefix="Draft Pick"):
+        rng = rng if rng is not None else random
+        self.rng = rng
+        self.prospects = []
+        for i in range(prospects):
+            name = f"{name_prefix} {i + 1}"
+            if i % 2 == 0:
+                player = Batter(name, rng.choice(BATTER_POSITIONS), age=rng.randint(18, 22), rng=rng, store=store)
+            else:
+                player = Pitcher(name, rng.choice(PITCHER_POSITIONS), age=rng.randint(18, 22), rng=rng, store=store)
+            self.prospects.append(player)
+
+    def board(self, league, rounds=5, order="straight"):
+        """
+        Returns a DraftBoard for `league`. `order` is "straight" (worst record
+        first every round), "snake" or "lottery".
+        """
+        if order == "lottery":
+            first_round = lottery_order(league.teams, self.rng)
+        else:
+            first_round = standings_order(league.teams)
+        return DraftBoard(self.prospects, draft_order(first_round, rounds, snake=order == "snake"), self.rng)
+
+    def start_draft(self, league, rounds=5, order="straight"):
+        """
+        Runs the whole draft and returns [(team, player), ...] in pick order.
+        Undrafted players stay in self.prospects.
+        """
+        board = self.board(league, rounds, order)
+        picks = [(team, player) for _, team, player in board]
+        self.prospects = board.available()
+        return picks
+
+
+class DraftBoard:
+    """
+    Draft state for one draft: the pick order, every team's valuations and
+    what has been taken so far.
+    """
+    def __init__(self, prospects, order, rng=None):
+        rng = rng if rng is not None else random
+        self.prospects = list(prospects)
+        self.order = list(order)
+        self.picks = []
+        self.taken = np.zeros(len(self.prospects), dtype=bool)
+
+        self.potentials = np.array([player.potential() for player in self.prospects], dtype=np.float64)
+        self.positions = [player.position for player in self.prospects]
+        is_pitcher = np.array([isinstance(player, Pitcher) for player in self.prospects], dtype=bool)
+        generator = np.random.default_rng(rng.getrandbits(64))
+
+        teams = list({id(team): team for team in self.order}.values())
+        self.needs = {}
+        self.boards = {}
+        for team in teams:
+            noise = np.where(is_pitcher, scouting_noise(team, "pitching"), scouting_noise(team, "hitting"))
+            scouted = self.potentials + generator.standard_normal(len(self.prospects)) * noise
+            self.needs[id(team)] = roster_needs(team)
+            self.boards[id(team)] = _position_heaps(scouted, self.positions)
+
+        # Consensus board by true potential, for showing who is left
+        self._consensus = np.argsort(-self.potentials, kind="stable").tolist()
+        self._consensus_start = 0
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def pick_number(self):
+        return len(self.picks)
+
+    def is_complete(self):
+        return self.pick_number >= len(self.order) or self.taken.all()
+
+    def on_the_clock(self):
+        return None if self.is_complete() else self.order[self.pick_number]
+
+    def best_for(self, team):
+        """
+        Returns the index of the prospect `team` values most, or None if the
+        pool is empty.
+        """
+        needs = self.needs[id(team)]
+        best_index, best_value = None, None
+        for position, heap in self.boards[id(team)].items():
+            while heap and self.taken[heap[0][1]]:
+                heapq.heappop(heap)
+            if not heap:
+                continue
+            value = -heap[0][0] + NEED_WEIGHT * needs.get(position, 0)
+            if best_value is None or value > best_value:
+                best_index, best_value = heap[0][1], value
+        return best_index
+
+    def make_pick(self):
+        """
+        Makes the next pick, adds the player to the team's roster and returns
+        (pick_number, team, player), or None when the draft is over.
+        """
+        if self.is_complete():
+            return None
+        team = self.order[self.pick_number]
+        index = self.best_for(team)
+        player = self.prospects[index]
+        self.taken[index] = True
+        needs = self.needs[id(team)]
+        needs[self.positions[index]] = needs.get(self.positions[index], 0) - 1
+        team.draft_player(player)
+        pick = (self.pick_number + 1, team, player)
+        self.picks.append(pick)
+        return pick
+
+    def __iter__(self):
+        while True:
+            pick = self.make_pick()
+            if pick is None:
+                return
+            yield pick
+
+    def best_available(self, count=10):
+        """
+        Returns up to `count` undrafted prospects by true potential.
+        """
+        while self._consensus_start < len(self._consensus) and self.taken[self._consensus[self._consensus_start]]:
+            self._consensus_start += 1
+        best = []
+        for index in self._consensus[self._consensus_start:]:
+            if not self.taken[index]:
+                best.append(self.prospects[index])
+                if len(best) == count:
+                    break
+        return best
+
+    def available(self):
+        return [player for player, taken in zip(self.prospects, self.taken.tolist()) if not taken]
+
+
+def _position_heaps(scouted, positions):
+    heaps = {}
+    for index, (value, position) in enumerate(zip(scouted.tolist(), positions)):
+        heaps.setdefault(position, []).append((-value, index))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+    return heaps
+
+
+def scouting_noise(team, rating):
+    """
+    Standard deviation of a team's read on prospect potential, from the mean
+    `rating` ("hitting" or "pitching") of its coaching staff.
+    """
+    if not team.staff:
+        return WORST_SCOUTING_NOISE
+    skill = sum(coach.attributes[rating] for coach in team.staff) / len(team.staff)
+    skill = min(max(skill, 20), 80)
+    return WORST_SCOUTING_NOISE + (BEST_SCOUTING_NOISE - WORST_SCOUTING_NOISE) * (skill - 20) / 60
+
+
+def roster_needs(team):
+    """
+    Returns {position: players short of the standard roster shape}, negative
+    where the team already has more than it needs.
+    """
+    counts = Counter(player.position for player in team.batters + team.pitchers)
+    return {position: target - counts[position] for position, target in ROSTER_TARGETS.items()}
+
+
+def standings_order(teams):
+    """
+    Worst record first; ties keep league order.
+    """
+    return sorted(teams, key=lambda team: team.wins - team.losses)
+
+
+def lottery_order(teams, rng=None, lottery_picks=LOTTERY_PICKS, odds=LOTTERY_ODDS):
+    """
+    The first `lottery_picks` picks are drawn among the worst len(odds)
+    teams, weighted by `odds`; everyone else follows in standings order.
+    """
+    rng = rng if rng is not None else random
+    order = standings_order(teams)
+    entrants = order[:len(odds)]
+    weights = list(odds[:len(entrants)])
+    winners = []
+    for _ in range(min(lottery_picks, len(entrants))):
+        choice = rng.choices(range(len(entrants)), weights)[0]
+        winners.append(entrants.pop(choice))
+        weights.pop(choice)
+    winner_ids = {id(team) for team in winners}
+    return winners + [team for team in order if id(team) not in winner_ids]
+
+
+def draft_order(first_round, rounds, snake=False):
+    """
+    Repeats the first-round order for every round, reversing every other
+    round for a snake draft.
+    """
+    order = []
+    for round_number in range(rounds):
+        order += first_round[::-1] if snake and round_number % 2 else first_round
+    return order
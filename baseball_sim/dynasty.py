@@ -0,0 +1,502 @@
+"""
+Dynasty mode: many seasons back to back with the same league.
+
+Each season runs the offseason (player development, retirements, the
+draft, call-ups from the farm systems, free agency), the regular season,
+the minor-league season and the playoffs. Season lines for
+every rostered player are written to SQLite in one transaction per season,
+and career lines are SQL views over those rows, so nothing accumulates in
+memory between seasons beyond the rosters themselves:
+
+    python -m baseball_sim.dynasty dynasty.db --seasons 50 --seed 7 --autosave dynasty.sav
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from .engine import Batter, Pitcher
+from .development import develop_players
+from .draft import Draft
+from .freeagency import run_free_agency
+from .leaderboards import CareerRecords
+from .league import HallOfFame, League
+from .minors import LEVELS, FarmSystem
+from .rng import SimRandom
+from .savegame import SaveGame, league_state, restore_league
+from .roster_store import BATTER_COUNTING, PITCHER_COUNTING
+from .simulation import BATTER_POSITIONS, PITCHER_POSITIONS
+
+BATTING_COLUMNS = list(BATTER_COUNTING)
+PITCHING_COLUMNS = [key.lower().replace(" ", "_") for key in PITCHER_COUNTING] + ["outs", "runs_allowed"]
+# Farm players still in the minors past this age are released
+FARM_AGE_LIMIT = 28
+# AAA batters and pitchers each organization may call up every offseason
+FARM_CALL_UPS = 2
+
+
+def _sum_columns(columns):
+    return ", ".join(f"SUM({column}) AS {column}" for column in columns)
+
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS batters (
+    batter_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    first_season INTEGER NOT NULL,
+    final_season INTEGER,
+    hall_of_fame INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pitchers (
+    pitcher_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    first_season INTEGER NOT NULL,
+    final_season INTEGER,
+    hall_of_fame INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS batting_seasons (
+    season INTEGER NOT NULL,
+    batter_id INTEGER NOT NULL REFERENCES batters,
+    team TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    {", ".join(f"{column} INTEGER NOT NULL" for column in BATTING_COLUMNS)},
+    PRIMARY KEY (season, batter_id)
+);
+CREATE INDEX IF NOT EXISTS batting_seasons_batter ON batting_seasons (batter_id);
+CREATE TABLE IF NOT EXISTS pitching_seasons (
+    season INTEGER NOT NULL,
+    pitcher_id INTEGER NOT NULL REFERENCES pitchers,
+    team TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    {", ".join(f"{column} INTEGER NOT NULL" for column in PITCHING_COLUMNS)},
+    PRIMARY KEY (season, pitcher_id)
+);
+CREATE INDEX IF NOT EXISTS pitching_seasons_pitcher ON pitching_seasons (pitcher_id);
+CREATE TABLE IF NOT EXISTS team_seasons (
+    season INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    playoffs INTEGER NOT NULL,
+    champion INTEGER NOT NULL,
+    PRIMARY KEY (season, team)
+);
+CREATE VIEW IF NOT EXISTS batting_careers AS
+    SELECT batter_id, COUNT(*) AS seasons, {_sum_columns(BATTING_COLUMNS)}
+    FROM batting_seasons GROUP BY batter_id;
+CREATE VIEW IF NOT EXISTS pitching_careers AS
+    SELECT pitcher_id, COUNT(*) AS seasons, {_sum_columns(PITCHING_COLUMNS)}
+    FROM pitching_seasons GROUP BY pitcher_id;
+"""
+
+
+class Dynasty:
+    """
+    Runs `league` season after season, recording everything to the SQLite
+    database at `path`. Season n draws all of its randomness from
+    rng.spawn("season", n), so a dynasty replays exactly from its seed.
+    With `autosave` (a save file path) a delta save is written after every
+    simulated day, and Dynasty.load() picks the dynasty up where it stopped.
+    Every organization keeps a farm of `farm_size` players, where its
+    draftees start; 0 plays without farm systems.
+    """
+    def __init__(self, league, path, seed=None, draft_rounds=5, prospects=200, retirement_age=38,
+                 roster_size=13, free_agent_spots=2, autosave=None, farm_size=60):
+        self.league = league
+        self.store = league.store
+        self.path = path
+        self.rng = SimRandom(seed)
+        self.draft_rounds = draft_rounds
+        self.prospects = prospects
+        self.retirement_age = retirement_age
+        self.roster_size = roster_size
+        self.free_agent_spots = free_agent_spots
+        if farm_size and farm_size < 2 * len(LEVELS):
+            raise ValueError(f"farm_size must be 0 or at least {2 * len(LEVELS)}")
+        self.farm_size = farm_size
+        self.farm = FarmSystem(league) if farm_size else None
+        self.hall_of_fame = HallOfFame()
+        self.careers = CareerRecords(self.store)
+        self.day = 0
+        self.savegame = SaveGame(autosave) if autosave is not None else None
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.season = self.connection.execute("SELECT COALESCE(MAX(season) + 1, 0) FROM team_seasons").fetchone()[0]
+        with self.connection:
+            self._register(self._rostered_batters(), self._rostered_pitchers())
+
+    def run(self, seasons, progress=None):
+        """
+        Plays `seasons` more seasons. `progress(season, champion)` is called
+        after each one when given.
+        """
+        for _ in range(seasons):
+            champion = self.play_season()
+            if progress is not None:
+                progress(self.season - 1, champion)
+
+    def play_season(self):
+        """
+        Plays one full season with its offseason and returns the champion.
+        """
+        season = self.season
+        rng = self.rng.spawn("season", season)
+        league = self.league
+
+        if self.day == 0:
+            new_batters, new_pitchers = self._offseason(season, rng)
+            with self.connection:
+                self._register(new_batters, new_pitchers, season)
+            self.store.reset_stats()
+            if self.farm is not None:
+                self.farm.reset_stats()
+            league.generate_schedule(rng.spawn("schedule"))
+        league.play_season(rng.spawn("games"), on_day=self._end_of_day, start_day=self.day)
+        if self.farm is not None:
+            self.farm.play_season(rng.spawn("minors"))
+
+        # Snapshot the regular season before the playoffs add to the totals
+        batting_rows = self._batting_rows(season)
+        pitching_rows = self._pitching_rows(season)
+        self.careers.add_season([row[1] for row in batting_rows], [row[1] for row in pitching_rows])
+        records = [(team.name, team.wins, team.losses) for team in league.teams]
+        playoff_teams = {team.name for team in league.playoffs()}
+        champion = league.play_playoffs(rng.spawn("playoffs"))
+
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO batting_seasons VALUES ({', '.join('?' * (4 + len(BATTING_COLUMNS)))})", batting_rows)
+            self.connection.executemany(
+                f"INSERT INTO pitching_seasons VALUES ({', '.join('?' * (4 + len(PITCHING_COLUMNS)))})", pitching_rows)
+            self.connection.executemany(
+                "INSERT INTO team_seasons VALUES (?, ?, ?, ?, ?, ?)",
+                [(season, name, wins, losses, name in playoff_teams, name == champion.name)
+                 for name, wins, losses in records])
+        self.season += 1
+        self.day = 0
+        if self.savegame is not None:
+            self.savegame.save_delta(self.state())
+        return champion
+
+    def _end_of_day(self, day, standings):
+        self.day = day + 1
+        if self.savegame is not None:
+            self.savegame.save_delta(self.state())
+
+    # ---- Saving ----
+
+    def state(self):
+        """
+        Returns the dynasty as a SaveGame state: the league plus the season
+        counter, settings, Hall of Fame, career records and farm systems.
+        """
+        meta, arrays, lists = league_state(self.league, self.day)
+        hall_of_fame = self.hall_of_fame
+        meta["dynasty"] = {
+            "database": self.path,
+            "seed": self.rng.root_seed,
+            "season": self.season,
+            "draft_rounds": self.draft_rounds,
+            "prospects": self.prospects,
+            "retirement_age": self.retirement_age,
+            "roster_size": self.roster_size,
+            "free_agent_spots": self.free_agent_spots,
+            "farm_size": self.farm_size,
+            "inductees": hall_of_fame.inductees,
+            "ballots": [[season, kind, player_id, name] for season, ballot in hall_of_fame.ballots.items()
+                        for (kind, player_id), name in ballot],
+        }
+        arrays.update({f"career_{name}": array for name, array in self.careers.arrays().items()})
+        if self.farm is not None:
+            arrays.update({f"farm_{name}": array for name, array in self.farm.arrays().items()})
+        return meta, arrays, lists
+
+    def save(self, path=None):
+        """
+        Writes a full save to `path` (the autosave file by default). Later
+        autosaves are deltas on top of it.
+        """
+        if path is not None and (self.savegame is None or self.savegame.path != path):
+            self.savegame = SaveGame(path)
+        self.savegame.save(self.state())
+
+    @classmethod
+    def load(cls, path, autosave=True):
+        """
+        Restores a dynasty from a save file, reopening its database. With
+        `autosave`, it keeps writing deltas to the same file.
+        """
+        savegame = SaveGame(path)
+        meta, arrays, lists = savegame.load()
+        league, day = restore_league(meta, arrays, lists)
+        settings = meta["dynasty"]
+        dynasty = cls(league, settings["database"], settings["seed"], settings["draft_rounds"],
+                      settings["prospects"], settings["retirement_age"], settings["roster_size"],
+                      settings.get("free_agent_spots", 2), farm_size=settings.get("farm_size", 0))
+        dynasty.season = settings["season"]
+        dynasty.day = day
+        dynasty.hall_of_fame.inductees = settings["inductees"]
+        for season, kind, player_id, name in settings["ballots"]:
+            dynasty.hall_of_fame.eligible_from[(kind, player_id)] = season
+            dynasty.hall_of_fame.ballots.setdefault(season, []).append(((kind, player_id), name))
+        dynasty.careers.restore({name[len("career_"):]: array for name, array in arrays.items()
+                                 if name.startswith("career_")})
+        if dynasty.farm is not None:
+            dynasty.farm.restore({name[len("farm_"):]: array for name, array in arrays.items()
+                                  if name.startswith("farm_")})
+        if autosave:
+            dynasty.savegame = savegame
+        return dynasty
+
+    def _offseason(self, season, rng):
+        """
+        Ages and develops every player, retires the oldest, runs the draft,
+        calls up AAA players who beat a team's weakest, releases each team's
+        weakest players so free_agent_spots batters and pitchers short of
+        roster_size are open, runs free agency for the released and
+        undrafted players, fills any holes left (from the farm first) and
+        restocks the farms. Returns the players who joined the league.
+        """
+        farm = self.farm
+        batter_ids = [player.id for player in self._rostered_batters()]
+        pitcher_ids = [player.id for player in self._rostered_pitchers()]
+        if farm is not None:
+            farm_batters, farm_pitchers = farm.members()
+            batter_ids += farm_batters.tolist()
+            pitcher_ids += farm_pitchers.tolist()
+        develop_players(self.store, batter_ids, pitcher_ids, rng.spawn("develop"))
+        if season > 0:
+            self._retire(season - 1)
+        self._induct(season)
+
+        draft = Draft(rng.spawn("draft"), store=self.store, prospects=self.prospects,
+                      name_prefix=f"Season {season} Draftee")
+        picks = draft.start_draft(self.league, self.draft_rounds, order="lottery")
+        new_players = [player for _, player in picks]
+        if farm is not None:
+            # Draftees start in A ball
+            team_indexes = {id(team): i for i, team in enumerate(self.league.teams)}
+            for team, player in picks:
+                farm.send_down(team_indexes[id(team)], player, len(LEVELS) - 1)
+            farm.release_older_than(FARM_AGE_LIMIT)
+            farm.reassign()
+            new_players += self._call_up_prospects()
+
+        kept = self.roster_size - self.free_agent_spots
+        released = []
+        for team in self.league.teams:
+            team.batters.sort(key=lambda p: p.overall_rating(), reverse=True)
+            team.pitchers.sort(key=lambda p: p.overall_rating(), reverse=True)
+            released += team.batters[kept:] + team.pitchers[kept:]
+            del team.batters[kept:]
+            del team.pitchers[kept:]
+            team.roster_changed()
+        contracts, _ = run_free_agency(self.league.teams, released + draft.prospects, rng=rng.spawn("free agency"),
+                                       max_batters=self.roster_size, max_pitchers=self.roster_size)
+        new_players += [player for _, player, _ in contracts]
+        if season > 0:
+            # Released veterans nobody signed leave the league for good
+            signed = {id(player) for _, player, _ in contracts}
+            unsigned = [player for player in released if id(player) not in signed]
+            with self.connection:
+                self._close_careers([player for player in unsigned if isinstance(player, Batter)],
+                                    [player for player in unsigned if isinstance(player, Pitcher)], season - 1)
+
+        fill_rng = rng.spawn("fill")
+        for team_index, team in enumerate(self.league.teams):
+            new_players += self._fill_roster(team_index, fill_rng, season)
+        if farm is not None:
+            # Restock the farms last so every club has a full roster for the season
+            farm.populate(self.farm_size, rng.spawn("farm"), name_prefix=f"Season {season} Prospect")
+
+        rostered_batters = {player.id for player in self._rostered_batters()}
+        rostered_pitchers = {player.id for player in self._rostered_pitchers()}
+        return ([player for player in new_players if isinstance(player, Batter) and player.id in rostered_batters],
+                [player for player in new_players if isinstance(player, Pitcher) and player.id in rostered_pitchers])
+
+    def _call_up_prospects(self):
+        """
+        Calls up each organization's best FARM_CALL_UPS AAA batters and
+        pitchers who outrate its weakest major-leaguer at the same role.
+        """
+        called_up = []
+        for team_index, team in enumerate(self.league.teams):
+            batters, pitchers = self.farm.roster(team_index, 0)
+            for prospects, roster in ((batters, team.batters), (pitchers, team.pitchers)):
+                weakest = min((player.overall_rating() for player in roster), default=float("-inf"))
+                for player in prospects[:FARM_CALL_UPS]:
+                    if player.overall_rating() > weakest:
+                        self.farm.call_up(player)
+                        called_up.append(player)
+        return called_up
+
+    def _fill_roster(self, team_index, rng, season):
+        """
+        Calls up the best farm players, or signs replacement-level players
+        once the farm is out of them, until the team can field a lineup and
+        a rotation.
+        """
+        team = self.league.teams[team_index]
+        signed = []
+        while len(team.batters) < len(BATTER_POSITIONS):
+            player = self._best_in_farm(team_index, Batter)
+            if player is None:
+                player = Batter(f"{team.name} Call-up {season}-{len(signed) + 1}", rng.choice(BATTER_POSITIONS),
+                                age=rng.randint(22, 26), rng=rng, store=self.store)
+            team.draft_player(player)
+            signed.append(player)
+        while len(team.pitchers) < len(PITCHER_POSITIONS):
+            player = self._best_in_farm(team_index, Pitcher)
+            if player is None:
+                player = Pitcher(f"{team.name} Call-up {season}-{len(signed) + 1}", rng.choice(PITCHER_POSITIONS),
+                                 age=rng.randint(22, 26), rng=rng, store=self.store)
+            team.draft_player(player)
+            signed.append(player)
+        return signed
+
+    def _best_in_farm(self, team_index, kind):
+        """
+        Releases and returns an organization's best farm player of `kind`
+        from its highest club that has one, or None.
+        """
+        if self.farm is None:
+            return None
+        for level in range(len(LEVELS)):
+            batters, pitchers = self.farm.roster(team_index, level)
+            players = pitchers if kind is Pitcher else batters
+            if players:
+                self.farm.release(players[0])
+                return players[0]
+        return None
+
+    def _retire(self, final_season):
+        """
+        Removes every player at or past retirement_age from their roster.
+        """
+        retired_batters, retired_pitchers = [], []
+        for team in self.league.teams:
+            retired_batters += [player for player in team.batters if player.age >= self.retirement_age]
+            retired_pitchers += [player for player in team.pitchers if player.age >= self.retirement_age]
+            team.batters = [player for player in team.batters if player.age < self.retirement_age]
+            team.pitchers = [player for player in team.pitchers if player.age < self.retirement_age]
+            team.roster_changed()
+        if retired_batters or retired_pitchers:
+            with self.connection:
+                self._close_careers(retired_batters, retired_pitchers, final_season)
+
+    def _close_careers(self, batters, pitchers, final_season):
+        """
+        Records the final season of players leaving the league and files
+        their Hall of Fame cases from the career index.
+        """
+        for player in batters:
+            self.hall_of_fame.add_retiree(("batter", player.id), player.name,
+                                          self.careers.batting_career(player.id), final_season)
+        for player in pitchers:
+            self.hall_of_fame.add_retiree(("pitcher", player.id), player.name,
+                                          self.careers.pitching_career(player.id), final_season)
+        self.connection.executemany("UPDATE batters SET final_season = ? WHERE batter_id = ?",
+                                    [(final_season, player.id) for player in batters])
+        self.connection.executemany("UPDATE pitchers SET final_season = ? WHERE pitcher_id = ?",
+                                    [(final_season, player.id) for player in pitchers])
+
+    def _induct(self, season):
+        inducted = self.hall_of_fame.induct(season)
+        if inducted:
+            with self.connection:
+                self.connection.executemany("UPDATE batters SET hall_of_fame = 1 WHERE batter_id = ?",
+                                            [(player_id,) for kind, player_id in inducted if kind == "batter"])
+                self.connection.executemany("UPDATE pitchers SET hall_of_fame = 1 WHERE pitcher_id = ?",
+                                            [(player_id,) for kind, player_id in inducted if kind == "pitcher"])
+
+    def career_batting(self, batter_id):
+        """
+        Returns a batter's career totals as a dict, or None before their first season.
+        """
+        cursor = self.connection.execute("SELECT * FROM batting_careers WHERE batter_id = ?", (batter_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def career_pitching(self, pitcher_id):
+        cursor = self.connection.execute("SELECT * FROM pitching_careers WHERE pitcher_id = ?", (pitcher_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def close(self):
+        self.connection.close()
+
+    def _rostered_batters(self):
+        return [player for team in self.league.teams for player in team.batters]
+
+    def _rostered_pitchers(self):
+        return [player for team in self.league.teams for player in team.pitchers]
+
+    def _register(self, batters, pitchers, season=None):
+        season = self.season if season is None else season
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO batters (batter_id, name, position, first_season) VALUES (?, ?, ?, ?)",
+            [(player.id, player.name, player.position, season) for player in batters])
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO pitchers (pitcher_id, name, position, first_season) VALUES (?, ?, ?, ?)",
+            [(player.id, player.name, player.position, season) for player in pitchers])
+
+    def _batting_rows(self, season):
+        teams = [team.name for team in self.league.teams for _ in team.batters]
+        ids = [player.id for player in self._rostered_batters()]
+        totals = self.store.batting_totals(ids).tolist()
+        ages = self.store.batter_ages[ids].tolist()
+        return [(season, batter_id, team, age, *line) for batter_id, team, age, line in zip(ids, teams, ages, totals)]
+
+    def _pitching_rows(self, season):
+        teams = [team.name for team in self.league.teams for _ in team.pitchers]
+        ids = [player.id for player in self._rostered_pitchers()]
+        totals = self.store.pitching_totals(ids)
+        outs = self.store.pitcher_outcomes[ids, 0].tolist()
+        runs = self.store.pitcher_runs[ids].tolist()
+        ages = self.store.pitcher_ages[ids].tolist()
+        return [(season, pitcher_id, team, age, *line, out_count, run_count)
+                for pitcher_id, team, age, line, out_count, run_count
+                in zip(ids, teams, ages, totals.tolist(), outs, runs)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a multi-season dynasty into a SQLite database.")
+    parser.add_argument("database", help="SQLite file to create or extend")
+    parser.add_argument("--seasons", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--autosave", help="save file written after every day; resumed from if it exists")
+    parser.add_argument("--farm-size", type=int, default=60, help="farm players per organization (0 for none)")
+    args = parser.parse_args(argv)
+
+    if args.autosave and os.path.exists(args.autosave):
+        dynasty = Dynasty.load(args.autosave)
+        print(f"Resuming season {dynasty.season}, day {dynasty.day}")
+    else:
+        rng = SimRandom(args.seed)
+        dynasty = Dynasty(League(rng=rng.spawn("teams")), args.database, seed=args.seed, autosave=args.autosave,
+                          farm_size=args.farm_size)
+        if args.autosave:
+            dynasty.save()
+    start = time.perf_counter()
+
+    def progress(season, champion):
+        print(f"Season {season}: {champion.name} won the title ({time.perf_counter() - start:.1f}s)")
+
+    dynasty.run(args.seasons, progress)
+    print(f"Hall of Fame: {len(dynasty.hall_of_fame.inductees)} inductees")
+    dynasty.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
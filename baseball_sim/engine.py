@@ -0,0 +1,409 @@
+"""
+Core baseball classes shared by the pygame GM screens and the headless
+simulators. Nothing in here touches pygame or prints, so it can be imported
+on a machine without a display.
+"""
+import random
+
+from .bases import INNING_OVER, NEXT_STATE, RUNS_SCORED
+from .boxscore import BoxScore
+from .roster_store import (BATTER_RATINGS, PITCHER_RATINGS, BATTER_RATING_COLUMNS, PITCHER_RATING_COLUMNS,
+                           BATTER_COUNTING, PITCHER_COUNTING, BATTER_COUNTING_MATRIX, PITCHER_COUNTING_MATRIX,
+                           BATTER_RATES, PITCHER_RATES, RatingsView, BatterStatsView, PitcherStatsView,
+                           batting_rates, pitching_rates)
+from .development import develop_players
+from .matchups import coach_context, matchup_cache
+from .outcomes import NUM_OUTCOMES
+from .sampler import MatchupSampler, outcome_probabilities, sample_outcomes
+
+CURRENT_RATINGS = [key for key in BATTER_RATINGS if not key.endswith("_pot")]
+CURRENT_COLUMNS = [BATTER_RATINGS.index(key) for key in CURRENT_RATINGS]
+POTENTIAL_COLUMNS = [BATTER_RATINGS.index(key) for key in BATTER_RATINGS if key.endswith("_pot")]
+
+# -------------------------------
+# Game Classes
+# -------------------------------
+
+class Coach:
+    def __init__(self, name, role, experience = None, hitting = None,
+                 pitching = None, fielding = None, rng = None):
+        rng = rng if rng is not None else random
+        self.name = name
+        self.role = role
+        self.attributes = {
+            "experience": experience if experience is not None else rng.randint(0, 20),
+            "hitting": hitting if hitting is not None else rng.randint(20, 80),
+            "pitching": pitching if pitching is not None else rng.randint(20, 80),
+            "fielding": fielding if fielding is not None else rng.randint(20, 80)
+        }
+        self.stats = {
+            "wins": 0,
+            "losses": 0,
+            "championships": 0
+        }
+
+class Pitcher:
+    """
+    A pitcher's ratings and results live in a RosterStore; this object is
+    just a view onto its row.
+    """
+    __slots__ = ("store", "id")
+
+    def __init__(self, name, position,
+                 velocity=None, stuff=None,
+                 movement=None, control=None,
+                 stamina=None, age=None, rng=None, *, store):
+        rng = rng if rng is not None else random
+        ratings = [
+            velocity if velocity is not None else rng.randint(20, 80),
+            stuff if stuff is not None else rng.randint(20, 80),
+            movement if movement is not None else rng.randint(20, 80),
+            control if control is not None else rng.randint(20, 80),
+            stamina if stamina is not None else rng.randint(20, 80)
+        ]
+        age = age if age is not None else rng.randint(18, 35)
+        self.store = store
+        self.id = self.store.add_pitcher(name, position, ratings, age)
+
+    @classmethod
+    def from_store(cls, store, pitcher_id):
+        """
+        Returns a view of a pitcher already in `store`.
+        """
+        pitcher = cls.__new__(cls)
+        pitcher.store = store
+        pitcher.id = pitcher_id
+        return pitcher
+
+    @property
+    def name(self):
+        return self.store.pitcher_names[self.id]
+
+    @property
+    def position(self):
+        return self.store.pitcher_positions[self.id]
+
+    @property
+    def age(self):
+        return int(self.store.pitcher_ages[self.id])
+
+    @age.setter
+    def age(self, value):
+        self.store.pitcher_ages[self.id] = value
+        self.store.mark_changed(pitcher_ids=(self.id,))
+
+    @property
+    def attributes(self):
+        return RatingsView(self.store, "pitcher_ratings", PITCHER_RATING_COLUMNS, self.id)
+
+    def overall_rating(self):
+        return int(self.store.pitcher_ratings[self.id].mean())
+
+    def potential(self):
+        # Pitchers have no separate potential ratings yet
+        return self.overall_rating()
+
+    def develop(self, rng=None):
+        develop_players(self.store, pitcher_ids=[self.id], rng=rng)
+
+    @property
+    def stats(self):
+        return PitcherStatsView(self.store, self.id)
+
+    def updateStats(self):
+        # ERA and WHIP are derived on read; this only forces the refresh now
+        self.store.pitcher_rate(self.id, 0)
+
+class Batter:
+    """
+    A position player. Like Pitcher, every rating and stat is stored in a
+    RosterStore row.
+    """
+    __slots__ = ("store", "id")
+
+    def __init__(self, name, position,
+                 speed = None, framing = None, blocking = None, arm = None,
+                 range = None, arm_strength = None, power = None, contact = None,
+                 eye = None, gap_power = None, triple = None, framing_pot = None,
+                 blocking_pot = None, arm_pot = None, range_pot = None,
+                 arm_stength_pot = None, power_pot = None, contact_pot = None,
+                 eye_pot = None, gap_power_pot = None, triple_pot = None, age = None, rng = None, *, store):
+        rng = rng if rng is not None else random
+        # Same order as BATTER_RATINGS
+        ratings = [
+            speed if speed is not None else rng.randint(20, 80),
+            framing if framing is not None else rng.randint(20, 35),
+            blocking if blocking is not None else rng.randint(20, 35),
+            arm if arm is not None else rng.randint(20, 35),
+            range if range is not None else rng.randint(20, 50),
+            arm_strength if arm_strength is not None else rng.randint(20, 50),
+            power if power is not None else rng.randint(20, 50),
+            contact if contact is not None else rng.randint(20, 50),
+            eye if eye is not None else rng.randint(20, 50),
+            gap_power if gap_power is not None else rng.randint(20, 50),
+            triple if triple is not None else rng.randint(20, 50),
+            framing_pot if framing_pot is not None else rng.randint(25, 40),
+            blocking_pot if blocking_pot is not None else rng.randint(25, 40),
+            arm_pot if arm_pot is not None else rng.randint(25, 40),
+            range_pot if range_pot is not None else rng.randint(25, 55),
+            arm_stength_pot if arm_stength_pot is not None else rng.randint(25, 55),
+            power_pot if power_pot is not None else rng.randint(25,55),
+            contact_pot if contact_pot is not None else rng.randint(25, 55),
+            eye_pot if eye_pot is not None else rng.randint(25, 55),
+            gap_power_pot if gap_power_pot is not None else rng.randint(25, 55),
+            triple_pot if triple_pot is not None else rng.randint(25, 55)
+        ]
+        age = age if age is not None else rng.randint(18, 35)
+        self.store = store
+        self.id = self.store.add_batter(name, position, ratings, age)
+
+    @classmethod
+    def from_store(cls, store, batter_id):
+        """
+        Returns a view of a batter already in `store`.
+        """
+        batter = cls.__new__(cls)
+        batter.store = store
+        batter.id = batter_id
+        return batter
+
+    @property
+    def name(self):
+        return self.store.batter_names[self.id]
+
+    @property
+    def position(self):
+        return self.store.batter_positions[self.id]
+
+    @property
+    def age(self):
+        return int(self.store.batter_ages[self.id])
+
+    @age.setter
+    def age(self, value):
+        self.store.batter_ages[self.id] = value
+        self.store.mark_changed(batter_ids=(self.id,))
+
+    @property
+    def attributes(self):
+        return RatingsView(self.store, "batter_ratings", BATTER_RATING_COLUMNS, self.id)
+
+    def overall_rating(self):
+        return int(self.store.batter_ratings[self.id, CURRENT_COLUMNS].mean())
+
+    def potential(self):
+        return int(self.store.batter_ratings[self.id, POTENTIAL_COLUMNS].mean())
+
+    def develop(self, rng=None):
+        """
+        One offseason of growth toward potential (or decline with age).
+        """
+        develop_players(self.store, batter_ids=[self.id], rng=rng)
+
+    @property
+    def stats(self):
+        return BatterStatsView(self.store, self.id)
+
+    def update_stats(self):
+        # AVG/OBP/SLG/OPS are derived on read; this only forces the refresh now
+        self.store.batter_rate(self.id, 0)
+
+    def atbat(self, pitcher, outcome=None):
+        """
+        Records one plate appearance against `pitcher` and returns its outcome
+        code. Simulators pass an outcome already drawn by a MatchupSampler.
+        """
+        if outcome is None:
+            if pitcher.store is self.store:
+                probabilities = matchup_cache(self.store).probabilities(self, pitcher)
+            else:
+                probabilities = outcome_probabilities([self], [pitcher])[0, 0]
+            outcome = int(sample_outcomes(probabilities, 1)[0])
+        self.store.record_batting(self.id, outcome)
+        pitcher.store.record_pitching(pitcher.id, outcome)
+        return outcome
+
+class Team:
+    """
+    Represents a baseball team.
+    """
+    def __init__(self, name, batters, pitchers, staff):
+        self.name = name
+        self.batters = batters
+        self.pitchers = pitchers
+        self.staff = staff
+        self.score = 0
+        self.wins = 0
+        self.losses = 0
+        self.current_batter_index = 0
+        self.current_pitcher_index = 0
+        # Bumped whenever the batters or pitchers lists change
+        self.roster_version = 0
+
+    def draft_player(self, player):
+        if isinstance(player, Pitcher):
+            self.pitchers.append(player)
+        else:
+            self.batters.append(player)
+        self.roster_changed()
+
+    def roster_changed(self):
+        """
+        Call after editing `batters` or `pitchers` directly.
+        """
+        self.roster_version += 1
+
+    def set_lineup(self, lineup):
+        """
+        Moves the batters in `lineup` to the front of the roster in that
+        order; games bat the first nine.
+        """
+        starters = {id(batter) for batter in lineup}
+        self.batters = list(lineup) + [batter for batter in self.batters if id(batter) not in starters]
+        self.roster_changed()
+
+    def reset_for_game(self):
+        self.score = 0
+        self.current_batter_index = 0
+        self.current_pitcher_index = 0
+
+    def batting_line(self):
+        """
+        Team counting stats and rates as a dict, cached until one of the
+        store's players records a new result.
+        """
+        store = self.batters[0].store
+        return store.cached(("team_batting", self.name), lambda: self._aggregate(
+            store.batter_outcomes[[batter.id for batter in self.batters]].sum(axis=0),
+            BATTER_COUNTING_MATRIX, list(BATTER_COUNTING), batting_rates, BATTER_RATES))
+
+    def pitching_line(self):
+        store = self.pitchers[0].store
+        return store.cached(("team_pitching", self.name), self._compute_pitching_line)
+
+    def _compute_pitching_line(self):
+        store = self.pitchers[0].store
+        ids = [pitcher.id for pitcher in self.pitchers]
+        runs = store.pitcher_runs[ids].sum()
+        line = self._aggregate(store.pitcher_outcomes[ids].sum(axis=0), PITCHER_COUNTING_MATRIX,
+                               list(PITCHER_COUNTING), lambda outcomes: pitching_rates(outcomes, runs), PITCHER_RATES)
+        line["Runs Allowed"] = int(runs)
+        return line
+
+    @staticmethod
+    def _aggregate(outcomes, matrix, counting_names, rates, rate_names):
+        line = dict(zip(counting_names, (outcomes @ matrix).tolist()))
+        line.update(zip(rate_names, rates(outcomes)[0].tolist()))
+        return line
+
+    def get_next_batter(self):
+        batter = self.batters[self.current_batter_index]
+        self.current_batter_index = (self.current_batter_index + 1) % 9
+        return batter
+
+    def get_next_pitcher(self):
+        pitcher = self.pitchers[self.current_pitcher_index]
+        # FIX: Update the pitcher index correctly using self.current_pitcher_index
+        self.current_pitcher_index = (self.current_pitcher_index + 1) % len(self.pitchers)
+        return pitcher
+
+    def play_half_inning(self, pitching_team, sampler, recorder=None):
+        """
+        Plays until three outs and returns the runs scored. `recorder`, when
+        given, sees every plate appearance with the state before the play.
+        """
+        # Base-out state machine: one table lookup per plate appearance
+        state = 0
+        total_runs = 0
+        while state != INNING_OVER:
+            pitcher_slot = pitching_team.current_pitcher_index
+            current_pitcher = pitching_team.get_next_pitcher()
+            batter_slot = self.current_batter_index
+            current_batter = self.get_next_batter()
+            result = current_batter.atbat(current_pitcher, sampler.draw(batter_slot, pitcher_slot))
+            transition = state * NUM_OUTCOMES + result
+            runs = RUNS_SCORED[transition]
+            if recorder is not None:
+                recorder.record_plate_appearance(current_batter, current_pitcher, result, state, runs)
+            if runs:
+                total_runs += runs
+                current_pitcher.store.record_runs_allowed(current_pitcher.id, runs)
+            state = NEXT_STATE[transition]
+        return total_runs
+
+class RecorderGroup:
+    """
+    Forwards every plate appearance to several recorders.
+    """
+    def __init__(self, *recorders):
+        self.recorders = recorders
+
+    def begin_half(self, game_id, inning, half):
+        for recorder in self.recorders:
+            recorder.begin_half(game_id, inning, half)
+
+    def record_plate_appearance(self, batter, pitcher, outcome, state, runs):
+        for recorder in self.recorders:
+            recorder.record_plate_appearance(batter, pitcher, outcome, state, runs)
+
+class Game:
+    """
+    Represents a baseball game simulation.
+    """
+    def __init__(self, home_team, away_team, innings=9, rng=None, event_log=None, game_id=0, keep_box_score=True):
+        """
+        `rng` is the SimRandom this game's outcomes are drawn from; without one
+        the sampler's shared unseeded generator is used. Plate appearances are
+        written to `event_log` (an EventLogWriter) under `game_id` if given,
+        and to self.box_score unless keep_box_score is False.
+        """
+        self.home_team = home_team
+        self.away_team = away_team
+        self.innings = innings
+        self.current_inning = 1
+        self.game_id = game_id
+        self.box_score = BoxScore(away_team, home_team) if keep_box_score else None
+        recorders = [recorder for recorder in (self.box_score, event_log) if recorder is not None]
+        self.recorder = recorders[0] if len(recorders) == 1 else RecorderGroup(*recorders) if recorders else None
+        self.home_team.reset_for_game()
+        self.away_team.reset_for_game()
+        generator = rng.generator if rng is not None else None
+        # Outcome tables for each lineup against the opposing staff and coaches
+        self.home_sampler = MatchupSampler(home_team.batters[:9], away_team.pitchers, generator,
+                                           context=coach_context(home_team, away_team))
+        self.away_sampler = MatchupSampler(away_team.batters[:9], home_team.pitchers, generator,
+                                           context=coach_context(away_team, home_team))
+
+    def play_inning(self):
+        if self.recorder is not None:
+            self.recorder.begin_half(self.game_id, self.current_inning, 0)
+        away_runs = self.away_team.play_half_inning(self.home_team, self.away_sampler, self.recorder)
+        if self.recorder is not None:
+            self.recorder.begin_half(self.game_id, self.current_inning, 1)
+        home_runs = self.home_team.play_half_inning(self.away_team, self.home_sampler, self.recorder)
+        self.away_team.score += away_runs
+        self.home_team.score += home_runs
+        self.current_inning += 1
+        if self.is_game_over():
+            if self.box_score is not None:
+                self.box_score.finish()
+            self._report_players()
+        return away_runs, home_runs
+
+    def _report_players(self):
+        """
+        Tells the stores' change trackers who played, once per game instead
+        of once per plate appearance.
+        """
+        for team in (self.away_team, self.home_team):
+            team.batters[0].store.mark_changed(batter_ids=[batter.id for batter in team.batters[:9]])
+            team.pitchers[0].store.mark_changed(pitcher_ids=[pitcher.id for pitcher in team.pitchers])
+
+    def is_game_over(self):
+        # Keep playing extra innings until somebody is ahead
+        if self.current_inning <= self.innings:
+            return False
+        return self.home_team.score != self.away_team.score
+
+    def get_scoreboard(self):
+        return f"{self.away_team.name}: {self.away_team.score} | {self.home_team.name}: {self.home_team.score}"
@@ -0,0 +1,135 @@
+"""
+Compact binary play-by-play.
+
+Every plate appearance is one fixed-width 17-byte record: game id, inning,
+half (0 = top, 1 = bottom), batter id, pitcher id, outcome, the base-out
+state before the play and runs scored. Records are appended to a file
+through a buffered writer, and EventLog memory-maps the file as a NumPy
+structured array so stats can be replayed or aggregated without
+re-simulating anything.
+"""
+import os
+import struct
+
+import numpy as np
+
+from .bases import NEXT_STATE
+from .outcomes import NUM_OUTCOMES
+
+EVENT_FORMAT = struct.Struct("<IBBIIBBB")
+EVENT_DTYPE = np.dtype([
+    ("game_id", "<u4"),
+    ("inning", "u1"),
+    ("half", "u1"),
+    ("batter_id", "<u4"),
+    ("pitcher_id", "<u4"),
+    ("outcome", "u1"),
+    ("state", "u1"),
+    ("runs", "u1"),
+])
+TOP = 0
+BOTTOM = 1
+
+
+class EventLogWriter:
+    """
+    Appends plate-appearance records to `path`, flushing every
+    `buffer_events` records. Use as a context manager or call close().
+    """
+    def __init__(self, path, buffer_events=8192):
+        self.file = open(path, "ab")
+        self.buffer = bytearray(EVENT_FORMAT.size * buffer_events)
+        self.capacity = buffer_events
+        self.count = 0
+        self.game_id = 0
+        self.inning = 1
+        self.half = TOP
+
+    def begin_half(self, game_id, inning, half):
+        self.game_id = game_id
+        self.inning = inning
+        self.half = half
+
+    def record_plate_appearance(self, batter, pitcher, outcome, state, runs):
+        EVENT_FORMAT.pack_into(self.buffer, self.count * EVENT_FORMAT.size, self.game_id, self.inning,
+                               self.half, batter.id, pitcher.id, outcome, state, runs)
+        self.count += 1
+        if self.count == self.capacity:
+            self.flush()
+
+    def flush(self):
+        self.file.write(memoryview(self.buffer)[:self.count * EVENT_FORMAT.size])
+        self.file.flush()
+        self.count = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventLog:
+    """
+    Read-only, memory-mapped view of an event log file.
+    """
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+        if size == 0:
+            self.events = np.zeros(0, dtype=EVENT_DTYPE)
+        else:
+            self.events = np.memmap(path, dtype=EVENT_DTYPE, mode="r", shape=(size // EVENT_DTYPE.itemsize,))
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def game(self, game_id):
+        """
+        Returns the events of one game in the order they happened.
+        """
+        return self.events[self.events["game_id"] == game_id]
+
+    def batting_outcomes(self, num_batters):
+        """
+        Returns a (num_batters, NUM_OUTCOMES) array of outcome counts, the same
+        layout RosterStore.batter_outcomes uses.
+        """
+        index = self.events["batter_id"].astype(np.int64) * NUM_OUTCOMES + self.events["outcome"]
+        return np.bincount(index, minlength=num_batters * NUM_OUTCOMES).reshape(num_batters, NUM_OUTCOMES)
+
+    def pitching_outcomes(self, num_pitchers):
+        index = self.events["pitcher_id"].astype(np.int64) * NUM_OUTCOMES + self.events["outcome"]
+        return np.bincount(index, minlength=num_pitchers * NUM_OUTCOMES).reshape(num_pitchers, NUM_OUTCOMES)
+
+    def runs_allowed(self, num_pitchers):
+        return np.bincount(self.events["pitcher_id"], weights=self.events["runs"],
+                           minlength=num_pitchers).astype(np.int64)
+
+    def game_scores(self):
+        """
+        Returns {game_id: (away_runs, home_runs)} for every game in the log.
+        """
+        if len(self) == 0:
+            return {}
+        runs = np.zeros((int(self.events["game_id"].max()) + 1, 2), dtype=np.int64)
+        np.add.at(runs, (self.events["game_id"], self.events["half"]), self.events["runs"])
+        game_ids = np.unique(self.events["game_id"])
+        return {int(game_id): (int(runs[game_id, TOP]), int(runs[game_id, BOTTOM])) for game_id in game_ids}
+
+    def replay(self, game_id):
+        """
+        Yields (inning, half, batter_id, pitcher_id, outcome, state_before,
+        state_after, runs) for one game, rebuilding each play's end state.
+        """
+        for event in self.game(game_id):
+            state, outcome = int(event["state"]), int(event["outcome"])
+            yield (int(event["inning"]), int(event["half"]), int(event["batter_id"]), int(event["pitcher_id"]),
+                   outcome, state, NEXT_STATE[state * NUM_OUTCOMES + outcome], int(event["runs"]))
@@ -0,0 +1,286 @@
+"""
+Exact run and win expectancy from the base-out Markov chain.
+
+Given each lineup slot's outcome probabilities, a half inning is a Markov
+chain on (base-out state, batter due up). The batter after k plate
+appearances is always slot (first + k) % 9, so the chain only has to carry
+the 24 base-out states and a run count: InningModel pushes the probability
+mass forward one plate appearance at a time until nearly all of it has
+reached three outs, giving the exact distribution of runs scored and of
+who leads off next inning, for every possible leadoff batter.
+
+WinExpectancy chains two such models backwards over half innings (home
+lead, both teams' next batters) to get the home team's chance of winning
+from the start of any half inning, including extra innings. A mid-inning
+state costs one forward pass for the rest of the inning, cached, and every
+other lookup is an array index. ExpectancyCache keeps the models per
+lineup/pitching staff pair so a live game or a manager decision never
+rebuilds them.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from .bases import INNING_OVER, NEXT_STATE, NUM_STATES, RUNS_SCORED
+from .matchups import coach_context
+from .outcomes import NUM_OUTCOMES
+from .sampler import outcome_probabilities
+
+LINEUP_SIZE = 9
+# Runs in one half inning are counted up to this; more are lumped in with it
+MAX_INNING_RUNS = 30
+# Home leads beyond this many runs are treated as this many
+MAX_LEAD = 60
+# Extra innings are followed this far; a game still tied counts as a coin flip
+MAX_INNINGS = 25
+# A half inning stops once less than this much probability is still in play
+TOLERANCE = 1e-12
+MAX_PLATE_APPEARANCES = 400
+
+
+def _transition_groups():
+    """
+    Returns [(outcome, runs, matrix)]: for each outcome and run count, a
+    (24, 25) 0/1 matrix taking every live state that scores that many runs
+    on that outcome to its next state.
+    """
+    groups = {}
+    for state in range(NUM_STATES):
+        for outcome in range(NUM_OUTCOMES):
+            index = state * NUM_OUTCOMES + outcome
+            key = (outcome, RUNS_SCORED[index])
+            matrix = groups.setdefault(key, np.zeros((NUM_STATES, NUM_STATES + 1)))
+            matrix[state, NEXT_STATE[index]] = 1.0
+    return [(outcome, runs, matrix) for (outcome, runs), matrix in sorted(groups.items())]
+
+
+TRANSITION_GROUPS = _transition_groups()
+
+
+class InningModel:
+    """
+    Half-inning run distributions for one lineup. `probabilities` is a
+    (9, 6) array: each lineup slot's outcome probabilities against the
+    pitching it faces.
+    """
+    def __init__(self, probabilities):
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        if self.probabilities.shape != (LINEUP_SIZE, NUM_OUTCOMES):
+            raise ValueError("InningModel needs outcome probabilities for exactly nine lineup slots")
+        # innings[first, next, runs]: a half inning led off by `first`
+        self.innings = self.distributions(np.zeros(LINEUP_SIZE, dtype=np.int64), np.arange(LINEUP_SIZE))
+        self._rest_of_inning = {}
+        self._run_expectancy = None
+
+    def distributions(self, states, slots):
+        """
+        For each (base-out state, batter due up) pair, returns the joint
+        distribution of (next inning's leadoff slot, runs still to score this
+        inning) as an array of shape (len(states), 9, MAX_INNING_RUNS + 1).
+        """
+        states = np.asarray(states, dtype=np.int64)
+        slots = np.asarray(slots, dtype=np.int64)
+        count = len(states)
+        size = MAX_INNING_RUNS + 1
+        mass = np.zeros((count, size, NUM_STATES))
+        mass[np.arange(count), 0, states] = 1.0
+        result = np.zeros((count, LINEUP_SIZE, size))
+        rows = np.arange(count)
+        for step in range(MAX_PLATE_APPEARANCES):
+            odds = self.probabilities[(slots + step) % LINEUP_SIZE]
+            moved = np.zeros((count, size, NUM_STATES + 1))
+            for outcome, runs, matrix in TRANSITION_GROUPS:
+                flow = (mass * odds[:, outcome, None, None]) @ matrix
+                if runs:
+                    moved[:, runs:] += flow[:, :size - runs]
+                    moved[:, -1] += flow[:, size - runs:].sum(axis=1)
+                else:
+                    moved += flow
+            result[rows, (slots + step + 1) % LINEUP_SIZE] += moved[:, :, INNING_OVER]
+            mass = moved[:, :, :NUM_STATES]
+            if mass.sum() < TOLERANCE:
+                break
+        return result
+
+    def rest_of_inning(self, state, slot):
+        """
+        The (next leadoff slot, runs) distribution from a mid-inning state,
+        cached.
+        """
+        key = (state, slot)
+        if key not in self._rest_of_inning:
+            if state == 0:
+                self._rest_of_inning[key] = self.innings[slot]
+            else:
+                self._rest_of_inning[key] = self.distributions([state], [slot])[0]
+        return self._rest_of_inning[key]
+
+    def runs_per_inning(self, slot=0):
+        return float(self.innings[slot].sum(axis=0) @ np.arange(MAX_INNING_RUNS + 1))
+
+    def run_expectancy(self):
+        """
+        Returns a (24, 9) array of expected runs for the rest of the inning
+        from each base-out state with each slot due up, solved exactly as a
+        linear system.
+        """
+        if self._run_expectancy is None:
+            size = NUM_STATES * LINEUP_SIZE
+            system = np.eye(size)
+            value = np.zeros(size)
+            for state in range(NUM_STATES):
+                for slot in range(LINEUP_SIZE):
+                    row = state * LINEUP_SIZE + slot
+                    for outcome in range(NUM_OUTCOMES):
+                        chance = self.probabilities[slot, outcome]
+                        index = state * NUM_OUTCOMES + outcome
+                        value[row] += chance * RUNS_SCORED[index]
+                        if NEXT_STATE[index] != INNING_OVER:
+                            system[row, NEXT_STATE[index] * LINEUP_SIZE + (slot + 1) % LINEUP_SIZE] -= chance
+            self._run_expectancy = np.linalg.solve(system, value).reshape(NUM_STATES, LINEUP_SIZE)
+        return self._run_expectancy
+
+    def expected_runs(self, state=0, slot=0):
+        return float(self.run_expectancy()[state, slot])
+
+
+class WinExpectancy:
+    """
+    The home team's win probability from any point of a game between two
+    InningModels. Tables are indexed [lead + MAX_LEAD, away slot, home slot]
+    where lead is the home score minus the away score.
+    """
+    def __init__(self, away_model, home_model, innings=9):
+        self.away_model = away_model
+        self.home_model = home_model
+        self.innings = innings
+        shape = (2 * MAX_LEAD + 1, LINEUP_SIZE, LINEUP_SIZE)
+        leads = np.arange(-MAX_LEAD, MAX_LEAD + 1)
+        # after_top[n] / after_bottom[n]: win probability once that half of inning n is over
+        self.before_top = {}
+        self.after_top = {}
+        self.after_bottom = {}
+        tied = np.full(shape, 0.5)
+        for inning in range(MAX_INNINGS, 0, -1):
+            following = self.before_top.get(inning + 1, tied)
+            if inning >= innings:
+                final = np.where(leads > 0, 1.0, 0.0)[:, None, None] * np.ones(shape)
+                final[MAX_LEAD] = following[MAX_LEAD]
+                self.after_bottom[inning] = final
+            else:
+                self.after_bottom[inning] = following
+            before_bottom = self._play(home_model.innings, self.after_bottom[inning], home=True)
+            if inning >= innings:
+                # The home team does not bat when it already leads
+                before_bottom = np.where((leads > 0)[:, None, None], 1.0, before_bottom)
+            self.after_top[inning] = before_bottom
+            self.before_top[inning] = self._play(away_model.innings, before_bottom, home=False)
+
+    @staticmethod
+    def _play(innings, after, home):
+        """
+        Win probability before a half inning, given the probability after it
+        and the batting team's (first, next, runs) inning distributions.
+        """
+        before = np.zeros_like(after)
+        lead_index = np.arange(2 * MAX_LEAD + 1)
+        for runs in range(MAX_INNING_RUNS + 1):
+            shifted = after[np.clip(lead_index + (runs if home else -runs), 0, 2 * MAX_LEAD)]
+            if home:
+                before += np.einsum("hx,dax->dah", innings[:, :, runs], shifted)
+            else:
+                before += np.einsum("ax,dxh->dah", innings[:, :, runs], shifted)
+        return before
+
+    def win_probability(self, inning, half, lead, away_slot=0, home_slot=0, state=0):
+        """
+        The home team's chance of winning with `half` (0 top, 1 bottom) of
+        `inning` to play from base-out `state`, the home team ahead by `lead`
+        and each team's next batter at the given slots. Innings past
+        MAX_INNINGS use the last one's table.
+        """
+        inning = min(inning, MAX_INNINGS)
+        if half == 0:
+            if state == 0:
+                return self._lookup(self.before_top[inning], lead, away_slot, home_slot)
+            rest = self.away_model.rest_of_inning(state, away_slot)
+            after = self.after_top[inning]
+            sign = -1
+        else:
+            if inning >= self.innings and lead > 0:
+                return 1.0
+            rest = self.home_model.rest_of_inning(state, home_slot)
+            after = self.after_bottom[inning]
+            sign = 1
+        chance = 0.0
+        for runs in range(MAX_INNING_RUNS + 1):
+            lead_index = min(max(lead + sign * runs, -MAX_LEAD), MAX_LEAD) + MAX_LEAD
+            if half == 0:
+                chance += rest[:, runs] @ after[lead_index, :, home_slot]
+            else:
+                chance += rest[:, runs] @ after[lead_index, away_slot, :]
+        return float(chance)
+
+    @staticmethod
+    def _lookup(table, lead, away_slot, home_slot):
+        return float(table[min(max(lead, -MAX_LEAD), MAX_LEAD) + MAX_LEAD, away_slot, home_slot])
+
+
+class ExpectancyCache:
+    """
+    InningModels per (lineup, pitching staff, coach context) and
+    WinExpectancy tables per pair of those, least recently used first out.
+    A model is rebuilt once the store's ratings have changed since it was
+    made.
+    """
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._models = OrderedDict()
+        self._games = OrderedDict()
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return value
+
+    def inning_model(self, batters, pitchers, context=None):
+        """
+        The model for the first nine `batters` facing `pitchers`, which the
+        engine rotates through, so their outcome odds are averaged. `context`
+        is the coach_context() the game plays under. Models are keyed by the
+        store's ratings_version, so a hit is a dictionary lookup.
+        """
+        batters = batters[:LINEUP_SIZE]
+        store = batters[0].store
+        key = (id(store), store.ratings_version, tuple(batter.id for batter in batters),
+               tuple(pitcher.id for pitcher in pitchers), context)
+        model = self._models.get(key)
+        if model is not None:
+            self._models.move_to_end(key)
+            return model
+        probabilities = outcome_probabilities(batters, pitchers, context).mean(axis=1)
+        return self._remember(self._models, key, InningModel(probabilities))
+
+    def win_expectancy(self, home_team, away_team, innings=9):
+        away_model = self.inning_model(away_team.batters, home_team.pitchers, coach_context(away_team, home_team))
+        home_model = self.inning_model(home_team.batters, away_team.pitchers, coach_context(home_team, away_team))
+        key = (id(away_model), id(home_model), innings)
+        table = self._games.get(key)
+        if table is not None and table.away_model is away_model and table.home_model is home_model:
+            self._games.move_to_end(key)
+            return table
+        return self._remember(self._games, key, WinExpectancy(away_model, home_model, innings))
+
+    def game_win_probability(self, game):
+        """
+        The home team's chance of winning a Game between innings, from the
+        score and each lineup's next batter.
+        """
+        table = self.win_expectancy(game.home_team, game.away_team, game.innings)
+        home, away = game.home_team, game.away_team
+        if game.is_game_over():
+            return 1.0 if home.score > away.score else 0.0
+        return table.win_probability(game.current_inning, 0, home.score - away.score,
+                                     away.current_batter_index, home.current_batter_index)
@@ -0,0 +1,259 @@
+"""
+The free-agent market.
+
+Every free agent has a market value in millions from their ratings and age:
+a young batter is priced partly on potential, a veteran on the decline
+still to come. The player asks for a share of it. A team values a player
+at that market value scaled up where its roster is short at the position
+and down where it already has a surplus.
+
+The market clears as a priority-queue auction. Free agents are kept in
+one list per position, best first. Asking prices fall along each list, so
+the first player a team can afford is a binary search away, and signed
+players are skipped with a shared path-compressed "next unsigned" link,
+so a team's favourite affordable target is the best of a dozen lookups.
+Every team puts a bid for its target on one max-heap; the highest bid is
+settled first. If the player is still available the team signs them at
+the larger of the asking price and the best competing valuation (capped
+at its own bid), like a second-price auction; otherwise it moves to its
+next target. A market of n players and t teams clears in about
+O(n log n + signings * t).
+"""
+import heapq
+import random
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+
+from .development import expected_decline, growth_share
+from .draft import ROSTER_TARGETS, roster_needs
+from .engine import CURRENT_COLUMNS, POTENTIAL_COLUMNS, Pitcher
+from .simulation import BATTER_POSITIONS, PITCHER_POSITIONS
+
+POSITIONS = sorted(ROSTER_TARGETS)
+POSITION_INDEX = {position: i for i, position in enumerate(POSITIONS)}
+# Millions for an average regular, for the league minimum, and per team per offseason
+AVERAGE_SALARY = 2.0
+MIN_SALARY = 0.5
+DEFAULT_BUDGET = 40.0
+# The usual projected overall rating and one standard step above it; a
+# batter's overall averages more ratings, so it spreads less
+BATTER_VALUE_CENTER, BATTER_VALUE_SPREAD = 35.0, 4.0
+PITCHER_VALUE_CENTER, PITCHER_VALUE_SPREAD = 50.0, 8.0
+# Salary grows by e for each 1 / SALARY_SLOPE steps above the usual
+SALARY_SLOPE = 0.6
+# Years of growth or decline a valuation looks ahead
+VALUATION_YEARS = 3
+# A player asks for this share of their market value
+ASKING_SHARE = 0.8
+# Value added per player a team is missing at a position, between these bounds
+NEED_PREMIUM = 0.25
+MIN_NEED_FACTOR, MAX_NEED_FACTOR = 0.25, 1.5
+
+
+def projected_ratings(players):
+    """
+    Each player's overall rating VALUATION_YEARS from now, from the
+    development curves: young batters close on potential, veterans decline.
+    """
+    projected = np.zeros(len(players))
+    batter_rows = [i for i, player in enumerate(players) if not isinstance(player, Pitcher)]
+    pitcher_rows = [i for i, player in enumerate(players) if isinstance(player, Pitcher)]
+    if batter_rows:
+        store = players[batter_rows[0]].store
+        ids = [players[i].id for i in batter_rows]
+        ratings = store.batter_ratings[ids].astype(np.float64)
+        current = ratings[:, CURRENT_COLUMNS].mean(axis=1)
+        potential = ratings[:, POTENTIAL_COLUMNS].mean(axis=1)
+        ages = store.batter_ages[ids].astype(np.float64)
+        growth = 1 - (1 - growth_share(ages)) ** VALUATION_YEARS
+        projected[batter_rows] = (current + np.maximum(potential - current, 0) * growth
+                                  - VALUATION_YEARS * expected_decline(ages))
+    if pitcher_rows:
+        store = players[pitcher_rows[0]].store
+        ids = [players[i].id for i in pitcher_rows]
+        ages = store.pitcher_ages[ids].astype(np.float64)
+        projected[pitcher_rows] = store.pitcher_ratings[ids].mean(axis=1) - VALUATION_YEARS * expected_decline(ages)
+    return projected
+
+
+def market_values(players):
+    """
+    Market value in millions for each player.
+    """
+    projected = projected_ratings(players)
+    is_pitcher = np.array([isinstance(player, Pitcher) for player in players], dtype=bool)
+    center = np.where(is_pitcher, PITCHER_VALUE_CENTER, BATTER_VALUE_CENTER)
+    spread = np.where(is_pitcher, PITCHER_VALUE_SPREAD, BATTER_VALUE_SPREAD)
+    return np.maximum(AVERAGE_SALARY * np.exp(SALARY_SLOPE * (projected - center) / spread), MIN_SALARY)
+
+
+def need_factors(needs):
+    """
+    Valuation multipliers for signed roster needs (negative for surpluses).
+    """
+    return np.clip(1 + NEED_PREMIUM * np.asarray(needs, dtype=np.float64), MIN_NEED_FACTOR, MAX_NEED_FACTOR)
+
+
+class FreeAgencyMarket:
+    """
+    One offseason's market: `teams` bid on `free_agents` under `budgets`
+    ({team name: millions}, DEFAULT_BUDGET for any team not in it). A team
+    stops bidding once it has `max_batters` batters and `max_pitchers`
+    pitchers.
+    """
+    def __init__(self, teams, free_agents, budgets=None, max_batters=len(BATTER_POSITIONS),
+                 max_pitchers=len(PITCHER_POSITIONS)):
+        self.teams = list(teams)
+        self.players = list(free_agents)
+        self.values = market_values(self.players) if self.players else np.zeros(0)
+        self.asking = self.values * ASKING_SHARE
+        self.position_of = np.array([POSITION_INDEX[player.position] for player in self.players],
+                                    dtype=np.int64)
+        self.is_pitcher = np.array([isinstance(player, Pitcher) for player in self.players], dtype=bool)
+        self.budgets = np.array([(budgets or {}).get(team.name, DEFAULT_BUDGET)
+                                 for team in self.teams], dtype=np.float64)
+        self.needs = np.array([[roster_needs(team)[position] for position in POSITIONS] for team in self.teams],
+                              dtype=np.int64).reshape(len(self.teams), len(POSITIONS))
+        self.open_spots = np.array([[max_batters - len(team.batters), max_pitchers - len(team.pitchers)]
+                                    for team in self.teams], dtype=np.int64).reshape(len(self.teams), 2)
+
+        # Each position's free agents, best first, with their asking prices
+        # negated so the lists ascend for bisect
+        order = np.argsort(-self.values, kind="stable")
+        by_position = [[] for _ in POSITIONS]
+        for index in order.tolist():
+            by_position[self.position_of[index]].append(index)
+        self.by_position = by_position
+        self.negative_asking = [(-self.asking[players]).tolist() for players in by_position]
+        self.slot_of = np.zeros(len(self.players), dtype=np.int64)
+        for players in by_position:
+            self.slot_of[players] = np.arange(len(players))
+        # next_unsigned[position][slot]: a slot at or before the first unsigned player from `slot` on
+        self.next_unsigned = [list(range(len(players) + 1)) for players in by_position]
+        self.signed = np.zeros(len(self.players), dtype=bool)
+        self.contracts = []
+
+    def spendable(self):
+        """
+        What each team can offer one player while keeping the league minimum
+        for every other open spot.
+        """
+        others = np.maximum(self.open_spots.sum(axis=1) - 1, 0)
+        return np.maximum(self.budgets - MIN_SALARY * others, 0.0)
+
+    def valuation(self, team_index, player_index):
+        factor = need_factors(self.needs[team_index, self.position_of[player_index]])
+        return float(self.values[player_index] * factor)
+
+    def _target(self, team_index):
+        """
+        Returns (bid, player index) for the team's best affordable target,
+        or None if it has nothing left to bid on. A bid is never below the
+        player's asking price.
+        """
+        budget = self.spendable()[team_index]
+        spots = self.open_spots[team_index]
+        factors = need_factors(self.needs[team_index])
+        best = None
+        for position, players in enumerate(self.by_position):
+            if not players or not spots[int(self.is_pitcher[players[0]])] > 0:
+                continue
+            # Bids scale with value like asking prices do, so a team this
+            # overstocked at the position would offer every player there less
+            # than they ask
+            if factors[position] < ASKING_SHARE:
+                continue
+            slot = self._unsigned_from(position, bisect_left(self.negative_asking[position], -budget))
+            if slot == len(players):
+                continue
+            index = players[slot]
+            bid = min(self.values[index] * factors[position], budget)
+            if best is None or bid > best[0]:
+                best = (float(bid), index)
+        return best
+
+    def _unsigned_from(self, position, slot):
+        """
+        The first slot at or after `slot` in the position's list whose
+        player is unsigned (the list's length if there is none).
+        """
+        links = self.next_unsigned[position]
+        root = slot
+        while links[root] != root:
+            root = links[root]
+        while links[slot] != root:
+            links[slot], slot = root, links[slot]
+        return root
+
+    def _price(self, team_index, player_index, bid):
+        """
+        The larger of the asking price and the best bid any other team with
+        room and money could have made, capped at the winning bid.
+        """
+        position = self.position_of[player_index]
+        kind = int(self.is_pitcher[player_index])
+        spendable = self.spendable()
+        rivals = np.minimum(self.values[player_index] * need_factors(self.needs[:, position]), spendable)
+        able = (self.open_spots[:, kind] > 0) & (spendable >= self.asking[player_index])
+        able[team_index] = False
+        competing = rivals[able].max() if able.any() else 0.0
+        return float(min(max(self.asking[player_index], competing), bid))
+
+    def run(self):
+        """
+        Clears the market and returns [(team, player, salary)] in signing order.
+        """
+        heap = []
+        for team_index in range(len(self.teams)):
+            target = self._target(team_index)
+            if target is not None:
+                heap.append((-target[0], team_index, target[1]))
+        heapq.heapify(heap)
+        while heap:
+            bid, team_index, player_index = heapq.heappop(heap)
+            if not self.signed[player_index]:
+                self._sign(team_index, player_index, -bid)
+            target = self._target(team_index)
+            if target is not None:
+                heapq.heappush(heap, (-target[0], team_index, target[1]))
+        return self.contracts
+
+    def _sign(self, team_index, player_index, bid):
+        salary = self._price(team_index, player_index, bid)
+        team = self.teams[team_index]
+        player = self.players[player_index]
+        self.signed[player_index] = True
+        slot = self.slot_of[player_index]
+        self.next_unsigned[self.position_of[player_index]][slot] = slot + 1
+        self.budgets[team_index] -= salary
+        self.needs[team_index, self.position_of[player_index]] -= 1
+        self.open_spots[team_index, int(self.is_pitcher[player_index])] -= 1
+        team.draft_player(player)
+        self.contracts.append((team, player, salary))
+
+    def unsigned(self):
+        return [player for player, signed in zip(self.players, self.signed.tolist()) if not signed]
+
+    def payroll(self):
+        """
+        Returns {team name: millions committed} for this market.
+        """
+        spent = Counter()
+        for team, _, salary in self.contracts:
+            spent[team.name] += salary
+        return dict(spent)
+
+
+def run_free_agency(teams, free_agents, budgets=None, rng=None, **limits):
+    """
+    Runs one market and returns (contracts, unsigned players). Teams are
+    shuffled with `rng` first so ties between equal bids do not always go
+    to the same club.
+    """
+    rng = rng if rng is not None else random
+    teams = list(teams)
+    rng.shuffle(teams)
+    market = FreeAgencyMarket(teams, free_agents, budgets, **limits)
+    return market.run(), market.unsigned()
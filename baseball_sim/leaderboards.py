@@ -0,0 +1,252 @@
+"""
+Career totals and all-time leaderboards that grow season by season.
+
+CareerRecords keeps every player's career counting stats in arrays indexed
+by store id, and a wins-above-replacement style composite built from each
+season's league context. After a season only the players who played are
+touched: their totals are added in one vectorized step, then offered to a
+Leaderboard per stat. A Leaderboard is a min-heap bounded to its size, so
+an update is O(log size), and a record page reads at most `size` entries
+no matter how many seasons or players there have been.
+"""
+import heapq
+
+import numpy as np
+
+from .outcomes import OUT, WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN, NUM_OUTCOMES
+from .roster_store import BATTER_COUNTING, PITCHER_COUNTING
+
+LEADERBOARD_SIZE = 100
+BATTING_STATS = list(BATTER_COUNTING)
+PITCHING_STATS = [key.lower().replace(" ", "_") for key in PITCHER_COUNTING]
+
+# Runs above an average plate appearance for each outcome
+LINEAR_WEIGHTS = np.zeros(NUM_OUTCOMES)
+LINEAR_WEIGHTS[[OUT, WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN]] = [-0.27, 0.31, 0.47, 0.77, 1.04, 1.40]
+# A replacement-level batter is this many runs per plate appearance below average
+REPLACEMENT_RUNS_PER_PA = 20 / 600
+# A replacement-level pitcher allows this multiple of the league's run rate
+REPLACEMENT_RUN_RATE = 1.25
+RUNS_PER_WIN = 10.0
+
+BATTING_LEADERBOARDS = ["home_runs", "hits", "war"]
+PITCHING_LEADERBOARDS = ["strikeouts", "war"]
+
+
+class Leaderboard:
+    """
+    The `size` highest values seen, one per player. Values may go up or
+    down; superseded heap entries are skipped when they reach the top.
+    """
+    def __init__(self, size=LEADERBOARD_SIZE):
+        self.size = size
+        self.values = {}
+        self.heap = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def _prune(self):
+        heap, values = self.heap, self.values
+        while heap and values.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def minimum(self):
+        """
+        The value a newcomer has to beat once the board is full.
+        """
+        self._prune()
+        return self.heap[0][0] if self.heap else None
+
+    def update(self, key, value):
+        values = self.values
+        if key not in values and len(values) >= self.size:
+            if value <= self.minimum():
+                return
+            _, evicted = heapq.heappop(self.heap)
+            del values[evicted]
+        values[key] = value
+        heapq.heappush(self.heap, (value, key))
+        if len(self.heap) > 2 * self.size:
+            self.heap = [(value, key) for key, value in values.items()]
+            heapq.heapify(self.heap)
+
+    def top(self, count=10):
+        """
+        Returns [(key, value), ...], highest first.
+        """
+        return heapq.nlargest(count, self.values.items(), key=lambda item: item[1])
+
+    def leader(self):
+        return max(self.values.items(), key=lambda item: item[1], default=None)
+
+
+class CareerRecords:
+    """
+    Career totals for every player in `store` plus bounded leaderboards for
+    home runs, hits, strikeouts and batting/pitching WAR.
+    """
+    def __init__(self, store, size=LEADERBOARD_SIZE):
+        self.store = store
+        self.batting = np.zeros((0, len(BATTING_STATS)), dtype=np.int64)
+        self.batting_war = np.zeros(0)
+        self.pitching = np.zeros((0, len(PITCHING_STATS)), dtype=np.int64)
+        self.pitching_outs = np.zeros(0, dtype=np.int64)
+        self.pitching_runs = np.zeros(0, dtype=np.int64)
+        self.pitching_war = np.zeros(0)
+        self.seasons_played = {"batting": np.zeros(0, dtype=np.int32), "pitching": np.zeros(0, dtype=np.int32)}
+        self.batting_leaders = {stat: Leaderboard(size) for stat in BATTING_LEADERBOARDS}
+        self.pitching_leaders = {stat: Leaderboard(size) for stat in PITCHING_LEADERBOARDS}
+
+    def _fit(self):
+        store = self.store
+        if len(self.batting) < store.num_batters:
+            extra = store.num_batters - len(self.batting)
+            self.batting = np.vstack([self.batting, np.zeros((extra, len(BATTING_STATS)), dtype=np.int64)])
+            self.batting_war = np.concatenate([self.batting_war, np.zeros(extra)])
+            self.seasons_played["batting"] = np.concatenate([self.seasons_played["batting"],
+                                                             np.zeros(extra, dtype=np.int32)])
+        if len(self.pitching) < store.num_pitchers:
+            extra = store.num_pitchers - len(self.pitching)
+            self.pitching = np.vstack([self.pitching, np.zeros((extra, len(PITCHING_STATS)), dtype=np.int64)])
+            self.pitching_outs = np.concatenate([self.pitching_outs, np.zeros(extra, dtype=np.int64)])
+            self.pitching_runs = np.concatenate([self.pitching_runs, np.zeros(extra, dtype=np.int64)])
+            self.pitching_war = np.concatenate([self.pitching_war, np.zeros(extra)])
+            self.seasons_played["pitching"] = np.concatenate([self.seasons_played["pitching"],
+                                                              np.zeros(extra, dtype=np.int32)])
+
+    def add_season(self, batter_ids, pitcher_ids):
+        """
+        Adds the store's current season totals for these players to their
+        careers and updates the leaderboards for them.
+        """
+        self._fit()
+        store = self.store
+        batter_ids = np.asarray(batter_ids, dtype=np.int64)
+        pitcher_ids = np.asarray(pitcher_ids, dtype=np.int64)
+
+        outcomes = store.batter_outcomes[batter_ids]
+        self.batting[batter_ids] += store.batting_totals(batter_ids)
+        self.batting_war[batter_ids] += batting_war(outcomes, store.batter_outcomes[:store.num_batters].sum(axis=0))
+        self.seasons_played["batting"][batter_ids] += 1
+
+        outcomes = store.pitcher_outcomes[pitcher_ids]
+        runs = store.pitcher_runs[pitcher_ids]
+        league_outs = store.pitcher_outcomes[:store.num_pitchers, OUT].sum()
+        league_runs = store.pitcher_runs[:store.num_pitchers].sum()
+        self.pitching[pitcher_ids] += store.pitching_totals(pitcher_ids)
+        self.pitching_outs[pitcher_ids] += outcomes[:, OUT]
+        self.pitching_runs[pitcher_ids] += runs
+        self.pitching_war[pitcher_ids] += pitching_war(outcomes[:, OUT], runs, league_outs, league_runs)
+        self.seasons_played["pitching"][pitcher_ids] += 1
+
+        for stat, board in self.batting_leaders.items():
+            values = self.batting_war if stat == "war" else self.batting[:, BATTING_STATS.index(stat)]
+            for batter_id, value in zip(batter_ids.tolist(), values[batter_ids].tolist()):
+                board.update(batter_id, value)
+        for stat, board in self.pitching_leaders.items():
+            values = self.pitching_war if stat == "war" else self.pitching[:, PITCHING_STATS.index(stat)]
+            for pitcher_id, value in zip(pitcher_ids.tolist(), values[pitcher_ids].tolist()):
+                board.update(pitcher_id, value)
+
+    def arrays(self):
+        """
+        The career arrays by name, for saving.
+        """
+        self._fit()
+        return {
+            "batting": self.batting, "batting_war": self.batting_war,
+            "batting_seasons": self.seasons_played["batting"],
+            "pitching": self.pitching, "pitching_outs": self.pitching_outs, "pitching_runs": self.pitching_runs,
+            "pitching_war": self.pitching_war, "pitching_seasons": self.seasons_played["pitching"],
+        }
+
+    def restore(self, arrays):
+        """
+        Loads arrays saved from arrays() and rebuilds the leaderboards.
+        """
+        self.batting = arrays["batting"].copy()
+        self.batting_war = arrays["batting_war"].copy()
+        self.pitching = arrays["pitching"].copy()
+        self.pitching_outs = arrays["pitching_outs"].copy()
+        self.pitching_runs = arrays["pitching_runs"].copy()
+        self.pitching_war = arrays["pitching_war"].copy()
+        self.seasons_played = {"batting": arrays["batting_seasons"].copy(),
+                               "pitching": arrays["pitching_seasons"].copy()}
+        self._fit()
+        for stat, board in self.batting_leaders.items():
+            values = self.batting_war if stat == "war" else self.batting[:, BATTING_STATS.index(stat)]
+            _fill(board, values, self.seasons_played["batting"])
+        for stat, board in self.pitching_leaders.items():
+            values = self.pitching_war if stat == "war" else self.pitching[:, PITCHING_STATS.index(stat)]
+            _fill(board, values, self.seasons_played["pitching"])
+
+    def batting_career(self, batter_id):
+        """
+        Returns a batter's career totals as a dict (zeros if they never played).
+        """
+        self._fit()
+        career = dict(zip(BATTING_STATS, self.batting[batter_id].tolist()))
+        career["war"] = float(self.batting_war[batter_id])
+        career["seasons"] = int(self.seasons_played["batting"][batter_id])
+        return career
+
+    def pitching_career(self, pitcher_id):
+        self._fit()
+        career = dict(zip(PITCHING_STATS, self.pitching[pitcher_id].tolist()))
+        career["outs"] = int(self.pitching_outs[pitcher_id])
+        career["runs_allowed"] = int(self.pitching_runs[pitcher_id])
+        career["war"] = float(self.pitching_war[pitcher_id])
+        career["seasons"] = int(self.seasons_played["pitching"][pitcher_id])
+        return career
+
+    def batting_leaders_for(self, stat, count=10):
+        """
+        Returns [(name, value), ...] for the all-time batting leaders in `stat`.
+        """
+        names = self.store.batter_names
+        return [(names[batter_id], value) for batter_id, value in self.batting_leaders[stat].top(count)]
+
+    def pitching_leaders_for(self, stat, count=10):
+        names = self.store.pitcher_names
+        return [(names[pitcher_id], value) for pitcher_id, value in self.pitching_leaders[stat].top(count)]
+
+    def is_batting_leader(self, batter_id, stat):
+        """
+        True if the batter is on the all-time board for `stat`.
+        """
+        return batter_id in self.batting_leaders[stat]
+
+
+def _fill(board, values, seasons_played):
+    board.values.clear()
+    board.heap = []
+    played = np.flatnonzero(seasons_played > 0)
+    best = played[np.argsort(-values[played], kind="stable")[:board.size]]
+    for player_id, value in zip(best.tolist(), values[best].tolist()):
+        board.update(player_id, value)
+
+
+def batting_war(outcomes, league_outcomes):
+    """
+    Wins above replacement for (players, NUM_OUTCOMES) outcome counts, measured
+    against the league's average run value per plate appearance.
+    """
+    outcomes = np.atleast_2d(outcomes)
+    plate_appearances = outcomes.sum(axis=1)
+    league_pa = league_outcomes.sum()
+    league_rate = (league_outcomes @ LINEAR_WEIGHTS) / league_pa if league_pa else 0.0
+    runs = outcomes @ LINEAR_WEIGHTS - league_rate * plate_appearances
+    return (runs + REPLACEMENT_RUNS_PER_PA * plate_appearances) / RUNS_PER_WIN
+
+
+def pitching_war(outs, runs, league_outs, league_runs):
+    """
+    Wins above replacement from outs recorded and runs allowed, where a
+    replacement pitcher allows REPLACEMENT_RUN_RATE times the league rate.
+    """
+    league_rate = league_runs / league_outs if league_outs else 0.0
+    return (REPLACEMENT_RUN_RATE * league_rate * np.asarray(outs) - np.asarray(runs)) / RUNS_PER_WIN
@@ -0,0 +1,240 @@
+"""
+League play on top of the headless engine: schedule, regular season and
+playoffs, ported from the prototype in testingcode.py so that every game is
+actually simulated instead of rolling random scores.
+"""
+from .roster_store import RosterStore
+from .schedule import generate_schedule
+from .simulation import create_random_team, simulate_game
+from .standings import Standings, default_divisions
+
+# Series length (games needed to win) for each playoff round, earliest first
+PLAYOFF_ROUNDS = [2, 3, 4, 4]
+
+
+class League:
+    def __init__(self, teams=None, games_per_season=162, playoff_spots=12, rng=None, store=None, divisions=None):
+        self.store = store if store is not None else RosterStore()
+        self.teams = teams if teams is not None else [create_random_team(f"Team {i}", rng, store=self.store)
+                                                      for i in range(30)]
+        self.games_per_season = games_per_season
+        self.playoff_spots = playoff_spots
+        self.divisions = divisions if divisions is not None else default_divisions(len(self.teams))
+        self.standings = Standings(len(self.teams), self.divisions)
+        self.schedule = None
+
+    def generate_schedule(self, rng=None):
+        """
+        Builds a balanced schedule in which every team plays games_per_season games.
+        """
+        self.schedule = generate_schedule(len(self.teams), self.games_per_season, rng)
+
+    def reset_records(self):
+        for team in self.teams:
+            team.wins = 0
+            team.losses = 0
+        games_scheduled = self.schedule.games_per_team(len(self.teams)) if self.schedule is not None else None
+        self.standings.reset(games_scheduled)
+
+    def play_season(self, rng=None, event_log=None, first_game_id=0, on_day=None, start_day=0):
+        """
+        Plays the schedule. With an `rng`, game i uses rng.spawn("game", i), so
+        a season's results depend only on the seed, not on who ran it. Play by
+        play goes to `event_log` with game ids counting up from `first_game_id`.
+        `on_day(day, standings)` is called after each day's games when given.
+        A `start_day` past 0 resumes a season whose earlier days were already
+        played (e.g. one restored from a save), keeping the records so far.
+        """
+        if start_day == 0:
+            self.reset_records()
+        teams = self.teams
+        standings = self.standings
+        i = int(self.schedule.day_start[start_day]) if start_day < self.schedule.num_days else len(self.schedule)
+        for day, home_indexes, away_indexes in self.schedule.days(start_day):
+            for home_index, away_index in zip(home_indexes.tolist(), away_indexes.tolist()):
+                home, away = teams[home_index], teams[away_index]
+                game_rng = rng.spawn("game", i) if rng is not None else None
+                home_score, away_score = simulate_game(home, away, rng=game_rng, event_log=event_log,
+                                                       game_id=first_game_id + i)
+                if home_score > away_score:
+                    home.wins += 1
+                    away.losses += 1
+                else:
+                    away.wins += 1
+                    home.losses += 1
+                standings.record_game(home_index, away_index, home_score, away_score)
+                i += 1
+            if on_day is not None:
+                on_day(day, standings)
+
+    def games(self):
+        """
+        Streams (home_team, away_team) through the schedule day by day.
+        """
+        teams = self.teams
+        for day, home, away in self.schedule:
+            for home_index, away_index in zip(home.tolist(), away.tolist()):
+                yield teams[home_index], teams[away_index]
+
+    def playoff_seeds(self):
+        """
+        Returns {league name: [seeded teams]}, splitting playoff_spots evenly
+        between the leagues.
+        """
+        spots = self.playoff_spots // len(self.standings.leagues)
+        return {name: [self.teams[index] for index in self.standings.playoff_seeds(name, spots)]
+                for name in self.standings.leagues}
+
+    def playoffs(self):
+        """
+        Returns the playoff teams, every league's seeds in order.
+        """
+        return [team for seeds in self.playoff_seeds().values() for team in seeds]
+
+    def play_playoffs(self, rng=None):
+        """
+        Plays out the bracket and returns the champion.
+        """
+        order = {index: rank for rank, index in enumerate(self.standings.overall_standings())}
+        team_rank = {id(team): order[index] for index, team in enumerate(self.teams)}
+        bracket = PlayoffBracket(self.playoff_seeds(), lambda team: team_rank[id(team)], rng)
+        self.bracket = bracket
+        return bracket.play()
+
+
+class PlayoffBracket:
+    """
+    One postseason. Each league's seeds are trimmed to a power of two with
+    an opening round between the lowest seeds (so with six seeds the top two
+    get byes, 3 plays 6 and 4 plays 5), then every round is a series against
+    the opposite end of the bracket. League champions meet in a final with
+    home field going to the better record. Every series is played with the
+    game engine; `results` keeps (round, higher_seed, lower_seed, winner).
+    """
+    def __init__(self, league_seeds, rank=None, rng=None):
+        self.league_seeds = league_seeds
+        self.rank = rank if rank is not None else (lambda team: 0)
+        self.rng = rng
+        self.results = []
+        self.champion = None
+
+    def _series(self, round_number, higher_seed, lower_seed, wins_needed):
+        series_rng = self.rng.spawn("series", len(self.results)) if self.rng is not None else None
+        winner = play_series(higher_seed, lower_seed, wins_needed, series_rng)
+        self.results.append((round_number, higher_seed, lower_seed, winner))
+        return winner
+
+    def _play_league(self, seeds):
+        round_number = 0
+        bracket_size = 1
+        while bracket_size * 2 <= len(seeds):
+            bracket_size *= 2
+        if bracket_size < len(seeds):
+            play_in = len(seeds) - bracket_size
+            field = seeds[bracket_size - play_in:]
+            winners = [self._series(round_number, field[i], field[-1 - i], PLAYOFF_ROUNDS[round_number])
+                       for i in range(play_in)]
+            seeds = seeds[:bracket_size - play_in] + winners
+            round_number += 1
+        while len(seeds) > 1:
+            wins_needed = PLAYOFF_ROUNDS[min(round_number, len(PLAYOFF_ROUNDS) - 1)]
+            half = len(seeds) // 2
+            seeds = [self._series(round_number, seeds[i], seeds[-1 - i], wins_needed) for i in range(half)]
+            round_number += 1
+        return seeds[0], round_number
+
+    def play(self):
+        """
+        Plays every series and returns the champion.
+        """
+        finalists = []
+        last_round = 0
+        for seeds in self.league_seeds.values():
+            if seeds:
+                champion, rounds = self._play_league(list(seeds))
+                finalists.append(champion)
+                last_round = max(last_round, rounds)
+        finalists.sort(key=self.rank)
+        while len(finalists) > 1:
+            finalists = [self._series(last_round, finalists[i], finalists[-1 - i], PLAYOFF_ROUNDS[-1])
+                         for i in range(len(finalists) // 2)] + ([finalists[len(finalists) // 2]]
+                                                                 if len(finalists) % 2 else [])
+            last_round += 1
+        self.champion = finalists[0]
+        return self.champion
+
+
+def play_series(higher_seed, lower_seed, wins_needed, rng=None):
+    """
+    Plays a best-of-(2 * wins_needed - 1) series, alternating home field and
+    starting at the higher seed's park, and returns the winner. With an
+    `rng`, game i of the series uses rng.spawn("game", i).
+    """
+    higher_wins = lower_wins = 0
+    game_number = 0
+    while higher_wins < wins_needed and lower_wins < wins_needed:
+        higher_at_home = game_number % 2 == 0
+        home, away = (higher_seed, lower_seed) if higher_at_home else (lower_seed, higher_seed)
+        game_rng = rng.spawn("game", game_number) if rng is not None else None
+        home_score, away_score = simulate_game(home, away, rng=game_rng)
+        if (home_score > away_score) == higher_at_home:
+            higher_wins += 1
+        else:
+            lower_wins += 1
+        game_number += 1
+    return higher_seed if higher_wins == wins_needed else lower_seed
+
+
+class HallOfFame:
+    """
+    Hall of Fame with an eligibility index. Retired players who clear a
+    career threshold are filed under the first season they can be inducted,
+    so eligibility checks and each season's class are dict lookups instead
+    of a scan over every player. A pitcher's counting criterion is career
+    outs recorded (`outs`, 7,500 being 2,500 innings), since the outcome
+    model does not tell strikeouts from other outs.
+    """
+    def __init__(self, home_runs=500, hits=3000, outs=7500, war=60.0, waiting_period=5):
+        self.home_runs = home_runs
+        self.hits = hits
+        self.outs = outs
+        self.war = war
+        self.waiting_period = waiting_period
+        self.inductees = []
+        self.eligible_from = {}
+        self.ballots = {}
+
+    def qualifies(self, career_stats):
+        return (career_stats.get("home_runs", 0) > self.home_runs or career_stats.get("hits", 0) > self.hits
+                or career_stats.get("outs", 0) > self.outs or career_stats.get("war", 0) > self.war)
+
+    def consider_for_hof(self, name, career_stats):
+        """
+        Inducts `name` right away if `career_stats` clears any threshold.
+        Returns True when inducted.
+        """
+        if self.qualifies(career_stats):
+            self.inductees.append(name)
+            return True
+        return False
+
+    def add_retiree(self, key, name, career_stats, final_season):
+        """
+        Files a retired player under the season they become eligible, if
+        their career qualifies. `key` is any hashable player id.
+        """
+        if self.qualifies(career_stats):
+            season = final_season + self.waiting_period
+            self.eligible_from[key] = season
+            self.ballots.setdefault(season, []).append((key, name))
+
+    def is_eligible(self, key, season):
+        return self.eligible_from.get(key, season + 1) <= season
+
+    def induct(self, season):
+        """
+        Inducts everyone first eligible in `season` and returns their keys.
+        """
+        ballot = self.ballots.pop(season, [])
+        self.inductees.extend(name for _, name in ballot)
+        return [key for key, _ in ballot]
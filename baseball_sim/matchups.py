@@ -0,0 +1,211 @@
+"""
+Batter-versus-pitcher outcome probabilities.
+
+Every plate appearance starts from league-average outcome rates. Each side
+then moves the odds of each outcome relative to an out: the batter's eye
+draws walks, contact makes singles, gap power doubles and power home runs,
+while the pitcher's control takes walks away, stuff and velocity take away
+hits and movement keeps the ball in the park. The dugouts add a small
+context term from the batting side's hitting coach and the fielding side's
+pitching coach. A rating moves its outcomes' log-odds in proportion to how
+far it is from the usual rating, so the combination is the generalized
+log5 rule: an average batter against an average pitcher gets exactly the
+league rates, and two strengths compound.
+
+The model is a couple of small matrix products for a whole lineup and
+staff at once. MatchupCache keeps each pair's cumulative distribution in a
+bounded LRU keyed by (batter id, pitcher id, context), so a game's tables
+are mostly dictionary hits and a plate appearance is still a bisect.
+"""
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from .outcomes import OUT, WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN, NUM_OUTCOMES
+from .roster_store import BATTER_RATINGS, PITCHER_RATINGS
+
+# Major-league rates per plate appearance, in outcome order
+LEAGUE_RATES = np.zeros(NUM_OUTCOMES)
+LEAGUE_RATES[[WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN]] = [0.090, 0.145, 0.046, 0.005, 0.034]
+LEAGUE_RATES[OUT] = 1 - LEAGUE_RATES.sum()
+
+# The rating a player has when nothing was specified, and how far one
+# "standard" step of skill is; batting skills are rolled on 20-50
+BATTER_CENTER, BATTER_SPREAD = 35.0, 15.0
+PITCHER_CENTER, PITCHER_SPREAD = 50.0, 15.0
+COACH_CENTER, COACH_SPREAD = 50.0, 15.0
+
+# Log-odds change (vs. an out) per step of each rating
+BATTER_EFFECTS = {
+    "eye": {WALK: 0.35},
+    "contact": {SINGLE: 0.30, DOUBLE: 0.10},
+    "gap_power": {DOUBLE: 0.30},
+    "triple": {TRIPLE: 0.35},
+    "power": {HOME_RUN: 0.45},
+}
+PITCHER_EFFECTS = {
+    "control": {WALK: -0.35},
+    "stuff": {SINGLE: -0.20, DOUBLE: -0.15},
+    "velocity": {SINGLE: -0.10, HOME_RUN: -0.10},
+    "movement": {DOUBLE: -0.10, TRIPLE: -0.10, HOME_RUN: -0.30},
+}
+# Per step of the hitting coach's hitting and the pitching coach's pitching
+COACH_EFFECT = 0.05
+COACH_OUTCOMES = [WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN]
+# Context with both coaches at the usual rating
+NEUTRAL_CONTEXT = (int(COACH_CENTER), int(COACH_CENTER))
+
+
+def _effect_matrix(columns, effects):
+    matrix = np.zeros((len(columns), NUM_OUTCOMES))
+    for rating, outcomes in effects.items():
+        for outcome, weight in outcomes.items():
+            matrix[columns.index(rating), outcome] = weight
+    return matrix
+
+
+BATTER_WEIGHTS = _effect_matrix(BATTER_RATINGS, BATTER_EFFECTS)
+PITCHER_WEIGHTS = _effect_matrix(PITCHER_RATINGS, PITCHER_EFFECTS)
+COACH_WEIGHTS = np.zeros(NUM_OUTCOMES)
+COACH_WEIGHTS[COACH_OUTCOMES] = COACH_EFFECT
+
+
+def batter_log_odds(ratings):
+    """
+    (batters, NUM_OUTCOMES) log-odds shifts from rows of batter ratings.
+    """
+    return ((np.asarray(ratings, dtype=np.float64) - BATTER_CENTER) / BATTER_SPREAD) @ BATTER_WEIGHTS
+
+
+def pitcher_log_odds(ratings):
+    return ((np.asarray(ratings, dtype=np.float64) - PITCHER_CENTER) / PITCHER_SPREAD) @ PITCHER_WEIGHTS
+
+
+def context_log_odds(context):
+    """
+    Log-odds shift for (hitting coach's hitting, pitching coach's pitching).
+    """
+    hitting, pitching = context if context is not None else NEUTRAL_CONTEXT
+    return (hitting - pitching) / COACH_SPREAD * COACH_WEIGHTS
+
+
+def log5(batter_shift, pitcher_shift, context_shift=0.0):
+    """
+    Outcome probabilities with shape (batters, pitchers, NUM_OUTCOMES) from
+    each side's log-odds shifts: league rates scaled by both and renormalized.
+    """
+    odds = LEAGUE_RATES * np.exp(batter_shift[:, None, :] + pitcher_shift[None, :, :] + context_shift)
+    return odds / odds.sum(axis=-1, keepdims=True)
+
+
+def _ratings(players, array_name, columns):
+    store = players[0].store
+    if all(player.store is store for player in players):
+        return getattr(store, array_name)[[player.id for player in players]]
+    return np.array([[player.attributes[key] for key in columns] for player in players], dtype=np.float64)
+
+
+def matchup_probabilities(batters, pitchers, context=None):
+    """
+    Returns a (len(batters), len(pitchers), NUM_OUTCOMES) array of outcome
+    probabilities, computed directly without the cache.
+    """
+    return log5(batter_log_odds(_ratings(batters, "batter_ratings", BATTER_RATINGS)),
+                pitcher_log_odds(_ratings(pitchers, "pitcher_ratings", PITCHER_RATINGS)),
+                context_log_odds(context))
+
+
+def coach_context(batting_team, pitching_team):
+    """
+    The (hitting, pitching) context for `batting_team` hitting against
+    `pitching_team`: its hitting coach's hitting rating and the other
+    side's pitching coach's pitching rating, or the usual rating for a
+    staff without one.
+    """
+    return (_coach_rating(batting_team, "HC", "hitting"), _coach_rating(pitching_team, "PC", "pitching"))
+
+
+def _coach_rating(team, role, rating):
+    for coach in team.staff:
+        if coach.role == role:
+            return int(coach.attributes[rating])
+    return int(COACH_CENTER)
+
+
+class MatchupCache:
+    """
+    Cumulative outcome distributions per (batter id, pitcher id, context)
+    for one RosterStore, least recently used first out. Everything is
+    dropped when the store's ratings change.
+    """
+    def __init__(self, store, maxsize=8192):
+        self.store = store
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.ratings_version = store.ratings_version
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def cdfs(self, batters, pitchers, context=None):
+        """
+        Returns nested lists cdf[b][p] of each pair's cumulative
+        probabilities for the first five outcomes, ready for bisect.
+        """
+        if self.store.ratings_version != self.ratings_version:
+            self.entries.clear()
+            self.ratings_version = self.store.ratings_version
+        context = context if context is not None else NEUTRAL_CONTEXT
+        entries = self.entries
+        rows = []
+        missing = []
+        for b, batter in enumerate(batters):
+            row = []
+            for p, pitcher in enumerate(pitchers):
+                key = (batter.id, pitcher.id, context)
+                cdf = entries.get(key)
+                if cdf is None:
+                    missing.append((b, p, key))
+                else:
+                    entries.move_to_end(key)
+                row.append(cdf)
+            rows.append(row)
+        self.hits += len(batters) * len(pitchers) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            batter_rows = sorted({b for b, _, _ in missing})
+            pitcher_rows = sorted({p for _, p, _ in missing})
+            probabilities = matchup_probabilities([batters[b] for b in batter_rows],
+                                                  [pitchers[p] for p in pitcher_rows], context)
+            computed = np.cumsum(probabilities, axis=-1)[..., :-1].tolist()
+            batter_index = {b: i for i, b in enumerate(batter_rows)}
+            pitcher_index = {p: i for i, p in enumerate(pitcher_rows)}
+            for b, p, key in missing:
+                cdf = computed[batter_index[b]][pitcher_index[p]]
+                rows[b][p] = entries[key] = cdf
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return rows
+
+    def probabilities(self, batter, pitcher, context=None):
+        """
+        One pair's outcome probabilities as an array.
+        """
+        cdf = self.cdfs([batter], [pitcher], context)[0][0]
+        return np.diff(np.concatenate([[0.0], cdf, [1.0]]))
+
+
+_caches = weakref.WeakKeyDictionary()
+
+
+def matchup_cache(store):
+    """
+    The MatchupCache for `store`, created on first use.
+    """
+    cache = _caches.get(store)
+    if cache is None:
+        cache = _caches[store] = MatchupCache(store)
+    return cache
@@ -0,0 +1,416 @@
+"""
+Minor-league farm systems: an AAA, AA and A club for every organization.
+
+Farm players are ordinary Batter/Pitcher rows in the league's RosterStore,
+so they develop, get drafted and get called up like anyone else. What the
+farm adds is stored per player id in flat arrays rather than per-club
+lists: the organization (int16) and level (int8) each player belongs to,
+and a separate set of outcome counts per level so minor-league lines never
+mix with major-league ones. A 200-player farm for all 30 organizations
+with a full season of stats is under a megabyte of arrays.
+
+A minor-league season is played for a whole level at once. Every game's
+two offenses are simulated side by side, one plate appearance per step
+across a vector of every offense still batting, with the same rules as
+the major-league engine: nine batters and the whole staff in rotation, full
+innings, and extra innings until somebody leads.
+"""
+import numpy as np
+
+from .bases import INNING_OVER, NEXT_STATE, RUNS_SCORED
+from .engine import CURRENT_COLUMNS, Batter, Pitcher
+from .matchups import matchup_probabilities
+from .outcomes import NUM_OUTCOMES
+from .rng import make_rng
+from .roster_store import (BATTER_COUNTING_MATRIX, PITCHER_COUNTING_MATRIX, _grown, batting_rates,
+                           pitching_rates)
+from .schedule import generate_schedule
+from .simulation import BATTER_POSITIONS, PITCHER_POSITIONS
+
+LEVELS = ["AAA", "AA", "A"]
+LEVEL_GAMES = {"AAA": 144, "AA": 138, "A": 132}
+# Level of a player who is not in any farm system
+NOT_IN_MINORS = -1
+# Each club bats its best nine and pitches its best PITCHING_STAFF in rotation
+LINEUP_SIZE = 9
+PITCHING_STAFF = len(PITCHER_POSITIONS)
+# Ages players are signed to a farm system at
+MIN_FARM_AGE, MAX_FARM_AGE = 18, 25
+
+_NEXT_STATE = np.array(NEXT_STATE, dtype=np.int64)
+_RUNS_SCORED = np.array(RUNS_SCORED, dtype=np.int64)
+
+
+class FarmSystem:
+    """
+    The farm systems of every team in `league`, which share its store.
+    Organizations are indexes into league.teams; levels are indexes into
+    LEVELS, 0 (AAA) being the highest.
+    """
+    def __init__(self, league):
+        self.league = league
+        self.store = league.store
+        self.batter_org = np.zeros(0, dtype=np.int16)
+        self.batter_level = np.zeros(0, dtype=np.int8)
+        self.pitcher_org = np.zeros(0, dtype=np.int16)
+        self.pitcher_level = np.zeros(0, dtype=np.int8)
+        self.batter_outcomes = np.zeros((len(LEVELS), 0, NUM_OUTCOMES), dtype=np.int32)
+        self.pitcher_outcomes = np.zeros((len(LEVELS), 0, NUM_OUTCOMES), dtype=np.int32)
+        self.pitcher_runs = np.zeros((len(LEVELS), 0), dtype=np.int32)
+        # records[level, org] = (wins, losses)
+        self.records = np.zeros((len(LEVELS), len(league.teams), 2), dtype=np.int32)
+        self._reserve()
+
+    def _reserve(self):
+        """
+        Grows the per-player arrays to the store's capacity.
+        """
+        batters, pitchers = len(self.store.batter_ratings), len(self.store.pitcher_ratings)
+        if batters > len(self.batter_level):
+            old = len(self.batter_level)
+            self.batter_org = _grown(self.batter_org, batters)
+            self.batter_level = _grown(self.batter_level, batters)
+            self.batter_level[old:] = NOT_IN_MINORS
+            self.batter_outcomes = _grown(self.batter_outcomes.swapaxes(0, 1), batters).swapaxes(0, 1)
+        if pitchers > len(self.pitcher_level):
+            old = len(self.pitcher_level)
+            self.pitcher_org = _grown(self.pitcher_org, pitchers)
+            self.pitcher_level = _grown(self.pitcher_level, pitchers)
+            self.pitcher_level[old:] = NOT_IN_MINORS
+            self.pitcher_outcomes = _grown(self.pitcher_outcomes.swapaxes(0, 1), pitchers).swapaxes(0, 1)
+            self.pitcher_runs = _grown(self.pitcher_runs.T, pitchers).T
+
+    def _arrays(self, player):
+        if isinstance(player, Pitcher):
+            return self.pitcher_org, self.pitcher_level
+        return self.batter_org, self.batter_level
+
+    # ---- Rosters ----
+
+    def sign(self, team_index, player, level=len(LEVELS) - 1):
+        """
+        Adds `player` to the farm system of league.teams[team_index] at
+        `level` (A ball by default).
+        """
+        self._reserve()
+        orgs, levels = self._arrays(player)
+        orgs[player.id] = team_index
+        levels[player.id] = level
+
+    def populate(self, players_per_org=200, rng=None, name_prefix="Prospect"):
+        """
+        Tops every organization's farm up to `players_per_org` players, half
+        batters and half pitchers, with new signings, then spreads each farm
+        over the levels by rating.
+        """
+        rng = make_rng(rng)
+        store = self.store
+        self._reserve()
+        teams = len(self.league.teams)
+        batters = np.bincount(self.batter_org[self.batter_level != NOT_IN_MINORS], minlength=teams)
+        pitchers = np.bincount(self.pitcher_org[self.pitcher_level != NOT_IN_MINORS], minlength=teams)
+        for team_index, team in enumerate(self.league.teams):
+            for i in range(players_per_org):
+                if i // 2 < (batters if i % 2 == 0 else pitchers)[team_index]:
+                    continue
+                name = f"{team.name} {name_prefix} {i + 1}"
+                age = rng.randint(MIN_FARM_AGE, MAX_FARM_AGE)
+                if i % 2 == 0:
+                    player = Batter(name, rng.choice(BATTER_POSITIONS), age=age, rng=rng, store=store)
+                else:
+                    player = Pitcher(name, rng.choice(PITCHER_POSITIONS), age=age, rng=rng, store=store)
+                self.sign(team_index, player)
+        self.reassign()
+
+    def release(self, player):
+        self._arrays(player)[1][player.id] = NOT_IN_MINORS
+
+    def release_older_than(self, age):
+        """
+        Releases every farm player past `age`. Returns the (batter ids,
+        pitcher ids) released.
+        """
+        self._reserve()
+        store = self.store
+        batter_ids = np.flatnonzero((self.batter_level != NOT_IN_MINORS)
+                                    & (store.batter_ages[:len(self.batter_level)] > age))
+        pitcher_ids = np.flatnonzero((self.pitcher_level != NOT_IN_MINORS)
+                                     & (store.pitcher_ages[:len(self.pitcher_level)] > age))
+        self.batter_level[batter_ids] = NOT_IN_MINORS
+        self.pitcher_level[pitcher_ids] = NOT_IN_MINORS
+        return batter_ids, pitcher_ids
+
+    def members(self):
+        """
+        Returns the ids of every (batter, pitcher) in a farm system.
+        """
+        self._reserve()
+        return np.flatnonzero(self.batter_level != NOT_IN_MINORS), np.flatnonzero(self.pitcher_level != NOT_IN_MINORS)
+
+    def level_of(self, player):
+        """
+        The player's level, or NOT_IN_MINORS.
+        """
+        self._reserve()
+        return int(self._arrays(player)[1][player.id])
+
+    def roster(self, team_index, level):
+        """
+        Returns (batters, pitchers) at one of an organization's clubs, best
+        overall rating first.
+        """
+        self._reserve()
+        batter_ids = self._members(self.batter_org, self.batter_level, team_index, level)
+        pitcher_ids = self._members(self.pitcher_org, self.pitcher_level, team_index, level)
+        batter_ids = batter_ids[np.argsort(-self._batter_overall(batter_ids), kind="stable")]
+        pitcher_ids = pitcher_ids[np.argsort(-self._pitcher_overall(pitcher_ids), kind="stable")]
+        return ([Batter.from_store(self.store, int(i)) for i in batter_ids],
+                [Pitcher.from_store(self.store, int(i)) for i in pitcher_ids])
+
+    @staticmethod
+    def _members(orgs, levels, team_index, level):
+        return np.flatnonzero((levels == level) & (orgs == team_index))
+
+    def _batter_overall(self, ids):
+        return self.store.batter_ratings[ids][:, CURRENT_COLUMNS].mean(axis=1)
+
+    def _pitcher_overall(self, ids):
+        return self.store.pitcher_ratings[ids].mean(axis=1)
+
+    def promote(self, player):
+        """
+        Moves a farm player up one level. AAA players go up with call_up().
+        """
+        level = self.level_of(player)
+        if level == NOT_IN_MINORS:
+            raise ValueError(f"{player.name} is not in a farm system")
+        if level == 0:
+            raise ValueError(f"{player.name} is already at {LEVELS[0]}; use call_up()")
+        self._arrays(player)[1][player.id] = level - 1
+
+    def demote(self, player):
+        level = self.level_of(player)
+        if level == NOT_IN_MINORS:
+            raise ValueError(f"{player.name} is not in a farm system")
+        if level == len(LEVELS) - 1:
+            raise ValueError(f"{player.name} is already at the lowest level")
+        self._arrays(player)[1][player.id] = level + 1
+
+    def call_up(self, player):
+        """
+        Moves a farm player onto their organization's major-league roster.
+        """
+        if self.level_of(player) == NOT_IN_MINORS:
+            raise ValueError(f"{player.name} is not in a farm system")
+        orgs, levels = self._arrays(player)
+        levels[player.id] = NOT_IN_MINORS
+        team = self.league.teams[int(orgs[player.id])]
+        team.draft_player(player)
+        return team
+
+    def send_down(self, team_index, player, level=0):
+        """
+        Takes `player` off league.teams[team_index]'s major-league roster and
+        puts them in its farm system at `level`.
+        """
+        team = self.league.teams[team_index]
+        roster = team.pitchers if isinstance(player, Pitcher) else team.batters
+        roster[:] = [member for member in roster if member.id != player.id]
+        team.roster_changed()
+        self.sign(team_index, player, level)
+
+    def reassign(self):
+        """
+        Re-sorts every farm by current overall rating: the best third of each
+        organization's batters and pitchers at AAA, the next at AA and the
+        rest at A.
+        """
+        self._reserve()
+        self._reassign(self.batter_org, self.batter_level, self._batter_overall)
+        self._reassign(self.pitcher_org, self.pitcher_level, self._pitcher_overall)
+
+    def _reassign(self, orgs, levels, overall):
+        ids = np.flatnonzero(levels != NOT_IN_MINORS)
+        if not len(ids):
+            return
+        ids = ids[np.lexsort((-overall(ids), orgs[ids]))]
+        org = orgs[ids].astype(np.int64)
+        sizes = np.bincount(org, minlength=len(self.league.teams))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        rank = np.arange(len(ids)) - starts[org]
+        levels[ids] = rank * len(LEVELS) // sizes[org]
+
+    def arrays(self):
+        """
+        The farm arrays by name, for saving, trimmed to the players in the
+        store and indexed by player id first.
+        """
+        self._reserve()
+        batters, pitchers = self.store.num_batters, self.store.num_pitchers
+        return {
+            "batter_org": self.batter_org[:batters], "batter_level": self.batter_level[:batters],
+            "batter_outcomes": self.batter_outcomes[:, :batters].swapaxes(0, 1),
+            "pitcher_org": self.pitcher_org[:pitchers], "pitcher_level": self.pitcher_level[:pitchers],
+            "pitcher_outcomes": self.pitcher_outcomes[:, :pitchers].swapaxes(0, 1),
+            "pitcher_runs": self.pitcher_runs[:, :pitchers].T,
+            "records": self.records,
+        }
+
+    def restore(self, arrays):
+        """
+        Loads arrays saved from arrays().
+        """
+        self.batter_org = arrays["batter_org"].copy()
+        self.batter_level = arrays["batter_level"].copy()
+        self.batter_outcomes = arrays["batter_outcomes"].swapaxes(0, 1).copy()
+        self.pitcher_org = arrays["pitcher_org"].copy()
+        self.pitcher_level = arrays["pitcher_level"].copy()
+        self.pitcher_outcomes = arrays["pitcher_outcomes"].swapaxes(0, 1).copy()
+        self.pitcher_runs = arrays["pitcher_runs"].T.copy()
+        self.records = arrays["records"].copy()
+        self._reserve()
+
+    # ---- Seasons ----
+
+    def reset_stats(self):
+        self.batter_outcomes[:] = 0
+        self.pitcher_outcomes[:] = 0
+        self.pitcher_runs[:] = 0
+        self.records[:] = 0
+
+    def play_season(self, rng=None):
+        """
+        Plays a full season at every level. Level n draws from
+        rng.spawn("minors", LEVELS[n]).
+        """
+        rng = make_rng(rng)
+        self._reserve()
+        for level, name in enumerate(LEVELS):
+            self.play_level(level, rng.spawn("minors", name))
+
+    def play_level(self, level, rng=None):
+        """
+        Plays one level's schedule and adds its results to the level's stats
+        and records. Every organization needs a batter and a pitcher there.
+        """
+        rng = make_rng(rng)
+        self._reserve()
+        teams = len(self.league.teams)
+        lineups = np.zeros((teams, LINEUP_SIZE), dtype=np.int64)
+        staffs = np.zeros((teams, PITCHING_STAFF), dtype=np.int64)
+        staff_sizes = np.zeros(teams, dtype=np.int64)
+        batter_ids, pitcher_ids = [], []
+        for team_index in range(teams):
+            batters, pitchers = self.roster(team_index, level)
+            if not batters or not pitchers:
+                raise ValueError(f"{self.league.teams[team_index].name} has no {LEVELS[level]} "
+                                 f"{'batters' if not batters else 'pitchers'}")
+            batters = batters[:LINEUP_SIZE]
+            pitchers = pitchers[:PITCHING_STAFF]
+            lineups[team_index] = len(batter_ids) + np.arange(LINEUP_SIZE) % len(batters)
+            staffs[team_index, :len(pitchers)] = len(pitcher_ids) + np.arange(len(pitchers))
+            staff_sizes[team_index] = len(pitchers)
+            batter_ids += [batter.id for batter in batters]
+            pitcher_ids += [pitcher.id for pitcher in pitchers]
+
+        cdfs = np.cumsum(matchup_probabilities([Batter.from_store(self.store, i) for i in batter_ids],
+                                               [Pitcher.from_store(self.store, i) for i in pitcher_ids]),
+                         axis=-1)[..., :-1]
+        schedule = generate_schedule(teams, LEVEL_GAMES[LEVELS[level]], rng.spawn("schedule"))
+        home = schedule.home.astype(np.int64)
+        away = schedule.away.astype(np.int64)
+        home_runs, away_runs, batting, pitching, runs = play_games(cdfs, lineups, staffs, staff_sizes, home, away,
+                                                                   rng.generator)
+
+        self.batter_outcomes[level, batter_ids] += batting
+        self.pitcher_outcomes[level, pitcher_ids] += pitching
+        self.pitcher_runs[level, pitcher_ids] += runs
+        home_won = home_runs > away_runs
+        records = self.records[level]
+        records[:, 0] += np.bincount(np.where(home_won, home, away), minlength=teams).astype(np.int32)
+        records[:, 1] += np.bincount(np.where(home_won, away, home), minlength=teams).astype(np.int32)
+
+    # ---- Stats ----
+
+    def batting_lines(self, level):
+        """
+        Returns (batters, counting totals, rates) for everyone who batted at
+        `level` this season, with columns as in BATTER_COUNTING and BATTER_RATES.
+        """
+        outcomes = self.batter_outcomes[level]
+        ids = np.flatnonzero(outcomes.sum(axis=1))
+        return ([Batter.from_store(self.store, int(i)) for i in ids], outcomes[ids] @ BATTER_COUNTING_MATRIX,
+                batting_rates(outcomes[ids]))
+
+    def pitching_lines(self, level):
+        outcomes = self.pitcher_outcomes[level]
+        ids = np.flatnonzero(outcomes.sum(axis=1))
+        return ([Pitcher.from_store(self.store, int(i)) for i in ids], outcomes[ids] @ PITCHER_COUNTING_MATRIX,
+                pitching_rates(outcomes[ids], self.pitcher_runs[level, ids]))
+
+    def standings(self, level):
+        """
+        Returns [(team name, wins, losses)] for one level, best record first.
+        """
+        records = self.records[level]
+        order = np.lexsort((records[:, 1], -records[:, 0]))
+        return [(self.league.teams[i].name, int(records[i, 0]), int(records[i, 1])) for i in order.tolist()]
+
+
+def play_games(cdfs, lineups, staffs, staff_sizes, home, away, generator, innings=9):
+    """
+    Plays every game of home[i] against away[i] at once. `cdfs[b, p]` are
+    the cumulative outcome probabilities of batter row b against pitcher
+    row p, lineups[team] the team's nine batter rows in order and
+    staffs[team, :staff_sizes[team]] its pitcher rows in rotation.
+
+    Returns (home runs, away runs, batter outcome counts, pitcher outcome
+    counts, pitcher runs allowed), the counts indexed by row.
+    """
+    games = len(home)
+    # Offense 2g is game g's away team batting, 2g + 1 its home team
+    batting = np.empty(2 * games, dtype=np.int64)
+    batting[0::2], batting[1::2] = away, home
+    fielding = np.empty(2 * games, dtype=np.int64)
+    fielding[0::2], fielding[1::2] = home, away
+    batter_slot = np.zeros(2 * games, dtype=np.int64)
+    pitcher_slot = np.zeros(2 * games, dtype=np.int64)
+    score = np.zeros(2 * games, dtype=np.int64)
+    batter_rows, pitcher_rows, outcomes, runs_allowed = [], [], [], []
+
+    active = np.ones(games, dtype=bool)
+    inning = 0
+    while active.any():
+        inning += 1
+        offenses = np.flatnonzero(np.repeat(active, 2))
+        state = np.zeros(len(offenses), dtype=np.int64)
+        while len(offenses):
+            batter = lineups[batting[offenses], batter_slot[offenses]]
+            staff = fielding[offenses]
+            pitcher = staffs[staff, pitcher_slot[offenses] % staff_sizes[staff]]
+            uniforms = generator.random(len(offenses))
+            result = (uniforms[:, None] >= cdfs[batter, pitcher]).sum(axis=1)
+            transition = state * NUM_OUTCOMES + result
+            runs = _RUNS_SCORED[transition]
+            score[offenses] += runs
+            batter_rows.append(batter)
+            pitcher_rows.append(pitcher)
+            outcomes.append(result)
+            runs_allowed.append(runs)
+            batter_slot[offenses] = (batter_slot[offenses] + 1) % LINEUP_SIZE
+            pitcher_slot[offenses] += 1
+            state = _NEXT_STATE[transition]
+            batting_on = state != INNING_OVER
+            offenses, state = offenses[batting_on], state[batting_on]
+        if inning >= innings:
+            active &= score[0::2] == score[1::2]
+
+    batter_rows = np.concatenate(batter_rows)
+    pitcher_rows = np.concatenate(pitcher_rows)
+    outcomes = np.concatenate(outcomes)
+    num_batters, num_pitchers = cdfs.shape[:2]
+    batting_counts = np.bincount(batter_rows * NUM_OUTCOMES + outcomes, minlength=num_batters * NUM_OUTCOMES)
+    pitching_counts = np.bincount(pitcher_rows * NUM_OUTCOMES + outcomes, minlength=num_pitchers * NUM_OUTCOMES)
+    runs = np.bincount(pitcher_rows, weights=np.concatenate(runs_allowed), minlength=num_pitchers)
+    return (score[1::2], score[0::2], batting_counts.reshape(num_batters, NUM_OUTCOMES),
+            pitching_counts.reshape(num_pitchers, NUM_OUTCOMES), runs.astype(np.int64))
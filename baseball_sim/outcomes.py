@@ -0,0 +1,12 @@
+"""
+Plate-appearance outcome codes shared by the sampler, the base-out table and
+the roster store. Probability vectors and count arrays use this order.
+"""
+OUT = 0
+WALK = 1
+SINGLE = 2
+DOUBLE = 3
+TRIPLE = 4
+HOME_RUN = 5
+OUTCOMES = ["out", "walk", "single", "double", "triple", "home_run"]
+NUM_OUTCOMES = len(OUTCOMES)
@@ -0,0 +1,83 @@
+"""
+Monte Carlo season projections.
+
+Seasons are split into chunks and fanned out over a ProcessPoolExecutor.
+Season n always runs on the stream spawn("season", n) of one root SimRandom,
+so the same seed gives the same projection whatever the worker count or
+chunking. Each worker returns raw win totals and playoff/title counts, and
+the parent merges them into per-team distributions.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .rng import make_rng
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+_worker_league = None
+
+
+def _init_worker(league):
+    global _worker_league
+    _worker_league = league
+
+
+def _run_chunk(rng, season_numbers):
+    return simulate_seasons(_worker_league, season_numbers, rng)
+
+
+def simulate_seasons(league, season_numbers, rng):
+    """
+    Plays the given seasons plus playoffs in this process and returns
+    (wins, playoffs, titles): a (seasons, teams) array of win totals and
+    per-team counts of playoff berths and championships.
+    """
+    index = {id(team): i for i, team in enumerate(league.teams)}
+    wins = np.zeros((len(season_numbers), len(league.teams)), dtype=np.int16)
+    playoffs = np.zeros(len(league.teams), dtype=np.int64)
+    titles = np.zeros(len(league.teams), dtype=np.int64)
+    for row, season in enumerate(season_numbers):
+        season_rng = rng.spawn("season", season)
+        league.play_season(season_rng)
+        wins[row] = [team.wins for team in league.teams]
+        for team in league.playoffs():
+            playoffs[index[id(team)]] += 1
+        titles[index[id(league.play_playoffs(season_rng.spawn("playoffs")))]] += 1
+    return wins, playoffs, titles
+
+
+def project_seasons(league, seasons, seed=None, workers=None, chunks_per_worker=4):
+    """
+    Simulates `seasons` seasons of `league` across every core and returns a
+    dict keyed by team name with mean wins, win percentiles, and playoff and
+    championship probabilities. `seed` may be an int or a SimRandom.
+    """
+    if seasons < 1:
+        raise ValueError(f"Projecting needs at least one season, not {seasons}")
+    workers = workers or os.cpu_count() or 1
+    rng = make_rng(seed)
+    if league.schedule is None:
+        league.generate_schedule(rng.spawn("schedule"))
+
+    chunk_count = min(seasons, workers * chunks_per_worker)
+    chunks = [range(i, seasons, chunk_count) for i in range(chunk_count)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(league,)) as pool:
+        results = list(pool.map(_run_chunk, [rng] * chunk_count, chunks))
+
+    wins = np.concatenate([result[0] for result in results])
+    playoffs = sum(result[1] for result in results)
+    titles = sum(result[2] for result in results)
+    win_percentiles = np.percentile(wins, PERCENTILES, axis=0)
+
+    projections = {}
+    for i, team in enumerate(league.teams):
+        projections[team.name] = {
+            "mean_wins": float(wins[:, i].mean()),
+            "win_percentiles": {p: float(value) for p, value in zip(PERCENTILES, win_percentiles[:, i])},
+            "playoff_probability": float(playoffs[i] / seasons),
+            "championship_probability": float(titles[i] / seasons),
+        }
+    return projections
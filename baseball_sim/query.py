@@ -0,0 +1,287 @@
+"""
+Filtered, sorted player lists for leaderboards and roster screens.
+
+A StatIndex covers every batter (or every pitcher) in a RosterStore. Each
+column a list has been sorted by keeps a sorted index: the player ids in
+order of that column's value, alongside the sorted values. Indexes are
+built on first use and then kept up to date incrementally: the store
+records the id of every player added or changed since the index last
+looked (see RosterStore.track_changes), and refresh() takes only those
+players out of every index and merges them back in at their new places
+with a binary search. A refresh after a game touches the two dozen
+players in it, however many players there are.
+
+A PlayerQuery filters by position, team, age and minimum plate
+appearances, then walks one sorted index and keeps the matching ids. A
+top-N leaderboard over thousands of players is a mask and a slice, with
+no Python-level sort. Positions and each player's team are cached on the
+index, the teams until one of their rosters changes.
+
+    query = PlayerQuery(index, league.teams).where(position="SS", min_pa=300)
+    leaders = query.order_by("on_base_plus_slugging").top(10)
+"""
+import weakref
+
+import numpy as np
+
+from .engine import CURRENT_COLUMNS, POTENTIAL_COLUMNS, Batter, Pitcher
+from .outcomes import OUT
+from .roster_store import (BATTER_COUNTING, BATTER_COUNTING_MATRIX, BATTER_RATES, BATTER_RATINGS,
+                           PITCHER_COUNTING, PITCHER_COUNTING_MATRIX, PITCHER_RATES, PITCHER_RATINGS,
+                           batting_rates, pitching_rates)
+
+# Team index of a player on none of the query's teams
+NO_TEAM = -1
+
+
+def _batter_columns():
+    columns = {
+        "name": lambda store, ids: np.array([store.batter_names[i] for i in ids.tolist()], dtype=str),
+        "position": lambda store, ids: np.array([store.batter_positions[i] for i in ids.tolist()], dtype=str),
+        "age": lambda store, ids: store.batter_ages[ids],
+        "overall": lambda store, ids: store.batter_ratings[ids][:, CURRENT_COLUMNS].mean(axis=1),
+        "potential": lambda store, ids: store.batter_ratings[ids][:, POTENTIAL_COLUMNS].mean(axis=1),
+    }
+    for column, key in enumerate(BATTER_RATINGS):
+        columns[key] = lambda store, ids, column=column: store.batter_ratings[ids, column]
+    for column, key in enumerate(BATTER_COUNTING):
+        columns[key] = lambda store, ids, column=column: store.batter_outcomes[ids] @ BATTER_COUNTING_MATRIX[:, column]
+    for column, key in enumerate(BATTER_RATES):
+        columns[key] = lambda store, ids, column=column: batting_rates(store.batter_outcomes[ids])[:, column]
+    return columns
+
+
+def _pitcher_columns():
+    columns = {
+        "name": lambda store, ids: np.array([store.pitcher_names[i] for i in ids.tolist()], dtype=str),
+        "position": lambda store, ids: np.array([store.pitcher_positions[i] for i in ids.tolist()], dtype=str),
+        "age": lambda store, ids: store.pitcher_ages[ids],
+        "overall": lambda store, ids: store.pitcher_ratings[ids].mean(axis=1),
+        "Runs Allowed": lambda store, ids: store.pitcher_runs[ids],
+        "Innings Pitched": lambda store, ids: store.pitcher_outcomes[ids, OUT] / 3,
+    }
+    for column, key in enumerate(PITCHER_RATINGS):
+        columns[key] = lambda store, ids, column=column: store.pitcher_ratings[ids, column]
+    for column, key in enumerate(PITCHER_COUNTING):
+        columns[key] = lambda store, ids, column=column: store.pitcher_outcomes[ids] @ PITCHER_COUNTING_MATRIX[:, column]
+    for column, key in enumerate(PITCHER_RATES):
+        columns[key] = lambda store, ids, column=column: pitching_rates(store.pitcher_outcomes[ids],
+                                                                        store.pitcher_runs[ids])[:, column]
+    return columns
+
+
+BATTER_COLUMNS = _batter_columns()
+PITCHER_COLUMNS = _pitcher_columns()
+
+
+class StatIndex:
+    """
+    Sorted per-column indexes over every batter in `store`, or every pitcher
+    with pitchers=True. Column names are those of BATTER_COLUMNS or
+    PITCHER_COLUMNS: ratings, counting stats and rates as the store names
+    them, plus name, position, age, overall and (for batters) potential.
+    """
+    def __init__(self, store, pitchers=False):
+        self.store = store
+        self.pitchers = pitchers
+        self.columns = PITCHER_COLUMNS if pitchers else BATTER_COLUMNS
+        self.player_class = Pitcher if pitchers else Batter
+        # column -> (ids in ascending order of value, those values)
+        self.indexes = {}
+        # Ids the store has added or changed since the last refresh
+        self.changes = store.track_changes(pitchers)
+        weakref.finalize(self, store.stop_tracking, self.changes)
+        self._positions = np.zeros(0, dtype=str)
+        self._team_key = None
+        self._team_of = None
+
+    def __len__(self):
+        return self.store.num_pitchers if self.pitchers else self.store.num_batters
+
+    def refresh(self):
+        """
+        Brings every built index up to date with the store and returns the
+        ids that changed since the last refresh.
+        """
+        if not self.changes:
+            return np.zeros(0, dtype=np.int64)
+        changed = np.fromiter(self.changes, dtype=np.int64, count=len(self.changes))
+        self.changes.clear()
+        changed.sort()
+        for column in self.indexes:
+            self._update(column, changed)
+        return changed
+
+    def _update(self, column, changed):
+        ids, values = self.indexes[column]
+        keep = ~np.isin(ids, changed)
+        ids, values = ids[keep], values[keep]
+        new_values = self.values(column, changed)
+        order = np.argsort(new_values, kind="stable")
+        new_ids, new_values = changed[order], new_values[order]
+        # Final positions of the changed players; everyone else fills the gaps in order
+        places = np.searchsorted(values, new_values, side="right") + np.arange(len(changed))
+        others = np.ones(len(ids) + len(changed), dtype=bool)
+        others[places] = False
+        merged_ids = np.empty(len(others), dtype=np.int64)
+        merged_values = np.empty(len(others), dtype=np.result_type(values, new_values))
+        merged_ids[places], merged_ids[others] = new_ids, ids
+        merged_values[places], merged_values[others] = new_values, values
+        self.indexes[column] = (merged_ids, merged_values)
+
+    def values(self, column, ids):
+        """
+        The column's current values for `ids`, computed from the store.
+        """
+        if column not in self.columns:
+            raise KeyError(f"No column named {column!r}")
+        return np.asarray(self.columns[column](self.store, np.asarray(ids, dtype=np.int64)))
+
+    def sorted_ids(self, column):
+        """
+        Every player id in ascending order of `column`, building the index
+        the first time the column is asked for.
+        """
+        self.refresh()
+        if column not in self.indexes:
+            ids = np.arange(len(self), dtype=np.int64)
+            values = self.values(column, ids)
+            order = np.argsort(values, kind="stable")
+            self.indexes[column] = (ids[order], values[order])
+        return self.indexes[column][0]
+
+    def positions(self):
+        """
+        Every player's position, by id. Positions never change, so only
+        players added since the last call are looked up.
+        """
+        seen = len(self._positions)
+        if seen < len(self):
+            added = self.values("position", np.arange(seen, len(self), dtype=np.int64))
+            self._positions = np.concatenate([self._positions, added])
+        return self._positions
+
+    def team_of(self, teams):
+        """
+        Each player id's position in `teams`, or NO_TEAM. The array is
+        rebuilt only when the teams, one of their roster_versions or the
+        number of players has changed.
+        """
+        key = (tuple(teams), tuple(team.roster_version for team in teams), len(self))
+        if key != self._team_key:
+            team_of = np.full(len(self), NO_TEAM, dtype=np.int64)
+            for team_index, team in enumerate(teams):
+                roster = team.pitchers if self.pitchers else team.batters
+                team_of[[player.id for player in roster]] = team_index
+            self._team_key, self._team_of = key, team_of
+        return self._team_of
+
+    def player(self, player_id):
+        return self.player_class.from_store(self.store, int(player_id))
+
+
+class PlayerQuery:
+    """
+    A filtered, ordered view of a StatIndex. where() and order_by() return
+    new queries, so a screen can keep a base query and re-sort it. With
+    `teams`, only players on those rosters are included and the team
+    filter takes a team or a list of them.
+    """
+    def __init__(self, index, teams=None, filters=(), column=None, descending=True):
+        self.index = index
+        self.teams = teams
+        self.filters = tuple(filters)
+        self.column = column
+        self.descending = descending
+
+    def where(self, position=None, team=None, min_age=None, max_age=None, min_pa=None):
+        """
+        Narrows the query. `position` and `team` may be single values or
+        lists; `min_pa` counts batters faced for pitchers.
+        """
+        if team is not None and self.teams is None:
+            raise ValueError("Filtering by team needs a query made with teams")
+        filters = []
+        if position is not None:
+            filters.append(("position", _as_list(position)))
+        if team is not None:
+            filters.append(("team", _as_list(team)))
+        if min_age is not None:
+            filters.append(("min_age", min_age))
+        if max_age is not None:
+            filters.append(("max_age", max_age))
+        if min_pa is not None:
+            filters.append(("min_pa", min_pa))
+        return PlayerQuery(self.index, self.teams, self.filters + tuple(filters), self.column, self.descending)
+
+    def order_by(self, column, descending=True):
+        if column not in self.index.columns:
+            raise KeyError(f"No column named {column!r}")
+        return PlayerQuery(self.index, self.teams, self.filters, column, descending)
+
+    def _mask(self):
+        index, store = self.index, self.index.store
+        count = len(index)
+        mask = np.ones(count, dtype=bool)
+        ages = store.pitcher_ages if index.pitchers else store.batter_ages
+        if self.teams is not None:
+            team_of = index.team_of(self.teams)
+            mask &= team_of != NO_TEAM
+        for name, value in self.filters:
+            if name == "position":
+                mask &= np.isin(index.positions(), value)
+            elif name == "team":
+                wanted = [next(i for i, team in enumerate(self.teams) if team is member) for member in value]
+                mask &= np.isin(team_of, wanted)
+            elif name == "min_age":
+                mask &= ages[:count] >= value
+            elif name == "max_age":
+                mask &= ages[:count] <= value
+            elif name == "min_pa":
+                outcomes = store.pitcher_outcomes if index.pitchers else store.batter_outcomes
+                mask &= outcomes[:count].sum(axis=1) >= value
+        return mask
+
+    def ids(self, limit=None):
+        """
+        Matching player ids in query order, at most `limit` of them.
+        """
+        if self.column is None:
+            self.index.refresh()
+            ids = np.arange(len(self.index), dtype=np.int64)
+        else:
+            ids = self.index.sorted_ids(self.column)
+            if self.descending:
+                ids = ids[::-1]
+        ids = ids[self._mask()[ids]]
+        return ids if limit is None else ids[:limit]
+
+    def players(self, limit=None):
+        return [self.index.player(player_id) for player_id in self.ids(limit).tolist()]
+
+    def top(self, count=10):
+        """
+        Returns [(player, value), ...] for the first `count` matches of an
+        ordered query.
+        """
+        if self.column is None:
+            raise ValueError("top() needs a column; call order_by() first")
+        ids = self.ids(count)
+        values = self.index.values(self.column, ids).tolist()
+        return [(self.index.player(player_id), value) for player_id, value in zip(ids.tolist(), values)]
+
+    def table(self, columns, limit=None):
+        """
+        Rows of the given columns' values for the matches, in query order,
+        ready for a table screen.
+        """
+        ids = self.ids(limit)
+        values = [self.index.values(column, ids).tolist() for column in columns]
+        return [list(row) for row in zip(*values)]
+
+    def __len__(self):
+        return int(self._mask().sum())
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
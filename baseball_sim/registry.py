@@ -0,0 +1,76 @@
+"""
+A registry of the league's teams, built lazily and looked up by id.
+
+Teams are registered with a short id, their display name and a factory
+that builds them. Nothing is built until a team is first asked for; after
+that the same Team object is returned every time, so a roster keeps its
+ratings and stats from screen to screen instead of being re-rolled.
+"""
+
+
+class TeamRegistry:
+    def __init__(self):
+        self._factories = {}
+        self._names = {}
+        self._teams = {}
+        self._ids_by_name = {}
+        self._ids_by_object = {}
+
+    def register(self, team_id, name, factory):
+        """
+        Adds a team. `factory()` must return a Team; it is called at most once.
+        """
+        if team_id in self._factories:
+            raise ValueError(f"Team id {team_id!r} is already registered")
+        self._factories[team_id] = factory
+        self._names[team_id] = name
+        self._ids_by_name[name] = team_id
+
+    def __contains__(self, team_id):
+        return team_id in self._factories
+
+    def __len__(self):
+        return len(self._factories)
+
+    def ids(self):
+        return list(self._factories)
+
+    def name(self, team_id):
+        """
+        The team's display name, without building it.
+        """
+        return self._names[team_id]
+
+    def get(self, team_id):
+        """
+        Returns the team, building it on first use.
+        """
+        team = self._teams.get(team_id)
+        if team is None:
+            team = self._teams[team_id] = self._factories[team_id]()
+            self._ids_by_object[id(team)] = team_id
+        return team
+
+    def by_name(self, name):
+        return self.get(self._ids_by_name[name])
+
+    def id_of(self, team):
+        """
+        Returns the id a built team was registered under.
+        """
+        return self._ids_by_object[id(team)]
+
+    def is_built(self, team_id):
+        return team_id in self._teams
+
+    def teams(self):
+        """
+        Every team, building any that have not been built yet.
+        """
+        return [self.get(team_id) for team_id in self._factories]
+
+    def opponents(self, team_id):
+        """
+        Every team except `team_id`.
+        """
+        return [self.get(other) for other in self._factories if other != team_id]
@@ -0,0 +1,51 @@
+"""
+Seeded, splittable random streams for the simulators.
+
+A SimRandom is a random.Random (for rating rolls, schedule picks and other
+Python-side choices) that also carries a NumPy Generator for the vectorized
+samplers. Both come from one SeedSequence, and spawn() derives a child
+stream from a key path such as ("season", 12, "game", 340). The stream a
+game sees depends only on the root seed and its key, never on which worker
+ran it or in what order, so parallel runs reproduce serial ones exactly.
+"""
+import random
+import zlib
+
+import numpy as np
+
+
+def _key_part(part):
+    # Strings are hashed with crc32 because hash() changes between processes
+    return zlib.crc32(part.encode()) if isinstance(part, str) else int(part)
+
+
+class SimRandom(random.Random):
+    def __init__(self, seed=None, key=()):
+        self.key = tuple(_key_part(part) for part in key)
+        self.seed_sequence = np.random.SeedSequence(seed, spawn_key=self.key)
+        # Keep the entropy actually used so an unseeded run can be replayed
+        self.root_seed = self.seed_sequence.entropy
+        self.generator = np.random.default_rng(self.seed_sequence)
+        super().__init__(int(self.seed_sequence.generate_state(1, np.uint64)[0]))
+
+    def spawn(self, *key):
+        """
+        Returns the independent child stream for `key` below this one.
+        """
+        return SimRandom(self.root_seed, self.key + tuple(_key_part(part) for part in key))
+
+    def __reduce__(self):
+        return self.__class__, (self.root_seed, self.key), (self.getstate(), self.generator.bit_generator.state)
+
+    def __setstate__(self, state):
+        python_state, numpy_state = state
+        self.setstate(python_state)
+        self.generator.bit_generator.state = numpy_state
+
+
+def make_rng(seed=None):
+    """
+    Returns `seed` unchanged if it is already a SimRandom, otherwise a new
+    root SimRandom seeded with it.
+    """
+    return seed if isinstance(seed, SimRandom) else SimRandom(seed)
@@ -0,0 +1,376 @@
+"""
+Struct-of-arrays storage for every batter and pitcher in a league.
+
+Ratings live in int16 arrays and results in int32 outcome-count arrays, one
+row per player id. Batter and Pitcher objects are thin __slots__ views that
+only hold (store, id), and their `attributes` and `stats` mappings read and
+write these arrays directly. Counting stats are not stored separately: hits,
+at-bats, walks and so on are sums of the outcome columns, so a plate
+appearance is a single array increment and league-wide totals are a single
+matrix product.
+
+Rate stats (AVG/OBP/SLG/OPS, ERA/WHIP) are derived lazily. Recording a result
+only marks the player dirty; a rate is recomputed the first time it is read
+after that, and refresh_rates() brings every dirty row up to date in one
+vectorized pass before a leaderboard is drawn.
+
+Indexes that need to know which players changed since they last looked
+call track_changes() for a set of ids. New players and rating or age
+changes add the player's id to each such set right away; results are
+reported once per game, when the Game marks everyone who played, so a plate
+appearance never touches the trackers.
+"""
+from collections.abc import MutableMapping, Mapping
+
+import numpy as np
+
+from .outcomes import OUT, WALK, SINGLE, DOUBLE, TRIPLE, HOME_RUN, NUM_OUTCOMES
+
+BATTER_RATINGS = ["speed", "framing", "blocking", "arm", "range", "arm_strength", "power", "contact",
+                  "eye", "gap_power", "triple", "framing_pot", "blocking_pot", "arm_pot", "range_pot",
+                  "arm_strength_pot", "power_pot", "contact_pot", "eye_pot", "gap_power_pot", "triple_pot"]
+PITCHER_RATINGS = ["velocity", "stuff", "movement", "control", "stamina"]
+# Rating name -> column of batter_ratings / pitcher_ratings
+BATTER_RATING_COLUMNS = {key: column for column, key in enumerate(BATTER_RATINGS)}
+PITCHER_RATING_COLUMNS = {key: column for column, key in enumerate(PITCHER_RATINGS)}
+
+HITS = (SINGLE, DOUBLE, TRIPLE, HOME_RUN)
+
+# Counting stat -> outcome columns it sums
+BATTER_COUNTING = {
+    "hits": HITS,
+    "at_bats": (OUT,) + HITS,
+    "plate_appearances": (OUT, WALK) + HITS,
+    "home_runs": (HOME_RUN,),
+    "triples": (TRIPLE,),
+    "doubles": (DOUBLE,),
+    "walks": (WALK,),
+}
+PITCHER_COUNTING = {
+    "Hits Allowed": HITS,
+    "Walks Allowed": (WALK,),
+    "Home Runs Allowed": (HOME_RUN,),
+    "Batters Faced": (OUT, WALK) + HITS,
+    "Strikeouts": (OUT,),
+}
+BATTER_RATES = ["total_bases", "batting_average", "on_base_percentage", "slugging_percentage",
+                "on_base_plus_slugging"]
+PITCHER_RATES = ["ERA", "WHIP"]
+
+
+def counting_matrix(counting):
+    """
+    Returns a (NUM_OUTCOMES, len(counting)) 0/1 matrix so that
+    outcome_counts @ matrix gives every counting stat at once.
+    """
+    matrix = np.zeros((NUM_OUTCOMES, len(counting)), dtype=np.int32)
+    for column, outcomes in enumerate(counting.values()):
+        matrix[list(outcomes), column] = 1
+    return matrix
+
+
+BATTER_COUNTING_MATRIX = counting_matrix(BATTER_COUNTING)
+PITCHER_COUNTING_MATRIX = counting_matrix(PITCHER_COUNTING)
+
+
+def _ratio(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def batting_rates(outcomes):
+    """
+    Returns BATTER_RATES columns for an (n, NUM_OUTCOMES) array of outcome counts.
+    """
+    outcomes = np.atleast_2d(outcomes)
+    plate_appearances = outcomes.sum(axis=1)
+    walks = outcomes[:, WALK]
+    at_bats = plate_appearances - walks
+    hits = outcomes[:, list(HITS)].sum(axis=1)
+    total_bases = outcomes[:, list(HITS)] @ np.array([1, 2, 3, 4])
+    on_base = _ratio(hits + walks, plate_appearances)
+    slugging = _ratio(total_bases, at_bats)
+    return np.stack([total_bases, _ratio(hits, at_bats), on_base, slugging, on_base + slugging], axis=1)
+
+
+def pitching_rates(outcomes, runs):
+    """
+    Returns PITCHER_RATES columns (ERA per nine innings, WHIP) for outcome
+    counts and runs allowed.
+    """
+    outcomes = np.atleast_2d(outcomes)
+    innings_pitched = outcomes[:, OUT] / 3
+    hits_and_walks = outcomes[:, list(HITS)].sum(axis=1) + outcomes[:, WALK]
+    return np.stack([_ratio(9 * np.atleast_1d(runs), innings_pitched), _ratio(hits_and_walks, innings_pitched)], axis=1)
+
+
+def _grown(array, rows):
+    capacity = max(rows, 2 * len(array))
+    bigger = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    bigger[:len(array)] = array
+    return bigger
+
+
+class RosterStore:
+    """
+    Column arrays for every player in a league, indexed by player id.
+    Batters and pitchers have separate id spaces.
+    """
+    def __init__(self, capacity=64):
+        self.batter_names = []
+        self.batter_positions = []
+        self.batter_ratings = np.zeros((capacity, len(BATTER_RATINGS)), dtype=np.int16)
+        self.batter_ages = np.zeros(capacity, dtype=np.int8)
+        self.batter_outcomes = np.zeros((capacity, NUM_OUTCOMES), dtype=np.int32)
+        self.batter_rates = np.zeros((capacity, len(BATTER_RATES)), dtype=np.float64)
+        self.dirty_batters = set()
+
+        self.pitcher_names = []
+        self.pitcher_positions = []
+        self.pitcher_ratings = np.zeros((capacity, len(PITCHER_RATINGS)), dtype=np.int16)
+        self.pitcher_ages = np.zeros(capacity, dtype=np.int8)
+        self.pitcher_outcomes = np.zeros((capacity, NUM_OUTCOMES), dtype=np.int32)
+        self.pitcher_runs = np.zeros(capacity, dtype=np.int32)
+        self.pitcher_rates = np.zeros((capacity, len(PITCHER_RATES)), dtype=np.float64)
+        self.dirty_pitchers = set()
+        # Bumped on every recorded result; aggregate caches compare against it
+        self.version = 0
+        # Bumped whenever a rating changes; matchup caches compare against it
+        self.ratings_version = 0
+        self._aggregates = {}
+        # Sets handed out by track_changes()
+        self.batter_trackers = []
+        self.pitcher_trackers = []
+
+    @property
+    def num_batters(self):
+        return len(self.batter_names)
+
+    @property
+    def num_pitchers(self):
+        return len(self.pitcher_names)
+
+    def add_batter(self, name, position, ratings, age=0):
+        batter_id = self.num_batters
+        if batter_id == len(self.batter_ratings):
+            self.batter_ratings = _grown(self.batter_ratings, batter_id + 1)
+            self.batter_ages = _grown(self.batter_ages, batter_id + 1)
+            self.batter_outcomes = _grown(self.batter_outcomes, batter_id + 1)
+            self.batter_rates = _grown(self.batter_rates, batter_id + 1)
+        self.batter_names.append(name)
+        self.batter_positions.append(position)
+        self.batter_ratings[batter_id] = ratings
+        self.batter_ages[batter_id] = age
+        for changes in self.batter_trackers:
+            changes.add(batter_id)
+        return batter_id
+
+    def add_pitcher(self, name, position, ratings, age=0):
+        pitcher_id = self.num_pitchers
+        if pitcher_id == len(self.pitcher_ratings):
+            self.pitcher_ratings = _grown(self.pitcher_ratings, pitcher_id + 1)
+            self.pitcher_ages = _grown(self.pitcher_ages, pitcher_id + 1)
+            self.pitcher_outcomes = _grown(self.pitcher_outcomes, pitcher_id + 1)
+            self.pitcher_runs = _grown(self.pitcher_runs, pitcher_id + 1)
+            self.pitcher_rates = _grown(self.pitcher_rates, pitcher_id + 1)
+        self.pitcher_names.append(name)
+        self.pitcher_positions.append(position)
+        self.pitcher_ratings[pitcher_id] = ratings
+        self.pitcher_ages[pitcher_id] = age
+        for changes in self.pitcher_trackers:
+            changes.add(pitcher_id)
+        return pitcher_id
+
+    def record_batting(self, batter_id, outcome):
+        self.batter_outcomes[batter_id, outcome] += 1
+        self.dirty_batters.add(batter_id)
+        self.version += 1
+
+    def record_pitching(self, pitcher_id, outcome):
+        self.pitcher_outcomes[pitcher_id, outcome] += 1
+        self.dirty_pitchers.add(pitcher_id)
+        self.version += 1
+
+    def record_runs_allowed(self, pitcher_id, runs):
+        self.pitcher_runs[pitcher_id] += runs
+        self.dirty_pitchers.add(pitcher_id)
+        self.version += 1
+
+    def track_changes(self, pitchers=False):
+        """
+        Returns a set that the id of every batter (or pitcher) added or
+        changed from now on is put into; players in a game are put in when
+        it ends. The caller drains it as it catches up and hands it back to
+        stop_tracking() when done.
+        """
+        changes = set()
+        (self.pitcher_trackers if pitchers else self.batter_trackers).append(changes)
+        return changes
+
+    def stop_tracking(self, changes):
+        for trackers in (self.batter_trackers, self.pitcher_trackers):
+            trackers[:] = [tracked for tracked in trackers if tracked is not changes]
+
+    def mark_changed(self, batter_ids=(), pitcher_ids=()):
+        """
+        Records changes made by writing the arrays directly, and the results
+        of a finished game.
+        """
+        for changes in self.batter_trackers:
+            changes.update(batter_ids)
+        for changes in self.pitcher_trackers:
+            changes.update(pitcher_ids)
+
+    def batter_rate(self, batter_id, column):
+        if batter_id in self.dirty_batters:
+            self.batter_rates[batter_id] = batting_rates(self.batter_outcomes[batter_id])[0]
+            self.dirty_batters.discard(batter_id)
+        return float(self.batter_rates[batter_id, column])
+
+    def pitcher_rate(self, pitcher_id, column):
+        if pitcher_id in self.dirty_pitchers:
+            self.pitcher_rates[pitcher_id] = pitching_rates(self.pitcher_outcomes[pitcher_id],
+                                                            self.pitcher_runs[pitcher_id])[0]
+            self.dirty_pitchers.discard(pitcher_id)
+        return float(self.pitcher_rates[pitcher_id, column])
+
+    def refresh_rates(self):
+        """
+        Recomputes every dirty row at once. Call before reading many players'
+        rates, e.g. when drawing a leaderboard.
+        """
+        if self.dirty_batters:
+            ids = np.fromiter(self.dirty_batters, dtype=np.int64)
+            self.batter_rates[ids] = batting_rates(self.batter_outcomes[ids])
+            self.dirty_batters.clear()
+        if self.dirty_pitchers:
+            ids = np.fromiter(self.dirty_pitchers, dtype=np.int64)
+            self.pitcher_rates[ids] = pitching_rates(self.pitcher_outcomes[ids], self.pitcher_runs[ids])
+            self.dirty_pitchers.clear()
+
+    def cached(self, key, compute):
+        """
+        Returns compute() for `key`, reusing the last value until a new result
+        is recorded in this store.
+        """
+        version, value = self._aggregates.get(key, (None, None))
+        if version != self.version:
+            value = compute()
+            self._aggregates[key] = (self.version, value)
+        return value
+
+    def league_batting_rates(self):
+        return self.cached("league_batting", lambda: batting_rates(
+            self.batter_outcomes[:self.num_batters].sum(axis=0))[0])
+
+    def league_pitching_rates(self):
+        return self.cached("league_pitching", lambda: pitching_rates(
+            self.pitcher_outcomes[:self.num_pitchers].sum(axis=0), self.pitcher_runs[:self.num_pitchers].sum())[0])
+
+    def batting_totals(self, batter_ids=None):
+        """
+        Returns a (players, len(BATTER_COUNTING)) array of counting stats for
+        the given ids (every batter when None).
+        """
+        outcomes = self.batter_outcomes[:self.num_batters] if batter_ids is None else self.batter_outcomes[batter_ids]
+        return outcomes @ BATTER_COUNTING_MATRIX
+
+    def pitching_totals(self, pitcher_ids=None):
+        outcomes = self.pitcher_outcomes[:self.num_pitchers] if pitcher_ids is None else self.pitcher_outcomes[pitcher_ids]
+        return outcomes @ PITCHER_COUNTING_MATRIX
+
+    def reset_stats(self):
+        self.batter_outcomes[:] = 0
+        self.batter_rates[:] = 0
+        self.pitcher_outcomes[:] = 0
+        self.pitcher_runs[:] = 0
+        self.pitcher_rates[:] = 0
+        self.dirty_batters.clear()
+        self.dirty_pitchers.clear()
+        self.mark_changed(range(self.num_batters), range(self.num_pitchers))
+        self.version += 1
+
+
+class RatingsView(MutableMapping):
+    """
+    Dict-style access to one row of a ratings array. `columns` maps each
+    rating name to its column; unknown names raise KeyError like a dict.
+    """
+    __slots__ = ("store", "array_name", "columns", "row")
+
+    def __init__(self, store, array_name, columns, row):
+        self.store = store
+        self.array_name = array_name
+        self.columns = columns
+        self.row = row
+
+    def __getitem__(self, key):
+        return int(getattr(self.store, self.array_name)[self.row, self.columns[key]])
+
+    def __setitem__(self, key, value):
+        getattr(self.store, self.array_name)[self.row, self.columns[key]] = value
+        if self.array_name == "pitcher_ratings":
+            self.store.mark_changed(pitcher_ids=(self.row,))
+        else:
+            self.store.mark_changed(batter_ids=(self.row,))
+        self.store.ratings_version += 1
+
+    def __delitem__(self, key):
+        raise TypeError("Ratings columns cannot be removed")
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class BatterStatsView(Mapping):
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        if key in BATTER_COUNTING:
+            return int(self.store.batter_outcomes[self.row, list(BATTER_COUNTING[key])].sum())
+        return self.store.batter_rate(self.row, BATTER_RATES.index(key))
+
+    def __iter__(self):
+        return iter(list(BATTER_COUNTING) + BATTER_RATES)
+
+    def __len__(self):
+        return len(BATTER_COUNTING) + len(BATTER_RATES)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class PitcherStatsView(Mapping):
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        if key in PITCHER_COUNTING:
+            return int(self.store.pitcher_outcomes[self.row, list(PITCHER_COUNTING[key])].sum())
+        if key == "Runs Allowed":
+            return int(self.store.pitcher_runs[self.row])
+        if key == "Innings Pitched":
+            return int(self.store.pitcher_outcomes[self.row, OUT]) / 3
+        return self.store.pitcher_rate(self.row, PITCHER_RATES.index(key))
+
+    def __iter__(self):
+        return iter(PITCHER_RATES + ["Runs Allowed", "Innings Pitched"] + list(PITCHER_COUNTING))
+
+    def __len__(self):
+        return len(PITCHER_RATES) + 2 + len(PITCHER_COUNTING)
+
+    def __repr__(self):
+        return repr(dict(self))
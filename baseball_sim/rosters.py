@@ -0,0 +1,228 @@
+"""
+The league's clubs, loaded from data files instead of code.
+
+baseball_sim/data holds three plain files that are easy to edit by hand:
+teams.json (one club per line: id, name, league, division, colour),
+players.csv (one row per player, batting ratings or pitching ratings
+filled in) and staff.csv. A blank rating is rolled the same way the engine
+rolls any rating nobody supplied, seeded by the team id so it comes out
+the same every run.
+
+Parsing 800 CSV rows is the slow part, so the first load writes the player
+and staff columns to a binary cache (rosters.bin, next to the data unless
+told otherwise) as int16 rating matrices with per-team row offsets. Later
+runs read the cache with a few np.frombuffer calls, and rebuild it only if
+a source file changed. Teams themselves are built lazily: asking for one
+club adds its 26 players to the RosterStore and nothing else.
+"""
+import csv
+import json
+import os
+
+import numpy as np
+
+from .engine import Batter, Coach, Pitcher, Team
+from .league import League
+from .registry import TeamRegistry
+from .rng import SimRandom
+from .roster_store import BATTER_RATINGS, PITCHER_RATINGS, RosterStore
+from .savegame import read_arrays, write_arrays
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SOURCE_FILES = ["teams.json", "players.csv", "staff.csv"]
+CACHE_FILE = "rosters.bin"
+CACHE_VERSION = 1
+STAFF_RATINGS = ["experience", "hitting", "pitching", "fielding"]
+# Cache value for a rating left blank in the data
+MISSING = -1
+BATTER, PITCHER = 0, 1
+# Batter() spells this keyword differently from the store column
+BATTER_KEYWORDS = {key: key for key in BATTER_RATINGS}
+BATTER_KEYWORDS["arm_strength_pot"] = "arm_stength_pot"
+
+
+class RosterDatabase:
+    """
+    Every club in the data directory, by id. Team metadata is read up
+    front; players and staff are read on the first team() call and each
+    team is built once, into `store`.
+    """
+    def __init__(self, data_dir=DATA_DIR, cache_path=None, store=None, seed=0):
+        self.data_dir = data_dir
+        self.cache_path = cache_path if cache_path is not None else os.path.join(data_dir, CACHE_FILE)
+        self.store = store if store is not None else RosterStore()
+        self.seed = seed
+        with open(os.path.join(data_dir, "teams.json"), encoding="utf-8") as file:
+            self.info = json.load(file)
+        self.index = {record["id"]: i for i, record in enumerate(self.info)}
+        self._columns = None
+        self._teams = {}
+
+    def __contains__(self, team_id):
+        return team_id in self.index
+
+    def __len__(self):
+        return len(self.info)
+
+    def ids(self):
+        return [record["id"] for record in self.info]
+
+    def record(self, team_id):
+        """
+        The team's metadata: name, nickname, league, division and color.
+        """
+        return self.info[self.index[team_id]]
+
+    def is_loaded(self):
+        return self._columns is not None
+
+    # ---- Columns ----
+
+    def _signature(self):
+        signature = []
+        for name in SOURCE_FILES:
+            status = os.stat(os.path.join(self.data_dir, name))
+            signature.append([name, status.st_mtime_ns, status.st_size])
+        return signature
+
+    def columns(self):
+        """
+        Returns (header, arrays) for the player and staff data, from the
+        cache when it matches the source files.
+        """
+        if self._columns is None:
+            signature = self._signature()
+            try:
+                header, arrays = read_arrays(self.cache_path)
+            except (OSError, ValueError, KeyError):
+                header = None
+            if header is None or header.get("version") != CACHE_VERSION or header.get("signature") != signature:
+                header, arrays = self._parse()
+                header.update(version=CACHE_VERSION, signature=signature)
+                write_arrays(self.cache_path, header, arrays)
+            self._columns = header, arrays
+        return self._columns
+
+    def _parse(self):
+        """
+        Reads players.csv and staff.csv into team-ordered columns.
+        """
+        players = [[] for _ in self.info]
+        with open(os.path.join(self.data_dir, "players.csv"), newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                players[self._team_index(row["team"])].append(row)
+        staff = [[] for _ in self.info]
+        with open(os.path.join(self.data_dir, "staff.csv"), newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                staff[self._team_index(row["team"])].append(row)
+
+        rows = [row for team_rows in players for row in team_rows]
+        staff_rows = [row for team_rows in staff for row in team_rows]
+        arrays = {
+            "player_kind": np.array([PITCHER if row["kind"] == "pitcher" else BATTER for row in rows], dtype=np.int8),
+            "player_age": np.array([_value(row["age"]) for row in rows], dtype=np.int16),
+            "batter_ratings": _ratings(rows, BATTER_RATINGS),
+            "pitcher_ratings": _ratings(rows, PITCHER_RATINGS),
+            "player_start": np.cumsum([0] + [len(team_rows) for team_rows in players], dtype=np.int32),
+            "staff_ratings": _ratings(staff_rows, STAFF_RATINGS),
+            "staff_start": np.cumsum([0] + [len(team_rows) for team_rows in staff], dtype=np.int32),
+        }
+        header = {
+            "player_names": [row["name"] for row in rows],
+            "player_positions": [row["position"] for row in rows],
+            "staff_names": [row["name"] for row in staff_rows],
+            "staff_roles": [row["role"] for row in staff_rows],
+        }
+        return header, arrays
+
+    def _team_index(self, team_id):
+        if team_id not in self.index:
+            raise ValueError(f"Unknown team id {team_id!r} in roster data")
+        return self.index[team_id]
+
+    # ---- Teams ----
+
+    def team(self, team_id):
+        """
+        Returns the club with this id, building it on first use.
+        """
+        team = self._teams.get(team_id)
+        if team is None:
+            team = self._teams[team_id] = self._build(team_id)
+        return team
+
+    def _build(self, team_id):
+        header, arrays = self.columns()
+        i = self.index[team_id]
+        rng = SimRandom(self.seed).spawn("team", team_id)
+        batters, pitchers = [], []
+        start, end = arrays["player_start"][i:i + 2].tolist()
+        for row in range(start, end):
+            name, position = header["player_names"][row], header["player_positions"][row]
+            age = _given(int(arrays["player_age"][row]))
+            if arrays["player_kind"][row] == PITCHER:
+                ratings = _present(PITCHER_RATINGS, arrays["pitcher_ratings"][row])
+                pitchers.append(Pitcher(name, position, age=age, rng=rng, store=self.store, **ratings))
+            else:
+                ratings = _present(BATTER_RATINGS, arrays["batter_ratings"][row])
+                ratings = {BATTER_KEYWORDS[key]: value for key, value in ratings.items()}
+                batters.append(Batter(name, position, age=age, rng=rng, store=self.store, **ratings))
+        staff = []
+        start, end = arrays["staff_start"][i:i + 2].tolist()
+        for row in range(start, end):
+            ratings = _present(STAFF_RATINGS, arrays["staff_ratings"][row])
+            staff.append(Coach(header["staff_names"][row], header["staff_roles"][row], rng=rng, **ratings))
+        return Team(self.record(team_id)["name"], batters, pitchers, staff)
+
+    def registry(self):
+        """
+        A TeamRegistry over every club, built lazily through team().
+        """
+        registry = TeamRegistry()
+        for record in self.info:
+            registry.register(record["id"], record["name"], lambda team_id=record["id"]: self.team(team_id))
+        return registry
+
+    def divisions(self):
+        """
+        Returns {(league, division): [team ids]} in data order.
+        """
+        divisions = {}
+        for record in self.info:
+            divisions.setdefault((record["league"], record["division"]), []).append(record["id"])
+        return divisions
+
+    def division_ids(self, league_name, division_name):
+        return self.divisions().get((league_name, division_name), [])
+
+    def league(self, team_ids=None, **kwargs):
+        """
+        A League of `team_ids` (every club by default) with the divisions
+        from the data, sharing this database's store.
+        """
+        team_ids = self.ids() if team_ids is None else list(team_ids)
+        position = {team_id: i for i, team_id in enumerate(team_ids)}
+        divisions = {}
+        for name, members in self.divisions().items():
+            members = [position[team_id] for team_id in members if team_id in position]
+            if members:
+                divisions[name] = members
+        return League([self.team(team_id) for team_id in team_ids], store=self.store, divisions=divisions, **kwargs)
+
+
+def _value(text):
+    return int(text) if text.strip() else MISSING
+
+
+def _ratings(rows, keys):
+    if not rows:
+        return np.zeros((0, len(keys)), dtype=np.int16)
+    return np.array([[_value(row.get(key) or "") for key in keys] for row in rows], dtype=np.int16)
+
+
+def _given(value):
+    return None if value == MISSING else value
+
+
+def _present(keys, values):
+    return {key: value for key, value in zip(keys, values.tolist()) if value != MISSING}
@@ -0,0 +1,68 @@
+"""
+Vectorized plate-appearance sampling.
+
+Every batter/pitcher pair gets one outcome probability vector, ordered
+(out, walk, 1B, 2B, 3B, HR). Vectors are built for whole lineups with a few
+NumPy operations, and outcomes are drawn in bulk instead of calling
+random.random() several times per plate appearance.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+from .matchups import matchup_cache, matchup_probabilities
+
+_default_rng = np.random.default_rng()
+
+
+def outcome_probabilities(batters, pitchers, context=None):
+    """
+    Returns a (len(batters), len(pitchers), 6) array of outcome probabilities
+    from the log5 matchup model in matchups.py. `context` is the
+    (hitting coach, pitching coach) pair from coach_context().
+    """
+    return matchup_probabilities(batters, pitchers, context)
+
+
+def sample_outcomes(probabilities, size, rng=None):
+    """
+    Draws `size` outcomes for every probability vector in `probabilities`
+    (shape (..., 6)) and returns an int8 array of shape (..., size).
+    """
+    rng = rng if rng is not None else _default_rng
+    probabilities = np.asarray(probabilities)
+    cdf = np.cumsum(probabilities, axis=-1)[..., None, :-1]
+    uniforms = rng.random(probabilities.shape[:-1] + (size,))
+    return (uniforms[..., None] >= cdf).sum(axis=-1, dtype=np.int8)
+
+
+def sample_outcome_counts(probabilities, plate_appearances, rng=None):
+    """
+    Returns how many of each outcome every probability vector produced over
+    `plate_appearances` trials. A full season for a whole league is a single
+    multinomial draw.
+    """
+    rng = rng if rng is not None else _default_rng
+    return rng.multinomial(plate_appearances, probabilities)
+
+
+class MatchupSampler:
+    """
+    Outcome CDFs for one lineup against one pitching staff, gathered once per
+    game from the store's MatchupCache. Uniforms are drawn from NumPy in
+    blocks so each plate appearance is a list pop and a bisect.
+    """
+    def __init__(self, batters, pitchers, rng=None, block_size=512, context=None):
+        self.rng = rng if rng is not None else _default_rng
+        self.block_size = block_size
+        store = batters[0].store
+        if all(player.store is store for player in batters) and all(player.store is store for player in pitchers):
+            self.cdfs = matchup_cache(store).cdfs(batters, pitchers, context)
+        else:
+            self.cdfs = np.cumsum(outcome_probabilities(batters, pitchers, context), axis=-1)[..., :-1].tolist()
+        self.uniforms = []
+
+    def draw(self, batter_slot, pitcher_slot):
+        if not self.uniforms:
+            self.uniforms = self.rng.random(self.block_size).tolist()
+        return bisect_right(self.cdfs[batter_slot][pitcher_slot], self.uniforms.pop())
@@ -0,0 +1,323 @@
+"""
+Binary save files for a league (and a dynasty on top of it).
+
+A save is a base file plus an append-only delta journal next to it
+(`path` and `path + ".delta"`). Both are made of the same chunks: a small
+header, a JSON block for the handful of plain values (rosters, coaches,
+settings, schedule position) and the raw bytes of NumPy arrays. Player
+ratings, ages and results, the schedule and the standings are arrays, so a
+full league loads with a few np.frombuffer calls.
+
+SaveGame remembers what it last wrote. save_delta() compares each array
+with that copy and writes only the rows that changed or were added, plus
+the new entries of append-only lists such as player names, so saving after
+every simulated day costs milliseconds. load() reads the base and replays
+the journal in order; save() writes a fresh base and clears the journal,
+which save_delta() also does once the journal outgrows the base
+`compact_factor` times over, so loading never replays a long history.
+Every base gets a new generation id and each delta carries the id of the
+base it follows; load() skips deltas from another generation, so a crash
+between replacing the base and clearing the journal cannot replay stale
+changes onto the new base.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from .engine import Coach, Pitcher, Batter, Team
+from .league import League
+from .roster_store import RosterStore
+from .schedule import Schedule
+
+BASE_MAGIC = b"BSV1"
+DELTA_MAGIC = b"BDL1"
+ARRAYS_MAGIC = b"BAR1"
+CHUNK_HEADER = struct.Struct("<4sI")
+
+STORE_ARRAYS = ["batter_ratings", "batter_ages", "batter_outcomes",
+                "pitcher_ratings", "pitcher_ages", "pitcher_outcomes", "pitcher_runs"]
+STORE_LISTS = ["batter_names", "batter_positions", "pitcher_names", "pitcher_positions"]
+
+
+class SaveGame:
+    """
+    Writes and reads one save slot. A state is (meta, arrays, lists): a
+    JSON-ready dict, a dict of NumPy arrays, and a dict of append-only lists.
+    """
+    def __init__(self, path, compact_factor=4):
+        self.path = path
+        self.delta_path = path + ".delta"
+        self.compact_factor = compact_factor
+        self._saved_arrays = None
+        self._saved_lengths = None
+        self._base_size = 0
+        self._journal_size = 0
+        self._generation = None
+
+    def save(self, state):
+        """
+        Writes a full save and starts a new, empty delta journal.
+        """
+        meta, arrays, lists = state
+        generation = os.urandom(8).hex()
+        entries = [(name, None, np.ascontiguousarray(array)) for name, array in arrays.items()]
+        chunk = _chunk(BASE_MAGIC, {"meta": meta, "lists": lists, "generation": generation}, entries)
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(chunk)
+        os.replace(temporary, self.path)
+        open(self.delta_path, "wb").close()
+        self._generation = generation
+        self._base_size = len(chunk)
+        self._journal_size = 0
+        self._remember(arrays, lists)
+
+    def save_delta(self, state):
+        """
+        Appends the changes since the last save or delta to the journal.
+        Falls back to a full save if nothing has been saved in this session.
+        """
+        if self._saved_arrays is None or self._journal_size > self.compact_factor * self._base_size:
+            self.save(state)
+            return
+        meta, arrays, lists = state
+        entries = []
+        for name, array in arrays.items():
+            saved = self._saved_arrays.get(name)
+            if saved is None or saved.shape[1:] != array.shape[1:] or len(array) < len(saved):
+                entries.append((name, None, np.ascontiguousarray(array)))
+                continue
+            common = len(saved)
+            changed = array[:common] != saved
+            if changed.ndim > 1:
+                changed = changed.reshape(common, -1).any(axis=1)
+            rows = np.concatenate([np.flatnonzero(changed), np.arange(common, len(array))])
+            if len(rows):
+                entries.append((name, rows.astype(np.int64), np.ascontiguousarray(array[rows])))
+        list_tails = {name: values[self._saved_lengths.get(name, 0):] for name, values in lists.items()}
+        chunk = _chunk(DELTA_MAGIC, {"meta": meta, "list_tails": list_tails, "generation": self._generation,
+                                     "lengths": {name: len(array) for name, array in arrays.items()}}, entries)
+        with open(self.delta_path, "ab") as file:
+            file.write(chunk)
+        self._journal_size += len(chunk)
+        self._remember(arrays, lists)
+
+    def _remember(self, arrays, lists):
+        self._saved_arrays = {name: np.array(array, copy=True) for name, array in arrays.items()}
+        self._saved_lengths = {name: len(values) for name, values in lists.items()}
+
+    def load(self):
+        """
+        Returns the saved (meta, arrays, lists) with every delta applied.
+        """
+        with open(self.path, "rb") as file:
+            data = file.read()
+        magic, header, entries, _ = _read_chunk(data, 0)
+        if magic != BASE_MAGIC:
+            raise ValueError(f"{self.path} is not a save file")
+        self._base_size = len(data)
+        self._journal_size = 0
+        self._generation = header.get("generation")
+        meta, lists = header["meta"], header["lists"]
+        arrays = {name: array.copy() for name, _, array in entries}
+
+        if os.path.exists(self.delta_path):
+            with open(self.delta_path, "rb") as file:
+                journal = file.read()
+            self._journal_size = len(journal)
+            offset = 0
+            while offset < len(journal):
+                if len(journal) - offset < CHUNK_HEADER.size:
+                    break  # A partial chunk from an interrupted write
+                try:
+                    magic, header, entries, offset = _read_chunk(journal, offset)
+                except ValueError:
+                    break
+                if magic != DELTA_MAGIC:
+                    raise ValueError(f"{self.delta_path} is not a delta journal")
+                if header.get("generation") != self._generation:
+                    continue  # Left over from an earlier base
+                meta = header["meta"]
+                for name, tail in header["list_tails"].items():
+                    lists.setdefault(name, []).extend(tail)
+                for name, rows, values in entries:
+                    if rows is None:
+                        arrays[name] = values.copy()
+                        continue
+                    array = arrays[name]
+                    length = header["lengths"][name]
+                    if length > len(array):
+                        grown = np.zeros((length,) + array.shape[1:], dtype=array.dtype)
+                        grown[:len(array)] = array
+                        arrays[name] = array = grown
+                    array[rows] = values
+        self._remember(arrays, lists)
+        return meta, arrays, lists
+
+
+def _chunk(magic, header, entries):
+    descriptions = []
+    blobs = []
+    for name, rows, array in entries:
+        description = {"name": name, "dtype": array.dtype.str, "shape": list(array.shape)}
+        if rows is not None:
+            description["rows"] = len(rows)
+            blobs.append(rows.tobytes())
+        descriptions.append(description)
+        blobs.append(array.tobytes())
+    header = dict(header, arrays=descriptions)
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return b"".join([CHUNK_HEADER.pack(magic, len(encoded)), encoded, *blobs])
+
+
+def _read_chunk(data, offset):
+    """
+    Returns (magic, header, [(name, rows or None, array)], next_offset).
+    """
+    magic, header_length = CHUNK_HEADER.unpack_from(data, offset)
+    offset += CHUNK_HEADER.size
+    if offset + header_length > len(data):
+        raise ValueError("truncated chunk")
+    header = json.loads(data[offset:offset + header_length])
+    offset += header_length
+    entries = []
+    for description in header["arrays"]:
+        rows = None
+        if "rows" in description:
+            count = description["rows"]
+            rows = np.frombuffer(data, dtype=np.int64, count=count, offset=offset)
+            offset += rows.nbytes
+        dtype = np.dtype(description["dtype"])
+        shape = tuple(description["shape"])
+        count = int(np.prod(shape))
+        if offset + count * dtype.itemsize > len(data):
+            raise ValueError("truncated chunk")
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += array.nbytes
+        entries.append((description["name"], rows, array))
+    return magic, header, entries, offset
+
+
+def write_arrays(path, header, arrays):
+    """
+    Writes a JSON-ready `header` and a dict of arrays as one chunk, e.g. for
+    a cache file. Returns False if the file cannot be written.
+    """
+    entries = [(name, None, np.ascontiguousarray(array)) for name, array in arrays.items()]
+    try:
+        with open(path, "wb") as file:
+            file.write(_chunk(ARRAYS_MAGIC, {"meta": header}, entries))
+    except OSError:
+        return False
+    return True
+
+
+def read_arrays(path):
+    """
+    Reads a file written by write_arrays() and returns (header, arrays).
+    The arrays are read-only views of the file's bytes.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, header, entries, _ = _read_chunk(data, 0)
+    if magic != ARRAYS_MAGIC:
+        raise ValueError(f"{path} is not an array file")
+    return header["meta"], {name: array for name, _, array in entries}
+
+
+def league_state(league, day=0):
+    """
+    Captures a League as (meta, arrays, lists). `day` is the next schedule
+    day to play.
+    """
+    store = league.store
+    standings = league.standings
+    meta = {
+        "games_per_season": league.games_per_season,
+        "playoff_spots": league.playoff_spots,
+        "divisions": [[league_name, division_name, members]
+                      for (league_name, division_name), members in league.divisions.items()],
+        "day": day,
+        "teams": [{
+            "name": team.name,
+            "batters": [player.id for player in team.batters],
+            "pitchers": [player.id for player in team.pitchers],
+            "staff": [[coach.name, coach.role, coach.attributes, coach.stats] for coach in team.staff],
+            "wins": team.wins,
+            "losses": team.losses,
+        } for team in league.teams],
+        "has_schedule": league.schedule is not None,
+    }
+    arrays = {name: getattr(store, name)[:store.num_batters if name.startswith("batter") else store.num_pitchers]
+              for name in STORE_ARRAYS}
+    arrays.update({
+        "standings_wins": np.array(standings.wins, dtype=np.int32),
+        "standings_losses": np.array(standings.losses, dtype=np.int32),
+        "standings_run_differential": np.array(standings.run_differential, dtype=np.int32),
+        "standings_head_to_head": np.array(standings.head_to_head, dtype=np.int32).reshape(len(league.teams), -1),
+        "standings_games_scheduled": np.array(standings.games_scheduled, dtype=np.int32),
+    })
+    if league.schedule is not None:
+        arrays.update({"schedule_home": league.schedule.home, "schedule_away": league.schedule.away,
+                       "schedule_day_start": league.schedule.day_start})
+    lists = {name: getattr(store, name) for name in STORE_LISTS}
+    return meta, arrays, lists
+
+
+def restore_league(meta, arrays, lists):
+    """
+    Rebuilds a League from league_state() output. Returns (league, day).
+    """
+    num_batters = len(lists["batter_names"])
+    num_pitchers = len(lists["pitcher_names"])
+    store = RosterStore(max(num_batters, num_pitchers, 1))
+    for name in STORE_LISTS:
+        getattr(store, name).extend(lists[name])
+    for name in STORE_ARRAYS:
+        target = getattr(store, name)
+        if len(target) < len(arrays[name]):
+            target = np.zeros((len(arrays[name]),) + target.shape[1:], dtype=target.dtype)
+            setattr(store, name, target)
+        target[:len(arrays[name])] = arrays[name]
+    # Rates are derived, so mark everyone for recomputation
+    store.dirty_batters.update(range(num_batters))
+    store.dirty_pitchers.update(range(num_pitchers))
+    store.version += 1
+
+    teams = []
+    for record in meta["teams"]:
+        staff = []
+        for name, role, attributes, stats in record["staff"]:
+            coach = Coach(name, role, **attributes)
+            coach.stats = stats
+            staff.append(coach)
+        team = Team(record["name"], [Batter.from_store(store, player_id) for player_id in record["batters"]],
+                    [Pitcher.from_store(store, player_id) for player_id in record["pitchers"]], staff)
+        team.wins = record["wins"]
+        team.losses = record["losses"]
+        teams.append(team)
+
+    divisions = {(league_name, division_name): members for league_name, division_name, members in meta["divisions"]}
+    league = League(teams, meta["games_per_season"], meta["playoff_spots"], store=store, divisions=divisions)
+    if meta["has_schedule"]:
+        league.schedule = Schedule(arrays["schedule_home"], arrays["schedule_away"], arrays["schedule_day_start"])
+    league.standings.restore(arrays["standings_wins"], arrays["standings_losses"],
+                             arrays["standings_run_differential"], arrays["standings_head_to_head"],
+                             arrays["standings_games_scheduled"])
+    return league, meta["day"]
+
+
+def save_league(league, path, day=0):
+    """
+    Writes a full save of `league` to `path`.
+    """
+    SaveGame(path).save(league_state(league, day))
+
+
+def load_league(path):
+    """
+    Loads a league saved with save_league() or SaveGame. Returns (league, day).
+    """
+    return restore_league(*SaveGame(path).load())
@@ -0,0 +1,131 @@
+"""
+Balanced season schedules.
+
+The schedule is a mirrored double round robin made of series: every pair
+of teams meets in one series at each park, and a mirrored series always has
+the same length as the original, so every team gets exactly half its games
+at home. For 30 teams and 162 games that is 58 rounds of 2- and 3-game
+series, 2,430 games in all, with a league-wide off-day after every few
+rounds.
+
+Schedules are stored as flat int16 arrays of team indexes plus a day_start
+offset array (CSR layout), so the season simulator streams through them day
+by day without building any per-game objects.
+"""
+import math
+import random
+
+import numpy as np
+
+BYE = -1
+MAX_SERIES_LENGTH = 3
+
+
+class Schedule:
+    """
+    Games grouped by day. Day d's games are home[day_start[d]:day_start[d + 1]]
+    against the matching entries of away. Off-days have no games.
+    """
+    def __init__(self, home, away, day_start):
+        self.home = home
+        self.away = away
+        self.day_start = day_start
+
+    def __len__(self):
+        return len(self.home)
+
+    @property
+    def num_days(self):
+        return len(self.day_start) - 1
+
+    def games_on(self, day):
+        start, end = self.day_start[day], self.day_start[day + 1]
+        return self.home[start:end], self.away[start:end]
+
+    def __iter__(self):
+        """
+        Yields (day, home_indexes, away_indexes) for every day, off-days included.
+        """
+        return self.days()
+
+    def days(self, start=0):
+        """
+        Like iterating the schedule, but starting at day `start`.
+        """
+        for day in range(start, self.num_days):
+            home, away = self.games_on(day)
+            yield day, home, away
+
+    def games_per_team(self, num_teams):
+        return np.bincount(self.home, minlength=num_teams) + np.bincount(self.away, minlength=num_teams)
+
+    def home_games_per_team(self, num_teams):
+        return np.bincount(self.home, minlength=num_teams)
+
+
+def _round_robin(num_slots):
+    """
+    Returns (num_slots - 1, num_slots // 2, 2) array of (home, away) slot
+    pairs using the circle method, alternating home field round to round.
+    """
+    slots = list(range(num_slots))
+    rounds = []
+    for round_number in range(num_slots - 1):
+        pairs = []
+        for i in range(num_slots // 2):
+            first, second = slots[i], slots[num_slots - 1 - i]
+            pairs.append((first, second) if (round_number + i) % 2 == 0 else (second, first))
+        rounds.append(pairs)
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return np.array(rounds, dtype=np.int16)
+
+
+def generate_schedule(num_teams, games_per_team=162, rng=None, off_day_every=3):
+    """
+    Builds a balanced Schedule for `num_teams` teams. With an even number of
+    teams every team plays exactly `games_per_team` games (rounded down to
+    an even number), half of them at home. With an odd number one team sits
+    out each round, so totals differ slightly.
+    """
+    rng = rng if rng is not None else random
+    num_slots = num_teams + num_teams % 2
+    half_games = games_per_team // 2
+
+    # Repeat the single round robin until series no longer than
+    # MAX_SERIES_LENGTH can cover half the season
+    cycles = math.ceil(half_games / ((num_slots - 1) * MAX_SERIES_LENGTH))
+    first_half = np.concatenate([_round_robin(num_slots)] * cycles)
+    base_length, longer = divmod(half_games, len(first_half))
+    lengths = [base_length + 1] * longer + [base_length] * (len(first_half) - longer)
+    rng.shuffle(lengths)
+
+    # Shuffle team labels so slot numbers do not decide the schedule
+    labels = list(range(num_teams)) + [BYE] * (num_slots - num_teams)
+    rng.shuffle(labels)
+    labels = np.array(labels, dtype=np.int16)
+
+    first_order = list(range(len(first_half)))
+    second_order = list(range(len(first_half)))
+    rng.shuffle(first_order)
+    rng.shuffle(second_order)
+    if len(second_order) > 1 and second_order[0] == first_order[-1]:
+        # Never play the same series twice in a row across the midpoint
+        second_order[0], second_order[1] = second_order[1], second_order[0]
+
+    rounds = [(first_half[r], lengths[r]) for r in first_order]
+    rounds += [(first_half[r][:, ::-1], lengths[r]) for r in second_order]
+
+    home, away, day_start = [], [], [0]
+    for round_number, (pairs, length) in enumerate(rounds):
+        round_home = labels[pairs[:, 0]]
+        round_away = labels[pairs[:, 1]]
+        playing = (round_home != BYE) & (round_away != BYE)
+        round_home, round_away = round_home[playing], round_away[playing]
+        for _ in range(length):
+            home.append(round_home)
+            away.append(round_away)
+            day_start.append(day_start[-1] + len(round_home))
+        if off_day_every and (round_number + 1) % off_day_every == 0 and round_number + 1 < len(rounds):
+            day_start.append(day_start[-1])
+
+    return Schedule(np.concatenate(home), np.concatenate(away), np.array(day_start, dtype=np.int32))
@@ -0,0 +1,45 @@
+"""
+Headless batch simulation built on the Game/Team classes in engine.py.
+
+Nothing here prints or draws, so thousands of complete games can be run
+back to back for season sims and projections.
+"""
+from .engine import Coach, Pitcher, Batter, Team, Game
+
+BATTER_POSITIONS = ["C", "C", "1B", "2B", "2B", "3B", "SS", "LF", "CF", "RF", "RF", "DH", "UT"]
+PITCHER_POSITIONS = ["SP"] * 5 + ["RP"] * 8
+STAFF_ROLES = ["MA", "1B", "3B", "HC", "PC"]
+
+
+def create_random_team(name, rng=None, *, store):
+    """
+    Builds a team with the same roster shape as the create_*_team functions,
+    with every rating rolled at random from `rng` (the global random module
+    when not given). Players are added to `store`.
+    """
+    batters = [Batter(f"{name} Batter {i + 1}", position, rng=rng, store=store) for i, position in enumerate(BATTER_POSITIONS)]
+    pitchers = [Pitcher(f"{name} Pitcher {i + 1}", position, rng=rng, store=store) for i, position in enumerate(PITCHER_POSITIONS)]
+    staff = [Coach(f"{name} Coach {i + 1}", role, rng=rng) for i, role in enumerate(STAFF_ROLES)]
+    return Team(name, batters, pitchers, staff)
+
+
+def simulate_game(home_team, away_team, innings=9, rng=None, event_log=None, game_id=0):
+    """
+    Plays one complete game (extra innings included) and returns
+    (home_score, away_score). `rng` is the SimRandom outcomes are drawn from;
+    plate appearances go to `event_log` under `game_id` when one is given.
+    """
+    game = Game(home_team, away_team, innings, rng, event_log, game_id, keep_box_score=False)
+    while not game.is_game_over():
+        game.play_inning()
+    return home_team.score, away_team.score
+
+
+def simulate_games(matchups, innings=9, rng=None):
+    """
+    Plays every (home_team, away_team) pair in order and returns a list of
+    (home_score, away_score) tuples. With an `rng`, game i is played on the
+    derived stream rng.spawn("game", i).
+    """
+    return [simulate_game(home_team, away_team, innings, rng.spawn("game", i) if rng is not None else None)
+            for i, (home_team, away_team) in enumerate(matchups)]
@@ -0,0 +1,274 @@
+"""
+Standings kept in order as results come in.
+
+Teams are ranked by games over .500 (wins minus losses), the measure games
+behind is based on. A result moves a team's key by exactly one, so within a
+ranked list it only has to jump past the other teams with the same key:
+each ranking keeps the first and last position of every key's block, and a
+win swaps the team with the first member of its block, then shifts the
+block boundaries. That is O(1) per ranking, and every team sits in three
+(its division, its league and the whole circuit), so recording a game is a
+constant amount of work and reading a leader or games-behind is a lookup.
+
+Ties (teams in the same block) are broken only when a ranked list is read:
+head-to-head record among the tied teams, then run differential, then
+league order.
+"""
+NUM_DIVISIONS_PER_LEAGUE = 3
+LEAGUE_NAMES = ["American League", "National League"]
+DIVISION_NAMES = ["East", "Central", "West"]
+
+
+def default_divisions(num_teams):
+    """
+    Returns {(league, division): [team indexes]}. A league of six, twelve,
+    ... thirty teams splits into two leagues of three divisions in team
+    order; any other size plays as a single division.
+    """
+    groups = len(LEAGUE_NAMES) * NUM_DIVISIONS_PER_LEAGUE
+    if num_teams == 0 or num_teams % groups:
+        return {(LEAGUE_NAMES[0], "League"): list(range(num_teams))}
+    size = num_teams // groups
+    divisions = {}
+    for league_number, league_name in enumerate(LEAGUE_NAMES):
+        for division_number, division_name in enumerate(DIVISION_NAMES):
+            start = (league_number * NUM_DIVISIONS_PER_LEAGUE + division_number) * size
+            divisions[(league_name, division_name)] = list(range(start, start + size))
+    return divisions
+
+
+class _Ranking:
+    """
+    Team indexes ordered by a shared key list, best first, with the
+    position range of every key so a +1/-1 change is a single swap.
+    """
+    __slots__ = ("keys", "order", "position", "first", "last")
+
+    def __init__(self, members, keys):
+        self.keys = keys
+        self.order = sorted(members, key=lambda team: -keys[team])
+        self.position = {team: i for i, team in enumerate(self.order)}
+        self.first = {}
+        self.last = {}
+        for i, team in enumerate(self.order):
+            self.first.setdefault(keys[team], i)
+            self.last[keys[team]] = i
+
+    def _swap(self, i, j):
+        order, position = self.order, self.position
+        order[i], order[j] = order[j], order[i]
+        position[order[i]] = i
+        position[order[j]] = j
+
+    def increment(self, team):
+        """
+        Moves `team` up for a key change of +1. Call before the key changes.
+        """
+        key = self.keys[team]
+        front = self.first[key]
+        self._swap(self.position[team], front)
+        if self.last[key] == front:
+            del self.first[key], self.last[key]
+        else:
+            self.first[key] = front + 1
+        if key + 1 in self.last:
+            self.last[key + 1] = front
+        else:
+            self.first[key + 1] = self.last[key + 1] = front
+
+    def decrement(self, team):
+        """
+        Moves `team` down for a key change of -1. Call before the key changes.
+        """
+        key = self.keys[team]
+        back = self.last[key]
+        self._swap(self.position[team], back)
+        if self.first[key] == back:
+            del self.first[key], self.last[key]
+        else:
+            self.last[key] = back - 1
+        if key - 1 in self.first:
+            self.first[key - 1] = back
+        else:
+            self.first[key - 1] = self.last[key - 1] = back
+
+    def tied_with(self, team):
+        key = self.keys[team]
+        return self.order[self.first[key]:self.last[key] + 1]
+
+
+class Standings:
+    """
+    Win-loss records, head-to-head results and run differentials for every
+    team, with ranked views per division, per league and overall. Teams are
+    referred to by their index in the league's team list.
+    """
+    def __init__(self, num_teams, divisions=None):
+        self.num_teams = num_teams
+        self.divisions = divisions if divisions is not None else default_divisions(num_teams)
+        self.leagues = {}
+        for (league_name, _), members in self.divisions.items():
+            self.leagues.setdefault(league_name, []).extend(members)
+        self.division_of = {team: name for name, members in self.divisions.items() for team in members}
+        self.league_of = {team: name[0] for team, name in self.division_of.items()}
+        self.reset()
+
+    def reset(self, games_scheduled=None):
+        """
+        Clears every record. `games_scheduled` is each team's season length,
+        used by the clinch and elimination checks.
+        """
+        n = self.num_teams
+        self.wins = [0] * n
+        self.losses = [0] * n
+        self.games_over = [0] * n
+        self.run_differential = [0] * n
+        self.head_to_head = [[0] * n for _ in range(n)]
+        self.games_scheduled = [0] * n if games_scheduled is None else [int(games) for games in games_scheduled]
+        self._build_rankings()
+
+    def restore(self, wins, losses, run_differential, head_to_head, games_scheduled):
+        """
+        Loads saved records and rebuilds the ranked views from them.
+        """
+        self.wins = [int(value) for value in wins]
+        self.losses = [int(value) for value in losses]
+        self.games_over = [won - lost for won, lost in zip(self.wins, self.losses)]
+        self.run_differential = [int(value) for value in run_differential]
+        self.head_to_head = [[int(value) for value in row] for row in head_to_head]
+        self.games_scheduled = [int(value) for value in games_scheduled]
+        self._build_rankings()
+
+    def _build_rankings(self):
+        n = self.num_teams
+        self.division_rankings = {name: _Ranking(members, self.games_over) for name, members in self.divisions.items()}
+        self.league_rankings = {name: _Ranking(members, self.games_over) for name, members in self.leagues.items()}
+        self.overall = _Ranking(range(n), self.games_over)
+        self._rankings_of = [(self.division_rankings[self.division_of[team]], self.league_rankings[self.league_of[team]],
+                              self.overall) for team in range(n)]
+
+    def record_game(self, home, away, home_score, away_score):
+        winner, loser = (home, away) if home_score > away_score else (away, home)
+        for ranking in self._rankings_of[winner]:
+            ranking.increment(winner)
+        for ranking in self._rankings_of[loser]:
+            ranking.decrement(loser)
+        self.games_over[winner] += 1
+        self.games_over[loser] -= 1
+        self.wins[winner] += 1
+        self.losses[loser] += 1
+        self.head_to_head[winner][loser] += 1
+        margin = abs(home_score - away_score)
+        self.run_differential[winner] += margin
+        self.run_differential[loser] -= margin
+
+    # ---- Ranked views ----
+
+    def _tiebreak_key(self, team, tied):
+        head_to_head = sum(self.head_to_head[team][other] - self.head_to_head[other][team] for other in tied)
+        return -head_to_head, -self.run_differential[team], team
+
+    def _ranked(self, ranking):
+        order = ranking.order
+        ranked = []
+        i = 0
+        while i < len(order):
+            end = ranking.last[ranking.keys[order[i]]] + 1
+            tied = order[i:end]
+            if len(tied) > 1:
+                tied = sorted(tied, key=lambda team: self._tiebreak_key(team, tied))
+            ranked.extend(tied)
+            i = end
+        return ranked
+
+    def division(self, name):
+        """
+        Team indexes in one division, first place first, ties broken.
+        """
+        return self._ranked(self.division_rankings[name])
+
+    def league(self, name):
+        return self._ranked(self.league_rankings[name])
+
+    def overall_standings(self):
+        return self._ranked(self.overall)
+
+    def leader(self, name):
+        """
+        The division leader; only a tie for first needs a tiebreak.
+        """
+        ranking = self.division_rankings[name]
+        tied = ranking.tied_with(ranking.order[0])
+        return tied[0] if len(tied) == 1 else min(tied, key=lambda team: self._tiebreak_key(team, tied))
+
+    def games_behind(self, team):
+        """
+        Games behind the division leader.
+        """
+        ranking = self._rankings_of[team][0]
+        return (self.games_over[ranking.order[0]] - self.games_over[team]) / 2
+
+    def winning_percentage(self, team):
+        games = self.wins[team] + self.losses[team]
+        return self.wins[team] / games if games else 0.0
+
+    def rows(self, name):
+        """
+        Returns (team, wins, losses, pct, games_behind) for a division, in
+        standings order, ready for a standings screen.
+        """
+        return [(team, self.wins[team], self.losses[team], self.winning_percentage(team), self.games_behind(team))
+                for team in self.division(name)]
+
+    # ---- Clinching ----
+
+    def max_wins(self, team):
+        return self.games_scheduled[team] - self.losses[team]
+
+    def magic_number(self, team):
+        """
+        Wins by `team` or losses by its closest pursuer needed to clinch the
+        division; 0 once clinched.
+        """
+        rivals = [other for other in self.divisions[self.division_of[team]] if other != team]
+        if not rivals:
+            return 0
+        return max(max(self.max_wins(other) for other in rivals) - self.wins[team] + 1, 0)
+
+    def clinched_division(self, team):
+        return self.magic_number(team) == 0
+
+    def eliminated_from_division(self, team):
+        rivals = [other for other in self.divisions[self.division_of[team]] if other != team]
+        return any(self.wins[other] > self.max_wins(team) for other in rivals)
+
+    def clinched_playoffs(self, team, spots):
+        """
+        True once fewer than `spots` other teams in the league can still
+        reach `team`'s win total.
+        """
+        league = self.leagues[self.league_of[team]]
+        threats = sum(1 for other in league if other != team and self.max_wins(other) >= self.wins[team])
+        return threats < spots
+
+    def eliminated_from_playoffs(self, team, spots):
+        league = self.leagues[self.league_of[team]]
+        ahead = sum(1 for other in league if other != team and self.wins[other] > self.max_wins(team))
+        return ahead >= spots
+
+    # ---- Seeding ----
+
+    def playoff_seeds(self, name, spots):
+        """
+        Seeds `spots` teams from one league: division winners first by
+        record, then the best remaining teams as wild cards.
+        """
+        division_names = [division for division in self.divisions if division[0] == name]
+        winners = [self.leader(division) for division in division_names]
+        league_order = self.league(name)
+        rank = {team: i for i, team in enumerate(league_order)}
+        winners.sort(key=rank.__getitem__)
+        winners = winners[:spots]
+        chosen = set(winners)
+        wild_cards = [team for team in league_order if team not in chosen][:spots - len(winners)]
+        return winners + wild_cards
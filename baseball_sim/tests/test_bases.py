@@ -0,0 +1,54 @@
+from baseball_sim import INNING_OVER, NEXT_STATE, RUNS_SCORED, decode_state, describe_state, encode_state
+from baseball_sim.bases import FIRST, NUM_STATES, SECOND, THIRD
+from baseball_sim.outcomes import DOUBLE, HOME_RUN, NUM_OUTCOMES, OUT, SINGLE, WALK
+
+
+def transition(state, outcome):
+    index = state * NUM_OUTCOMES + outcome
+    return NEXT_STATE[index], RUNS_SCORED[index]
+
+
+def runners(state):
+    return sum(decode_state(state)[1:])
+
+
+def test_states_round_trip():
+    for outs in range(3):
+        for bases in range(8):
+            state = encode_state(outs, bases)
+            assert decode_state(state) == (outs, bool(bases & FIRST), bool(bases & SECOND), bool(bases & THIRD))
+    assert encode_state(3, 7) == INNING_OVER
+    assert describe_state(encode_state(1, FIRST | THIRD)) == "1 out, 1st, 3rd"
+
+
+def test_every_batter_who_reaches_base_is_on_base_or_scores():
+    for state in range(NUM_STATES):
+        for outcome in range(1, NUM_OUTCOMES):
+            next_state, runs = transition(state, outcome)
+            assert decode_state(next_state)[0] == decode_state(state)[0]
+            assert runners(state) + 1 == runners(next_state) + runs
+
+
+def test_outs_leave_the_runners_and_the_third_ends_the_inning():
+    for state in range(NUM_STATES):
+        next_state, runs = transition(state, OUT)
+        assert runs == 0
+        outs = decode_state(state)[0]
+        if outs == 2:
+            assert next_state == INNING_OVER
+        else:
+            assert next_state == state + 8
+    for outcome in range(NUM_OUTCOMES):
+        assert transition(INNING_OVER, outcome) == (INNING_OVER, 0)
+
+
+def test_walks_only_move_forced_runners():
+    assert transition(encode_state(0, SECOND), WALK) == (encode_state(0, FIRST | SECOND), 0)
+    assert transition(encode_state(0, FIRST | THIRD), WALK) == (encode_state(0, FIRST | SECOND | THIRD), 0)
+    assert transition(encode_state(1, FIRST | SECOND | THIRD), WALK) == (encode_state(1, FIRST | SECOND | THIRD), 1)
+
+
+def test_hits_advance_runners():
+    assert transition(encode_state(0, FIRST), DOUBLE) == (encode_state(0, SECOND | THIRD), 0)
+    assert transition(encode_state(2, SECOND | THIRD), SINGLE) == (encode_state(2, FIRST | THIRD), 1)
+    assert transition(encode_state(0, FIRST | SECOND | THIRD), HOME_RUN) == (encode_state(0, 0), 4)
@@ -0,0 +1,52 @@
+from baseball_sim import Game, RosterStore, SimRandom, create_random_team, merge_box_scores
+from baseball_sim.boxscore import BATTING_HEADERS, PITCHING_HEADERS
+
+
+def played_game(seed):
+    rng, store = SimRandom(seed), RosterStore()
+    home = create_random_team("Home", rng.spawn("home"), store=store)
+    away = create_random_team("Away", rng.spawn("away"), store=store)
+    game = Game(home, away, rng=rng.spawn("game"))
+    while not game.is_game_over():
+        game.play_inning()
+    return game
+
+
+def column(rows, headers, name):
+    return [row[headers.index(name)] for row in rows]
+
+
+def test_box_score_matches_the_game():
+    game = played_game(1)
+    box = game.box_score
+    assert box.finished
+    assert box.runs("Home") == game.home_team.score
+    assert box.runs("Away") == game.away_team.score
+    away_line, home_line = box.line_score_rows()
+    assert away_line[0] == "Away" and home_line[0] == "Home"
+    assert len(away_line) == len(home_line) == 1 + game.current_inning - 1 + 2
+    assert away_line[-2] == game.away_team.score
+    assert sum(column(box.batting_rows("Away"), BATTING_HEADERS, "H")) == away_line[-1]
+
+
+def test_pitching_lines_account_for_every_out_and_run():
+    game = played_game(2)
+    box = game.box_score
+    innings = game.current_inning - 1
+    for pitching_side, batting_side in (("Home", "Away"), ("Away", "Home")):
+        rows = box.pitching_rows(pitching_side)
+        assert all(len(row) == len(PITCHING_HEADERS) for row in rows)
+        outs = sum(int(whole) * 3 + int(partial) for whole, partial in
+                   (innings_pitched.split(".") for innings_pitched in column(rows, PITCHING_HEADERS, "IP")))
+        assert outs == 3 * innings
+        assert sum(column(rows, PITCHING_HEADERS, "R")) == box.runs(batting_side)
+        assert sum(column(rows, PITCHING_HEADERS, "H")) == box.hits(batting_side)
+
+
+def test_series_box_score_has_a_column_per_game():
+    games = [played_game(seed) for seed in (3, 4, 5)]
+    series = merge_box_scores([game.box_score for game in games])
+    assert series.column_label == "Game"
+    away_line, home_line = series.line_score_rows()
+    assert away_line[1:4] == [game.away_team.score for game in games]
+    assert home_line[-2] == sum(game.home_team.score for game in games)
@@ -0,0 +1,39 @@
+from baseball_sim import League, RosterStore, SimRandom, create_random_team, simulate_game, simulate_games
+
+
+def play_seeded_game(seed):
+    rng = SimRandom(seed)
+    store = RosterStore()
+    home = create_random_team("Home", rng.spawn("home"), store=store)
+    away = create_random_team("Away", rng.spawn("away"), store=store)
+    score = simulate_game(home, away, rng=rng.spawn("game"))
+    return score, [dict(player.stats) for player in home.batters + away.batters + home.pitchers + away.pitchers]
+
+
+def play_seeded_season(seed):
+    rng = SimRandom(seed)
+    league = League(games_per_season=12, rng=rng.spawn("teams"))
+    league.generate_schedule(rng.spawn("schedule"))
+    league.play_season(rng.spawn("season"))
+    return [(team.wins, team.losses) for team in league.teams]
+
+
+def test_same_seed_replays_a_game_exactly():
+    assert play_seeded_game(7) == play_seeded_game(7)
+
+
+def test_different_seeds_play_different_games():
+    assert len({repr(play_seeded_game(seed)) for seed in range(5)}) > 1
+
+
+def test_same_seed_replays_a_season():
+    assert play_seeded_season(11) == play_seeded_season(11)
+
+
+def test_game_streams_do_not_depend_on_what_ran_before():
+    rng, store = SimRandom(3), RosterStore()
+    home = create_random_team("Home", rng.spawn("home"), store=store)
+    away = create_random_team("Away", rng.spawn("away"), store=store)
+    together = simulate_games([(home, away)] * 3, rng=rng.spawn("games"))
+    alone = simulate_game(home, away, rng=rng.spawn("games").spawn("game", 2))
+    assert together[2] == alone
@@ -0,0 +1,63 @@
+from baseball_sim import Draft, League, SimRandom, draft_order, lottery_order
+
+
+def small_league(seed, teams=6):
+    league = League(games_per_season=10, rng=SimRandom(seed).spawn("teams"))
+    del league.teams[teams:]
+    for i, team in enumerate(league.teams):
+        team.wins, team.losses = i, 10 - i
+    return league
+
+
+def test_draft_order_repeats_and_snakes():
+    assert draft_order(["a", "b", "c"], 2) == ["a", "b", "c", "a", "b", "c"]
+    assert draft_order(["a", "b", "c"], 3, snake=True) == ["a", "b", "c", "c", "b", "a", "a", "b", "c"]
+
+
+def test_straight_draft_goes_worst_record_first():
+    league = small_league(1)
+    draft = Draft(SimRandom(2), store=league.store, prospects=60)
+    picks = draft.start_draft(league, rounds=2)
+    assert [team for team, _ in picks] == league.teams + league.teams
+
+
+def test_every_prospect_is_drafted_at_most_once():
+    league = small_league(3)
+    draft = Draft(SimRandom(4), store=league.store, prospects=40)
+    picks = draft.start_draft(league, rounds=5)
+    drafted = [id(player) for _, player in picks]
+    assert len(picks) == 30
+    assert len(set(drafted)) == len(drafted)
+    assert len(draft.prospects) == 10
+    assert not set(drafted) & {id(player) for player in draft.prospects}
+    for team, player in picks:
+        assert player in team.batters + team.pitchers
+
+
+def test_draft_stops_when_the_pool_runs_out():
+    league = small_league(5)
+    draft = Draft(SimRandom(6), store=league.store, prospects=8)
+    picks = draft.start_draft(league, rounds=5)
+    assert len(picks) == 8
+    assert draft.prospects == []
+
+
+def test_board_makes_picks_one_at_a_time():
+    league = small_league(7)
+    board = Draft(SimRandom(8), store=league.store, prospects=30).board(league, rounds=1)
+    first_team = board.on_the_clock()
+    best = board.best_available(30)
+    number, team, player = board.make_pick()
+    assert (number, team) == (1, first_team)
+    assert player not in board.best_available(30)
+    assert len(board.best_available(30)) == len(best) - 1
+    assert len(list(board)) == len(league.teams) - 1
+    assert board.is_complete() and board.make_pick() is None
+
+
+def test_lottery_only_reorders_the_top_picks():
+    league = small_league(9, teams=8)
+    order = lottery_order(league.teams, SimRandom(10), lottery_picks=2, odds=[5, 4, 3, 2])
+    assert sorted(map(id, order)) == sorted(map(id, league.teams))
+    assert all(team in league.teams[:4] for team in order[:2])
+    assert order[4:] == league.teams[4:]
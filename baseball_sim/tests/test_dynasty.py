@@ -0,0 +1,49 @@
+import numpy as np
+
+from baseball_sim import League, RosterStore, SimRandom, create_random_team
+from baseball_sim.dynasty import Dynasty
+from baseball_sim.minors import LEVELS, NOT_IN_MINORS
+
+
+def small_dynasty(tmp_path, seed=3, **settings):
+    rng = SimRandom(seed)
+    store = RosterStore()
+    teams = [create_random_team(f"Team {i}", rng.spawn("team", i), store=store) for i in range(4)]
+    league = League(teams, games_per_season=20, playoff_spots=2, store=store)
+    return Dynasty(league, str(tmp_path / "dynasty.db"), seed=seed, **settings)
+
+
+def test_farms_are_stocked_played_and_feed_the_majors(tmp_path):
+    dynasty = small_dynasty(tmp_path, farm_size=12)
+    dynasty.run(3)
+    farm = dynasty.farm
+
+    batter_ids, pitcher_ids = farm.members()
+    orgs = farm.batter_org[batter_ids].tolist() + farm.pitcher_org[pitcher_ids].tolist()
+    assert sorted(set(orgs)) == [0, 1, 2, 3]
+    for level in range(len(LEVELS)):
+        wins, losses = farm.records[level].sum(axis=0)
+        assert wins == losses > 0
+    # Only farm signings are named Prospect, and the farms fill every hole before replacements are signed
+    rostered = [player for team in dynasty.league.teams for player in team.batters + team.pitchers]
+    assert any("Prospect" in player.name for player in rostered)
+    assert not any("Call-up" in player.name for player in rostered)
+    for player in rostered:
+        assert farm.level_of(player) == NOT_IN_MINORS
+
+
+def test_farms_survive_a_save(tmp_path):
+    dynasty = small_dynasty(tmp_path, farm_size=12, autosave=str(tmp_path / "dynasty.sav"))
+    dynasty.save()
+    dynasty.run(2)
+    restored = Dynasty.load(str(tmp_path / "dynasty.sav"))
+
+    assert restored.farm_size == 12
+    for name, array in dynasty.farm.arrays().items():
+        assert np.array_equal(restored.farm.arrays()[name], array), name
+
+
+def test_dynasties_can_play_without_farms(tmp_path):
+    dynasty = small_dynasty(tmp_path, farm_size=0)
+    dynasty.run(1)
+    assert dynasty.farm is None
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from baseball_sim import Batter, Game, Pitcher, RosterStore, create_random_team, simulate_game, simulate_games
+
+
+def test_every_game_ends_with_a_winner_after_nine_innings():
+    random.seed(1)
+    store = RosterStore()
+    home, away = create_random_team("Home", store=store), create_random_team("Away", store=store)
+    for _ in range(50):
+        game = Game(home, away)
+        while not game.is_game_over():
+            game.play_inning()
+        assert game.current_inning > 9
+        assert home.score != away.score
+        assert home.score >= 0 and away.score >= 0
+
+
+def test_lineup_cycles_through_the_first_nine_batters():
+    random.seed(2)
+    team = create_random_team("Team", store=RosterStore())
+    assert len(team.batters) > 9
+    order = [team.get_next_batter() for _ in range(10)]
+    assert order[:9] == team.batters[:9]
+    assert order[9] is team.batters[0]
+
+
+def test_pitchers_rotate_through_the_whole_staff():
+    random.seed(3)
+    team = create_random_team("Team", store=RosterStore())
+    order = [team.get_next_pitcher() for _ in range(len(team.pitchers) + 1)]
+    assert order[:-1] == team.pitchers
+    assert order[-1] is team.pitchers[0]
+
+
+def test_simulate_games_returns_the_teams_final_scores():
+    random.seed(4)
+    store = RosterStore()
+    home, away = create_random_team("Home", store=store), create_random_team("Away", store=store)
+    results = simulate_games([(home, away), (away, home)])
+    assert len(results) == 2
+    assert results[1] == (away.score, home.score)
+    assert simulate_game(home, away) == (home.score, away.score)
+
+
+def test_attributes_behave_like_a_dict():
+    store = RosterStore()
+    batter = Batter("Batter", "C", power=70, store=store)
+    pitcher = Pitcher("Pitcher", "SP", control=65, store=store)
+    assert batter.attributes["power"] == 70 and pitcher.attributes["control"] == 65
+    assert "power" in batter.attributes and "velocity" not in batter.attributes
+    assert batter.attributes.get("velocity") is None and pitcher.attributes.get("power", 0) == 0
+    with pytest.raises(KeyError):
+        batter.attributes["velocity"] = 50
+    pitcher.attributes["control"] = 40
+    assert store.pitcher_ratings[pitcher.id, list(pitcher.attributes).index("control")] == 40
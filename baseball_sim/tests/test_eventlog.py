@@ -0,0 +1,44 @@
+import numpy as np
+
+from baseball_sim import EventLog, EventLogWriter, RosterStore, SimRandom, create_random_team, simulate_game
+from baseball_sim.bases import INNING_OVER
+
+
+def logged_games(tmp_path, games=4):
+    rng, store = SimRandom(8), RosterStore()
+    home = create_random_team("Home", rng.spawn("home"), store=store)
+    away = create_random_team("Away", rng.spawn("away"), store=store)
+    path = str(tmp_path / "events.bin")
+    # A small buffer so the writer flushes mid-game
+    with EventLogWriter(path, buffer_events=16) as writer:
+        scores = [simulate_game(home, away, rng=rng.spawn("game", i), event_log=writer, game_id=i)
+                  for i in range(games)]
+    return EventLog(path), scores, store
+
+
+def test_log_rebuilds_scores_and_player_totals(tmp_path):
+    log, scores, store = logged_games(tmp_path)
+    assert log.game_scores() == {i: (away, home) for i, (home, away) in enumerate(scores)}
+    assert np.array_equal(log.batting_outcomes(store.num_batters), store.batter_outcomes[:store.num_batters])
+    assert np.array_equal(log.pitching_outcomes(store.num_pitchers), store.pitcher_outcomes[:store.num_pitchers])
+    assert np.array_equal(log.runs_allowed(store.num_pitchers), store.pitcher_runs[:store.num_pitchers])
+
+
+def test_replay_chains_base_out_states(tmp_path):
+    log, _, _ = logged_games(tmp_path, games=1)
+    previous = None
+    for inning, half, _, _, _, before, after, _ in log.replay(0):
+        if previous is None or previous[:2] != (inning, half):
+            assert before == 0
+        else:
+            assert before == previous[2]
+        previous = (inning, half, after)
+    assert previous[2] == INNING_OVER or previous[1] == 1
+
+
+def test_empty_log_reads_as_no_events(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    EventLogWriter(path).close()
+    log = EventLog(path)
+    assert len(log) == 0
+    assert log.game_scores() == {}
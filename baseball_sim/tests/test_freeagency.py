@@ -0,0 +1,69 @@
+from baseball_sim import (Batter, FreeAgencyMarket, Pitcher, RosterStore, SimRandom, create_random_team, market_values,
+                          run_free_agency)
+from baseball_sim.freeagency import ASKING_SHARE, DEFAULT_BUDGET, MIN_SALARY
+from baseball_sim.simulation import BATTER_POSITIONS, PITCHER_POSITIONS
+
+
+def thinned_teams(store, rng, count=4, batters=8, pitchers=9):
+    teams = [create_random_team(f"Team {i}", rng, store=store) for i in range(count)]
+    for team in teams:
+        del team.batters[batters:]
+        del team.pitchers[pitchers:]
+    return teams
+
+
+def free_agent_pool(store, rng, count=60):
+    return [Batter(f"Free Agent {i}", rng.choice(BATTER_POSITIONS), age=rng.randint(22, 36), rng=rng, store=store)
+            if i % 2 == 0 else
+            Pitcher(f"Free Agent {i}", rng.choice(PITCHER_POSITIONS), age=rng.randint(22, 36), rng=rng, store=store)
+            for i in range(count)]
+
+
+def test_better_players_are_worth_more():
+    store = RosterStore()
+    ace = Pitcher("Ace", "SP", 80, 80, 80, 80, 80, age=27, store=store)
+    journeyman = Pitcher("Journeyman", "SP", 30, 30, 30, 30, 30, age=27, store=store)
+    veteran = Pitcher("Veteran", "SP", 80, 80, 80, 80, 80, age=38, store=store)
+    ace_value, journeyman_value, veteran_value = market_values([ace, journeyman, veteran]).tolist()
+    assert ace_value > veteran_value > journeyman_value >= MIN_SALARY
+
+
+def test_market_respects_budgets_and_roster_limits():
+    store = RosterStore()
+    rng = SimRandom(2)
+    teams = thinned_teams(store, rng)
+    pool = free_agent_pool(store, rng)
+    budgets = {"Team 0": 5.0, "Team 1": 80.0}
+    market = FreeAgencyMarket(teams, pool, budgets)
+    contracts = market.run()
+
+    signed = [player for _, player, _ in contracts]
+    assert len({id(player) for player in signed}) == len(signed)
+    assert {id(player) for player in signed + market.unsigned()} == {id(player) for player in pool}
+    for team, player, salary in contracts:
+        assert salary > 0
+        assert player in team.batters + team.pitchers
+    for team in teams:
+        assert market.payroll().get(team.name, 0.0) <= budgets.get(team.name, DEFAULT_BUDGET) + 1e-9
+        assert len(team.batters) <= len(BATTER_POSITIONS)
+        assert len(team.pitchers) <= len(PITCHER_POSITIONS)
+
+
+def test_teams_without_money_sign_nobody():
+    store = RosterStore()
+    rng = SimRandom(3)
+    teams = thinned_teams(store, rng, count=2)
+    pool = free_agent_pool(store, rng, count=10)
+    contracts, unsigned = run_free_agency(teams, pool, {"Team 0": 0.0, "Team 1": 0.0}, rng=rng)
+    assert contracts == []
+    assert len(unsigned) == len(pool)
+
+
+def test_an_uncontested_player_signs_for_the_asking_price():
+    store = RosterStore()
+    rng = SimRandom(4)
+    team = thinned_teams(store, rng, count=1)[0]
+    player = free_agent_pool(store, rng, count=1)[0]
+    (signed_team, signed_player, salary), = FreeAgencyMarket([team], [player]).run()
+    assert signed_team is team and signed_player is player
+    assert salary == market_values([player])[0] * ASKING_SHARE
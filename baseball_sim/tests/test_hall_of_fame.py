@@ -0,0 +1,37 @@
+from baseball_sim import HallOfFame, League, RosterStore, SimRandom, create_random_team
+from baseball_sim.dynasty import Dynasty
+
+
+def test_pitchers_qualify_on_career_outs():
+    hall = HallOfFame()
+    assert not hall.qualifies({"outs": 3001, "strikeouts": 3001})
+    assert hall.qualifies({"outs": 7501})
+    assert hall.qualifies({"home_runs": 501}) and hall.qualifies({"war": 61.0})
+
+
+def test_classes_are_inducted_after_the_waiting_period():
+    hall = HallOfFame(waiting_period=5)
+    hall.add_retiree(("batter", 1), "Slugger", {"home_runs": 600}, final_season=3)
+    hall.add_retiree(("batter", 2), "Journeyman", {"home_runs": 40}, final_season=3)
+    assert not hall.is_eligible(("batter", 1), 7) and hall.is_eligible(("batter", 1), 8)
+    assert not hall.is_eligible(("batter", 2), 8)
+    assert hall.induct(7) == []
+    assert hall.induct(8) == [("batter", 1)]
+    assert hall.inductees == ["Slugger"]
+
+
+def test_induction_rates_are_plausible(tmp_path):
+    rng = SimRandom(1)
+    store = RosterStore()
+    teams = [create_random_team(f"Team {i}", rng.spawn("team", i), store=store) for i in range(6)]
+    dynasty = Dynasty(League(teams, playoff_spots=2, store=store), str(tmp_path / "dynasty.db"), seed=1)
+    dynasty.run(25)
+
+    cases = dynasty.hall_of_fame.eligible_from
+    for kind in ("batter", "pitcher"):
+        finished = dynasty.connection.execute(f"SELECT COUNT(*) FROM {kind}s WHERE final_season IS NOT NULL")
+        careers = finished.fetchone()[0]
+        qualified = sum(1 for key in cases if key[0] == kind)
+        assert careers > 100
+        # Real Halls take about one player in a hundred
+        assert qualified <= 0.05 * careers
@@ -0,0 +1,75 @@
+import numpy as np
+
+from baseball_sim import Batter, RosterStore, SimRandom, create_random_team, optimize_lineup
+from baseball_sim.lineup import LINEUP_POSITIONS, eligible_positions, position_assignments, simulate_runs
+from baseball_sim.outcomes import HOME_RUN, OUT
+
+
+def roster(positions):
+    store = RosterStore()
+    return [Batter(f"Player {i}", position, store=store) for i, position in enumerate(positions)]
+
+
+def test_simulate_runs_plays_nine_innings():
+    outcomes = np.full((3, 9, 16), OUT, dtype=np.int8)
+    outcomes[:, 0, :] = HOME_RUN
+    runs = simulate_runs(outcomes, [list(range(9)), list(range(1, 9)) + [0]], 3)
+    # Leading off, the slugger bats four times in 27 outs; ninth, only three
+    assert runs.tolist() == [[4, 4, 4], [3, 3, 3]]
+
+
+def test_assignments_fill_every_position_with_eligible_players():
+    batters = roster(["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH", "C", "UT"])
+    assignments = list(position_assignments(batters))
+    assert assignments
+    for assignment in assignments:
+        assert sorted(assignment.values()) == sorted(LINEUP_POSITIONS)
+        for index, position in assignment.items():
+            assert position in eligible_positions(batters[index].position)
+
+
+def test_assignments_cover_every_starter_set():
+    batters = roster(["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH", "C"])
+    starter_sets = {frozenset(assignment) for assignment in position_assignments(batters)}
+    # Either catcher can sit (the other catches or the DH does), or the DH can
+    assert starter_sets == {frozenset(range(10)) - {dropped} for dropped in (0, 8, 9)}
+
+
+def test_each_starter_set_is_found_once():
+    batters = roster(["C", "1B", "SS", "CF", "DH", "UT", "UT", "UT", "UT", "UT", "C"])
+    starter_sets = [frozenset(assignment) for assignment in position_assignments(batters)]
+    assert len(starter_sets) == len(set(starter_sets))
+
+    # Brute force: assign positions in order and keep the distinct sets
+    eligible = [eligible_positions(batter.position) for batter in batters]
+    expected = set()
+
+    def fill(slot, chosen):
+        if slot == len(LINEUP_POSITIONS):
+            expected.add(frozenset(chosen))
+            return
+        for index, positions in enumerate(eligible):
+            if index not in chosen and LINEUP_POSITIONS[slot] in positions:
+                fill(slot + 1, chosen | {index})
+
+    fill(0, frozenset())
+    assert set(starter_sets) == expected
+
+
+def test_short_rosters_have_no_lineup():
+    assert list(position_assignments(roster(["C", "1B", "2B"]))) == []
+
+
+def test_optimize_lineup_is_valid_and_reproducible():
+    team = create_random_team("Home", SimRandom(3), store=RosterStore())
+    first = optimize_lineup(team, games=200, seed=5, workers=1)
+    second = optimize_lineup(team, games=200, seed=5, workers=1)
+    assert [batter.name for batter in first.batters] == [batter.name for batter in second.batters]
+    assert first.runs_per_game == second.runs_per_game
+    assert len({id(batter) for batter in first.batters}) == 9
+    assert sorted(first.positions) == sorted(LINEUP_POSITIONS)
+    for batter, position in first:
+        assert position in eligible_positions(batter.position)
+
+    first.apply(team)
+    assert team.batters[:9] == first.batters
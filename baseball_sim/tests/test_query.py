@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from baseball_sim import Game, League, PlayerQuery, SimRandom, StatIndex, simulate_games
+
+
+@pytest.fixture(scope="module")
+def league():
+    rng = SimRandom(21)
+    league = League(games_per_season=30, rng=rng.spawn("teams"))
+    league.generate_schedule(rng.spawn("schedule"))
+    league.play_season(rng.spawn("season"))
+    return league
+
+
+def brute_force(league, key, teams=None, keep=lambda player: True, pitchers=False, descending=True):
+    """
+    The ids a query should return: every matching player, sorted in Python.
+    """
+    if teams is None:
+        store = league.store
+        player_class = type(league.teams[0].pitchers[0] if pitchers else league.teams[0].batters[0])
+        count = store.num_pitchers if pitchers else store.num_batters
+        players = [player_class.from_store(store, player_id) for player_id in range(count)]
+    else:
+        players = [player for team in teams for player in (team.pitchers if pitchers else team.batters)]
+    players = [player for player in players if keep(player)]
+    return sorted(players, key=lambda player: (key(player), player.id), reverse=descending)
+
+
+def assert_same_order(query, expected, column):
+    """
+    Ties may come out in any order, so compare the sorted values and the
+    set of ids.
+    """
+    ids = query.ids()
+    assert sorted(ids.tolist()) == sorted(player.id for player in expected)
+    values = query.index.values(column, ids)
+    expected_values = query.index.values(column, [player.id for player in expected])
+    assert np.array_equal(values, expected_values)
+
+
+@pytest.mark.parametrize("column, key", [
+    ("power", lambda player: player.attributes["power"]),
+    ("age", lambda player: player.age),
+    ("home_runs", lambda player: player.stats["home_runs"]),
+    ("on_base_plus_slugging", lambda player: player.stats["on_base_plus_slugging"]),
+])
+@pytest.mark.parametrize("descending", [True, False])
+def test_batter_order_matches_a_sort(league, column, key, descending):
+    index = StatIndex(league.store)
+    query = PlayerQuery(index).order_by(column, descending)
+    assert_same_order(query, brute_force(league, key, descending=descending), column)
+
+
+def test_filters_match_a_sort(league):
+    index = StatIndex(league.store)
+    team = league.teams[3]
+    query = (PlayerQuery(index, league.teams).where(position=["C", "SS"], min_age=22, max_age=32)
+             .order_by("contact"))
+    expected = brute_force(league, lambda player: player.attributes["contact"], league.teams,
+                           lambda player: player.position in ("C", "SS") and 22 <= player.age <= 32)
+    assert_same_order(query, expected, "contact")
+
+    query = PlayerQuery(index, league.teams).where(team=team).order_by("hits")
+    assert_same_order(query, brute_force(league, lambda player: player.stats["hits"], [team]), "hits")
+
+
+def test_pitcher_order_matches_a_sort(league):
+    index = StatIndex(league.store, pitchers=True)
+    query = PlayerQuery(index, league.teams).where(min_pa=20).order_by("ERA", descending=False)
+    expected = brute_force(league, lambda player: player.stats["ERA"], league.teams,
+                           lambda player: league.store.pitcher_outcomes[player.id].sum() >= 20,
+                           pitchers=True, descending=False)
+    assert_same_order(query, expected, "ERA")
+
+
+def test_indexes_follow_new_games_ratings_and_roster_moves(league):
+    index = StatIndex(league.store)
+    query = PlayerQuery(index, league.teams).order_by("plate_appearances")
+    query.ids()
+    simulate_games([(league.teams[0], league.teams[1])] * 5, rng=SimRandom(4))
+    batter = league.teams[2].batters[0]
+    batter.attributes["power"] = 99
+    league.teams[2].draft_player(league.teams[5].batters.pop())
+    league.teams[5].roster_changed()
+
+    assert_same_order(query, brute_force(league, lambda player: player.stats["plate_appearances"], league.teams),
+                      "plate_appearances")
+    assert PlayerQuery(index).order_by("power").ids(1)[0] == batter.id
+    assert len(PlayerQuery(index, league.teams).where(team=league.teams[2])) == len(league.teams[2].batters)
+
+
+def test_results_reach_trackers_when_the_game_ends(league):
+    home, away = league.teams[6], league.teams[7]
+    changes = league.store.track_changes()
+    game = Game(home, away, rng=SimRandom(8))
+    game.play_inning()
+    assert not changes
+    while not game.is_game_over():
+        game.play_inning()
+    assert changes == {batter.id for batter in home.batters[:9] + away.batters[:9]}
+    league.store.stop_tracking(changes)
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+
+from baseball_sim import (Batter, MatchupSampler, RosterStore, create_random_team, outcome_probabilities,
+                          sample_outcome_counts, sample_outcomes)
+from baseball_sim.outcomes import HOME_RUN, NUM_OUTCOMES, WALK
+
+
+def lineup_and_staff(seed=1):
+    random.seed(seed)
+    team = create_random_team("Team", store=RosterStore())
+    return team.batters[:9], team.pitchers
+
+
+def test_probabilities_cover_every_pair_and_sum_to_one():
+    batters, pitchers = lineup_and_staff()
+    probabilities = outcome_probabilities(batters, pitchers)
+    assert probabilities.shape == (len(batters), len(pitchers), NUM_OUTCOMES)
+    assert (probabilities >= 0).all()
+    assert np.allclose(probabilities.sum(axis=-1), 1)
+
+
+def test_ratings_move_the_odds_the_right_way():
+    store = RosterStore()
+    patient = Batter("Patient", "1B", contact=10, eye=90, power=10, store=store)
+    slugger = Batter("Slugger", "1B", contact=60, eye=10, power=90, store=store)
+    _, pitchers = lineup_and_staff()
+    probabilities = outcome_probabilities([patient, slugger], pitchers[:1])[:, 0]
+    assert probabilities[0, WALK] > probabilities[1, WALK]
+    assert probabilities[1, HOME_RUN] > probabilities[0, HOME_RUN]
+
+
+def test_sampled_frequencies_match_the_probabilities():
+    batters, pitchers = lineup_and_staff()
+    probabilities = outcome_probabilities(batters[:2], pitchers[:1])
+    outcomes = sample_outcomes(probabilities, 200_000, np.random.default_rng(0))
+    assert outcomes.shape == (2, 1, 200_000)
+    frequencies = np.stack([np.bincount(row, minlength=NUM_OUTCOMES) for row in outcomes[:, 0]]) / 200_000
+    assert np.allclose(frequencies, probabilities[:, 0], atol=0.005)
+
+
+def test_outcome_counts_add_up_to_the_plate_appearances():
+    batters, pitchers = lineup_and_staff()
+    counts = sample_outcome_counts(outcome_probabilities(batters, pitchers), 600, np.random.default_rng(1))
+    assert counts.shape == (len(batters), len(pitchers), NUM_OUTCOMES)
+    assert (counts.sum(axis=-1) == 600).all()
+
+
+def test_matchup_sampler_draws_from_the_same_distribution():
+    batters, pitchers = lineup_and_staff()
+    sampler = MatchupSampler(batters, pitchers, np.random.default_rng(2))
+    draws = np.array([sampler.draw(3, 1) for _ in range(100_000)])
+    frequencies = np.bincount(draws, minlength=NUM_OUTCOMES) / len(draws)
+    assert np.allclose(frequencies, outcome_probabilities(batters, pitchers)[3, 1], atol=0.006)
@@ -0,0 +1,104 @@
+import numpy as np
+
+from baseball_sim import League, SaveGame, SimRandom, load_league, save_league
+from baseball_sim.savegame import STORE_ARRAYS, STORE_LISTS, league_state
+
+
+def played_league(seed=5):
+    rng = SimRandom(seed)
+    league = League(games_per_season=20, rng=rng.spawn("teams"))
+    league.generate_schedule(rng.spawn("schedule"))
+    league.play_season(rng.spawn("season"))
+    return league
+
+
+def test_round_trip_keeps_players_teams_and_standings(tmp_path):
+    league = played_league()
+    path = str(tmp_path / "league.save")
+    save_league(league, path, day=3)
+    restored, day = load_league(path)
+
+    assert day == 3
+    for name in STORE_LISTS:
+        assert getattr(restored.store, name) == getattr(league.store, name)
+    for name in STORE_ARRAYS:
+        rows = league.store.num_batters if name.startswith("batter") else league.store.num_pitchers
+        assert np.array_equal(getattr(restored.store, name)[:rows], getattr(league.store, name)[:rows])
+    assert [team.name for team in restored.teams] == [team.name for team in league.teams]
+    assert [(team.wins, team.losses) for team in restored.teams] == [(team.wins, team.losses) for team in league.teams]
+    for original, copy in zip(league.teams, restored.teams):
+        assert [player.id for player in copy.batters] == [player.id for player in original.batters]
+        assert [player.id for player in copy.pitchers] == [player.id for player in original.pitchers]
+    assert restored.standings.overall_standings() == league.standings.overall_standings()
+    assert np.array_equal(restored.schedule.home, league.schedule.home)
+    assert np.array_equal(restored.schedule.day_start, league.schedule.day_start)
+    assert restored.store.batter_rate(0, 3) == league.store.batter_rate(0, 3)
+
+
+def test_resumed_season_matches_an_uninterrupted_one(tmp_path):
+    rng = SimRandom(9)
+    league = League(games_per_season=20, rng=rng.spawn("teams"))
+    league.generate_schedule(rng.spawn("schedule"))
+    stop_day = league.schedule.num_days // 2
+    path = str(tmp_path / "league.save")
+
+    def save_at_stop(day, _):
+        if day == stop_day - 1:
+            save_league(league, path, day=stop_day)
+
+    league.play_season(rng.spawn("season"), on_day=save_at_stop)
+    restored, day = load_league(path)
+    restored.play_season(rng.spawn("season"), start_day=day)
+
+    assert [(team.wins, team.losses) for team in restored.teams] == [(team.wins, team.losses) for team in league.teams]
+    assert np.array_equal(restored.store.batter_outcomes[:restored.store.num_batters],
+                          league.store.batter_outcomes[:league.store.num_batters])
+
+
+def test_delta_saves_replay_to_the_latest_state(tmp_path):
+    rng = SimRandom(4)
+    league = League(games_per_season=20, rng=rng.spawn("teams"))
+    league.generate_schedule(rng.spawn("schedule"))
+    save = SaveGame(str(tmp_path / "league.save"))
+    save.save(league_state(league))
+    league.play_season(rng.spawn("season"), on_day=lambda day, _: save.save_delta(league_state(league, day + 1)))
+
+    restored, day = load_league(save.path)
+    assert day == league.schedule.num_days
+    assert [(team.wins, team.losses) for team in restored.teams] == [(team.wins, team.losses) for team in league.teams]
+    assert np.array_equal(restored.store.pitcher_runs[:restored.store.num_pitchers],
+                          league.store.pitcher_runs[:league.store.num_pitchers])
+
+
+def test_a_torn_delta_is_ignored(tmp_path):
+    league = played_league()
+    save = SaveGame(str(tmp_path / "league.save"))
+    save.save(league_state(league, day=1))
+    league.teams[0].wins += 1
+    save.save_delta(league_state(league, day=2))
+    with open(save.delta_path, "ab") as file:
+        file.write(b"BDL1\x00")
+
+    restored, day = load_league(save.path)
+    assert day == 2
+    assert restored.teams[0].wins == league.teams[0].wins
+
+
+def test_a_crash_before_the_journal_is_cleared_keeps_the_new_base(tmp_path):
+    league = played_league()
+    save = SaveGame(str(tmp_path / "league.save"))
+    save.save(league_state(league, day=1))
+    league.teams[0].wins += 5
+    save.save_delta(league_state(league, day=2))
+    with open(save.delta_path, "rb") as file:
+        stale_journal = file.read()
+
+    league.teams[0].wins -= 3
+    save.save(league_state(league, day=3))
+    # As if the process died after replacing the base but before emptying the journal
+    with open(save.delta_path, "wb") as file:
+        file.write(stale_journal)
+
+    restored, day = load_league(save.path)
+    assert day == 3
+    assert restored.teams[0].wins == league.teams[0].wins
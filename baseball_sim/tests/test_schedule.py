@@ -0,0 +1,32 @@
+import random
+
+import numpy as np
+import pytest
+
+from baseball_sim import generate_schedule
+
+
+@pytest.mark.parametrize("num_teams, games", [(30, 162), (12, 40), (4, 10)])
+def test_every_team_plays_the_same_number_of_games_half_at_home(num_teams, games):
+    schedule = generate_schedule(num_teams, games, random.Random(1))
+    assert (schedule.games_per_team(num_teams) == games).all()
+    assert (schedule.home_games_per_team(num_teams) == games // 2).all()
+
+
+def test_no_team_plays_twice_in_one_day():
+    schedule = generate_schedule(30, 162, random.Random(2))
+    for _, home, away in schedule:
+        playing = np.concatenate([home, away])
+        assert len(np.unique(playing)) == len(playing)
+        assert not np.any(home == away)
+
+
+def test_every_pair_of_teams_meets_at_both_parks():
+    num_teams = 8
+    schedule = generate_schedule(num_teams, 56, random.Random(3))
+    meetings = np.zeros((num_teams, num_teams), dtype=np.int64)
+    np.add.at(meetings, (schedule.home, schedule.away), 1)
+    off_diagonal = ~np.eye(num_teams, dtype=bool)
+    assert (meetings[off_diagonal] > 0).all()
+    assert (meetings == meetings.T).all()
+
@@ -0,0 +1,106 @@
+import random
+
+from baseball_sim import League, PlayoffBracket, SimRandom, Standings, default_divisions
+
+
+def random_standings(seed, num_teams=12, games=400):
+    rng = random.Random(seed)
+    standings = Standings(num_teams)
+    for _ in range(games):
+        home, away = rng.sample(range(num_teams), 2)
+        home_score, away_score = rng.sample(range(10), 2)
+        standings.record_game(home, away, home_score, away_score)
+    return standings
+
+
+def test_default_divisions_split_two_leagues_of_three():
+    divisions = default_divisions(30)
+    assert len(divisions) == 6
+    assert sorted(team for members in divisions.values() for team in members) == list(range(30))
+    assert list(default_divisions(10)) == [("American League", "League")]
+
+
+def test_rankings_match_a_full_sort():
+    for seed in range(5):
+        standings = random_standings(seed)
+        games_over = [wins - losses for wins, losses in zip(standings.wins, standings.losses)]
+        assert standings.games_over == games_over
+        overall = standings.overall_standings()
+        assert sorted(overall) == list(range(12))
+        assert [games_over[team] for team in overall] == sorted(games_over, reverse=True)
+        for name, members in standings.divisions.items():
+            division = standings.division(name)
+            assert sorted(division) == sorted(members)
+            assert [games_over[team] for team in division] == sorted((games_over[team] for team in members),
+                                                                     reverse=True)
+            assert standings.leader(name) == division[0]
+
+
+def test_games_behind_the_division_leader():
+    standings = random_standings(7)
+    for name in standings.divisions:
+        rows = standings.rows(name)
+        leader = rows[0][0]
+        assert rows[0][4] == 0
+        for team, wins, losses, _, games_behind in rows:
+            assert games_behind == ((standings.wins[leader] - wins) + (losses - standings.losses[leader])) / 2
+
+
+def test_ties_break_on_head_to_head_then_run_differential():
+    standings = Standings(6, {("American League", "East"): [0, 1, 2], ("National League", "East"): [3, 4, 5]})
+    standings.record_game(1, 0, 5, 4)
+    standings.record_game(0, 2, 3, 2)
+    standings.record_game(2, 1, 9, 1)
+    assert standings.wins == [1, 1, 1, 0, 0, 0]
+    # Everyone is 1-1; head to head is a wash, so run differential decides
+    assert standings.division(("American League", "East")) == [2, 0, 1]
+
+
+def test_clinch_and_elimination():
+    standings = Standings(6, {("American League", "East"): [0, 1, 2], ("National League", "East"): [3, 4, 5]})
+    standings.reset([4] * 6)
+    for _ in range(2):
+        standings.record_game(0, 1, 2, 1)
+        standings.record_game(0, 2, 2, 1)
+    assert standings.clinched_division(0)
+    assert standings.eliminated_from_division(1) and standings.eliminated_from_division(2)
+    assert not standings.clinched_division(3)
+
+
+def test_league_standings_follow_the_season():
+    league = League(games_per_season=20, rng=SimRandom(3).spawn("teams"))
+    league.generate_schedule(SimRandom(3).spawn("schedule"))
+    league.play_season(SimRandom(3).spawn("season"))
+    assert league.standings.wins == [team.wins for team in league.teams]
+    assert league.standings.losses == [team.losses for team in league.teams]
+    assert len(league.playoffs()) == league.playoff_spots
+
+
+def test_bracket_gives_top_seeds_byes():
+    teams = [object() for _ in range(12)]
+    bracket = PlayoffBracket({"A": teams[:6], "B": teams[6:]}, rng=SimRandom(5))
+    played = []
+
+    def higher_seed_wins(round_number, higher, lower, wins_needed):
+        played.append((round_number, higher, lower))
+        return higher
+
+    bracket._series = higher_seed_wins
+    assert bracket.play() is teams[0]
+    opening = [(teams.index(higher), teams.index(lower)) for round_number, higher, lower in played
+               if round_number == 0]
+    assert opening == [(2, 5), (3, 4), (8, 11), (9, 10)]
+    # Two opening series, two division series, one LCS per league, then the final
+    assert len(played) == 2 * (2 + 2 + 1) + 1
+
+
+def test_bracket_plays_real_series():
+    league = League(games_per_season=20, rng=SimRandom(4).spawn("teams"))
+    league.generate_schedule(SimRandom(4).spawn("schedule"))
+    league.play_season(SimRandom(4).spawn("season"))
+    champion = league.play_playoffs(SimRandom(4).spawn("playoffs"))
+    assert champion in league.playoffs()
+    assert league.bracket.champion is champion
+    assert league.bracket.results[-1][3] is champion
+    for _, higher, lower, winner in league.bracket.results:
+        assert winner in (higher, lower)
@@ -5,6 +5,8 @@ import pygame
 import random
 import sys
 
+from baseball_sim.schedule import generate_schedule
+
 # Initialize pygame
 pygame.init()
 
@@ -83,10 +85,11 @@ class League:
         self.schedule = []
 
     def generate_schedule(self):
-        for i in range(162):
-            home = random.choice(self.teams)
-            away = random.choice([t for t in self.teams if t != home])
-            self.schedule.append((home, away))
+        # 162 games per team, half at home, in series with off-days
+        schedule = generate_schedule(len(self.teams))
+        for day, home, away in schedule:
+            for home_index, away_index in zip(home.tolist(), away.tolist()):
+                self.schedule.append((self.teams[home_index], self.teams[away_index]))
 
     def play_season(self):
         for game in self.schedule: